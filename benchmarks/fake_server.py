@@ -0,0 +1,628 @@
+# Copyright (C) 2019-2021 Zilliz. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+
+"""
+In-process fake Milvus gRPC server.
+
+Implements the proxy RPCs used by the ORM on top of NumPy arrays, so the real pymilvus
+client talks to it over a real gRPC channel: requests are serialized, cross the loopback
+interface and are served concurrently by a thread pool. Search is exact brute force,
+index builds finish immediately and every insert becomes one segment.
+
+Usage::
+
+    from fake_server import start_server
+    server, port = start_server()
+    connections.connect(host="127.0.0.1", port=port)
+    ...
+    server.stop(0)
+
+or ``python benchmarks/fake_server.py --port 19530`` to serve until interrupted.
+"""
+
+import argparse
+import ast
+import json
+import os
+import sys
+import threading
+from concurrent import futures
+
+import grpc
+import numpy
+from pymilvus.client.types import DataType
+from pymilvus.grpc_gen import common_pb2, milvus_pb2, milvus_pb2_grpc, schema_pb2
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from pymilvus_orm.expression import NOT_CONSTANT, constant_value, parse_tree
+
+_SCALAR_FIELDS = {
+    DataType.BOOL: ("bool_data", numpy.bool_),
+    DataType.INT8: ("int_data", numpy.int32),
+    DataType.INT16: ("int_data", numpy.int32),
+    DataType.INT32: ("int_data", numpy.int32),
+    DataType.INT64: ("long_data", numpy.int64),
+    DataType.FLOAT: ("float_data", numpy.float32),
+    DataType.DOUBLE: ("double_data", numpy.float64),
+}
+
+_COMPARE = {
+    ast.Eq: numpy.equal,
+    ast.NotEq: numpy.not_equal,
+    ast.Lt: numpy.less,
+    ast.LtE: numpy.less_equal,
+    ast.Gt: numpy.greater,
+    ast.GtE: numpy.greater_equal,
+}
+
+_POPCOUNT = numpy.array([bin(i).count("1") for i in range(256)], dtype=numpy.int32)
+
+
+class FakeServerError(Exception):
+    def __init__(self, code, reason):
+        super().__init__(reason)
+        self.code = code
+        self.reason = reason
+
+
+def _status(code=common_pb2.Success, reason=""):
+    return common_pb2.Status(error_code=code, reason=reason)
+
+
+def _error_status(err):
+    return _status(err.code, err.reason)
+
+
+def _kv_dict(pairs):
+    return {kv.key: kv.value for kv in pairs}
+
+
+def _field_dim(field):
+    return int(_kv_dict(field.type_params).get("dim", 0))
+
+
+def _decode_field_data(field_data):
+    if field_data.type in _SCALAR_FIELDS:
+        attr, dtype = _SCALAR_FIELDS[field_data.type]
+        return numpy.asarray(getattr(field_data.scalars, attr).data, dtype=dtype)
+    dim = field_data.vectors.dim
+    if field_data.type == DataType.FLOAT_VECTOR:
+        return numpy.asarray(field_data.vectors.float_vector.data, dtype=numpy.float32).reshape(-1, dim)
+    if field_data.type == DataType.BINARY_VECTOR:
+        return numpy.frombuffer(field_data.vectors.binary_vector, dtype=numpy.uint8).reshape(-1, dim // 8)
+    raise FakeServerError(common_pb2.IllegalArgument, f"unsupported field type {field_data.type}")
+
+
+def _encode_field_data(field, values):
+    field_data = schema_pb2.FieldData(type=field.data_type, field_name=field.name, field_id=field.fieldID)
+    if field.data_type in _SCALAR_FIELDS:
+        attr, _ = _SCALAR_FIELDS[field.data_type]
+        getattr(field_data.scalars, attr).data.extend(values.tolist())
+    elif field.data_type == DataType.FLOAT_VECTOR:
+        field_data.vectors.dim = values.shape[1]
+        field_data.vectors.float_vector.data.extend(values.ravel().tolist())
+    elif field.data_type == DataType.BINARY_VECTOR:
+        field_data.vectors.dim = values.shape[1] * 8
+        field_data.vectors.binary_vector = values.tobytes()
+    return field_data
+
+
+def _evaluate(expr, columns, num_rows):
+    """
+    Evaluates a boolean filter expression such as ``id in [1, 2] && age > 10`` on columns.
+    """
+    if not expr:
+        return numpy.ones(num_rows, dtype=bool)
+    try:
+        tree = parse_tree(expr)
+    except SyntaxError:
+        raise FakeServerError(common_pb2.IllegalArgument, f"cannot parse expression: {expr}") from None
+
+    def visit(node):
+        if isinstance(node, ast.BoolOp):
+            values = [visit(v) for v in node.values]
+            reduce = numpy.logical_and if isinstance(node.op, ast.And) else numpy.logical_or
+            return reduce.reduce(values)
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            return numpy.logical_not(visit(node.operand))
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            return -visit(node.operand)
+        if isinstance(node, ast.Compare):
+            result, left = numpy.ones(num_rows, dtype=bool), visit(node.left)
+            for op, comparator in zip(node.ops, node.comparators):
+                right = visit(comparator)
+                if isinstance(op, (ast.In, ast.NotIn)):
+                    matched = numpy.isin(left, right)
+                    result &= ~matched if isinstance(op, ast.NotIn) else matched
+                elif type(op) in _COMPARE:
+                    result &= _COMPARE[type(op)](left, right)
+                else:
+                    raise FakeServerError(common_pb2.IllegalArgument, f"unsupported operator in: {expr}")
+                left = right
+            return result
+        if isinstance(node, ast.Name):
+            if node.id not in columns:
+                raise FakeServerError(common_pb2.IllegalArgument, f"unknown field {node.id} in: {expr}")
+            return columns[node.id]
+        if isinstance(node, (ast.List, ast.Tuple)):
+            return [visit(e) for e in node.elts]
+        value = constant_value(node)
+        if value is not NOT_CONSTANT:
+            return value
+        raise FakeServerError(common_pb2.IllegalArgument, f"unsupported expression: {expr}")
+
+    return numpy.broadcast_to(numpy.asarray(visit(tree), dtype=bool), (num_rows,))
+
+
+def _distances(queries, vectors, metric):
+    """
+    Returns the (nq, n) distance matrix and whether smaller values rank first.
+    """
+    metric = metric.upper()
+    if metric == "L2":
+        dist = (numpy.einsum("ij,ij->i", queries, queries)[:, None] - 2 * queries @ vectors.T
+                + numpy.einsum("ij,ij->i", vectors, vectors)[None, :])
+        return numpy.maximum(dist, 0), True
+    if metric == "IP":
+        return queries @ vectors.T, False
+    if metric in ("HAMMING", "JACCARD", "TANIMOTO"):
+        xor = _POPCOUNT[numpy.bitwise_xor(queries[:, None, :], vectors[None, :, :])].sum(axis=-1)
+        if metric == "HAMMING":
+            return xor.astype(numpy.float32), True
+        union = _POPCOUNT[numpy.bitwise_or(queries[:, None, :], vectors[None, :, :])].sum(axis=-1)
+        jaccard = xor / numpy.maximum(union, 1)
+        if metric == "JACCARD":
+            return jaccard.astype(numpy.float32), True
+        return -numpy.log2(numpy.maximum(1 - jaccard, 1e-12)).astype(numpy.float32), True
+    raise FakeServerError(common_pb2.IllegalMetricType, f"unsupported metric type {metric}")
+
+
+class _Collection:
+    def __init__(self, collection_id, schema):
+        self.id = collection_id
+        self.schema = schema
+        self.partitions = {"_default": collection_id * 1000}
+        self.segments = []
+        self.indexes = {}
+        self.loaded = False
+        self.version = 0
+        self._cache = {}
+
+    @property
+    def primary(self):
+        for field in self.schema.fields:
+            if field.is_primary_key:
+                return field
+        return None
+
+    def field(self, name):
+        for field in self.schema.fields:
+            if field.name == name:
+                return field
+        raise FakeServerError(common_pb2.IllegalArgument, f"field {name} not exist")
+
+    def columns(self, partition_names):
+        """
+        Returns the concatenated columns of the given partitions, all if empty.
+        """
+        key = tuple(sorted(partition_names))
+        cached = self._cache.get(key, None)
+        if cached is not None and cached[0] == self.version:
+            return cached[1]
+        segments = [s for s in self.segments if not key or s["partition"] in key]
+        columns = {}
+        for field in self.schema.fields:
+            parts = [s["columns"][field.name] for s in segments]
+            if parts:
+                columns[field.name] = numpy.concatenate(parts)
+            elif field.data_type == DataType.FLOAT_VECTOR:
+                columns[field.name] = numpy.empty((0, _field_dim(field)), dtype=numpy.float32)
+            elif field.data_type == DataType.BINARY_VECTOR:
+                columns[field.name] = numpy.empty((0, _field_dim(field) // 8), dtype=numpy.uint8)
+            else:
+                columns[field.name] = numpy.empty(0, dtype=_SCALAR_FIELDS[field.data_type][1])
+        self._cache[key] = (self.version, columns)
+        return columns
+
+    def num_rows(self, partition_name=None):
+        return sum(s["rows"] for s in self.segments if partition_name in (None, s["partition"]))
+
+
+class FakeMilvusServicer(milvus_pb2_grpc.MilvusServiceServicer):
+    """
+    Serves the Milvus proxy RPCs from in-memory NumPy columns.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._collections = {}
+        self._next_id = 1
+
+    def _new_id(self):
+        self._next_id += 1
+        return self._next_id
+
+    def _collection(self, name):
+        collection = self._collections.get(name, None)
+        if collection is None:
+            raise FakeServerError(common_pb2.CollectionNotExists, f"can't find collection: {name}")
+        return collection
+
+    def _partition_names(self, collection, names):
+        for name in names:
+            if name not in collection.partitions:
+                raise FakeServerError(common_pb2.UnexpectedError, f"partition name {name} not found")
+        return list(names)
+
+    def CreateCollection(self, request, context):
+        schema = schema_pb2.CollectionSchema.FromString(request.schema)
+        with self._lock:
+            if request.collection_name in self._collections:
+                return _status(common_pb2.UnexpectedError, f"collection {request.collection_name} exist")
+            for i, field in enumerate(schema.fields):
+                field.fieldID = 100 + i
+            self._collections[request.collection_name] = _Collection(self._new_id(), schema)
+        return _status()
+
+    def DropCollection(self, request, context):
+        with self._lock:
+            if self._collections.pop(request.collection_name, None) is None:
+                return _status(common_pb2.CollectionNotExists, f"can't find collection: {request.collection_name}")
+        return _status()
+
+    def HasCollection(self, request, context):
+        return milvus_pb2.BoolResponse(status=_status(), value=request.collection_name in self._collections)
+
+    def DescribeCollection(self, request, context):
+        try:
+            collection = self._collection(request.collection_name)
+        except FakeServerError as err:
+            return milvus_pb2.DescribeCollectionResponse(status=_error_status(err))
+        return milvus_pb2.DescribeCollectionResponse(status=_status(), schema=collection.schema,
+                                                     collectionID=collection.id)
+
+    def ShowCollections(self, request, context):
+        with self._lock:
+            names = list(request.collection_names) or list(self._collections)
+            collections = [self._collections.get(name, None) for name in names]
+        response = milvus_pb2.ShowCollectionsResponse(status=_status())
+        for name, collection in zip(names, collections):
+            if collection is not None:
+                response.collection_names.append(name)
+                response.collection_ids.append(collection.id)
+                response.inMemory_percentages.append(100 if collection.loaded else 0)
+        return response
+
+    def LoadCollection(self, request, context):
+        try:
+            self._collection(request.collection_name).loaded = True
+        except FakeServerError as err:
+            return _error_status(err)
+        return _status()
+
+    def ReleaseCollection(self, request, context):
+        try:
+            self._collection(request.collection_name).loaded = False
+        except FakeServerError as err:
+            return _error_status(err)
+        return _status()
+
+    def GetCollectionStatistics(self, request, context):
+        try:
+            rows = self._collection(request.collection_name).num_rows()
+        except FakeServerError as err:
+            return milvus_pb2.GetCollectionStatisticsResponse(status=_error_status(err))
+        return milvus_pb2.GetCollectionStatisticsResponse(
+            status=_status(), stats=[common_pb2.KeyValuePair(key="row_count", value=str(rows))])
+
+    def CreatePartition(self, request, context):
+        with self._lock:
+            try:
+                collection = self._collection(request.collection_name)
+            except FakeServerError as err:
+                return _error_status(err)
+            if request.partition_name in collection.partitions:
+                return _status(common_pb2.UnexpectedError, f"partition {request.partition_name} exist")
+            collection.partitions[request.partition_name] = self._new_id()
+        return _status()
+
+    def DropPartition(self, request, context):
+        with self._lock:
+            try:
+                collection = self._collection(request.collection_name)
+                self._partition_names(collection, [request.partition_name])
+            except FakeServerError as err:
+                return _error_status(err)
+            collection.partitions.pop(request.partition_name)
+            collection.segments = [s for s in collection.segments if s["partition"] != request.partition_name]
+            collection.version += 1
+        return _status()
+
+    def HasPartition(self, request, context):
+        try:
+            collection = self._collection(request.collection_name)
+        except FakeServerError as err:
+            return milvus_pb2.BoolResponse(status=_error_status(err))
+        return milvus_pb2.BoolResponse(status=_status(), value=request.partition_name in collection.partitions)
+
+    def LoadPartitions(self, request, context):
+        return self.LoadCollection(request, context)
+
+    def ReleasePartitions(self, request, context):
+        return _status()
+
+    def GetPartitionStatistics(self, request, context):
+        try:
+            collection = self._collection(request.collection_name)
+            self._partition_names(collection, [request.partition_name])
+        except FakeServerError as err:
+            return milvus_pb2.GetPartitionStatisticsResponse(status=_error_status(err))
+        rows = collection.num_rows(request.partition_name)
+        return milvus_pb2.GetPartitionStatisticsResponse(
+            status=_status(), stats=[common_pb2.KeyValuePair(key="row_count", value=str(rows))])
+
+    def ShowPartitions(self, request, context):
+        try:
+            collection = self._collection(request.collection_name)
+        except FakeServerError as err:
+            return milvus_pb2.ShowPartitionsResponse(status=_error_status(err))
+        response = milvus_pb2.ShowPartitionsResponse(status=_status())
+        for name, partition_id in list(collection.partitions.items()):
+            if not request.partition_names or name in request.partition_names:
+                response.partition_names.append(name)
+                response.partitionIDs.append(partition_id)
+                response.inMemory_percentages.append(100 if collection.loaded else 0)
+        return response
+
+    def CreateIndex(self, request, context):
+        with self._lock:
+            try:
+                collection = self._collection(request.collection_name)
+                field = collection.field(request.field_name)
+            except FakeServerError as err:
+                return _error_status(err)
+            if field.data_type not in (DataType.FLOAT_VECTOR, DataType.BINARY_VECTOR):
+                return _status(common_pb2.IllegalArgument, f"cannot create index on non-vector field: {field.name}")
+            collection.indexes[field.name] = list(request.extra_params)
+        return _status()
+
+    def DescribeIndex(self, request, context):
+        try:
+            collection = self._collection(request.collection_name)
+        except FakeServerError as err:
+            return milvus_pb2.DescribeIndexResponse(status=_error_status(err))
+        response = milvus_pb2.DescribeIndexResponse(status=_status())
+        for field_name, params in list(collection.indexes.items()):
+            if request.field_name in ("", field_name):
+                response.index_descriptions.add(index_name="_default_idx", indexID=collection.id,
+                                                params=params, field_name=field_name)
+        if not response.index_descriptions:
+            return milvus_pb2.DescribeIndexResponse(status=_status(common_pb2.IndexNotExist, "index not exist"))
+        return response
+
+    def GetIndexState(self, request, context):
+        return milvus_pb2.GetIndexStateResponse(status=_status(), state=common_pb2.Finished)
+
+    def GetIndexBuildProgress(self, request, context):
+        try:
+            rows = self._collection(request.collection_name).num_rows()
+        except FakeServerError as err:
+            return milvus_pb2.GetIndexBuildProgressResponse(status=_error_status(err))
+        return milvus_pb2.GetIndexBuildProgressResponse(status=_status(), indexed_rows=rows, total_rows=rows)
+
+    def DropIndex(self, request, context):
+        with self._lock:
+            try:
+                self._collection(request.collection_name).indexes.pop(request.field_name, None)
+            except FakeServerError as err:
+                return _error_status(err)
+        return _status()
+
+    def Insert(self, request, context):
+        try:
+            return self._insert(request)
+        except FakeServerError as err:
+            return milvus_pb2.MutationResult(status=_error_status(err))
+
+    def _insert(self, request):
+        collection = self._collection(request.collection_name)
+        partition = request.partition_name or "_default"
+        self._partition_names(collection, [partition])
+        columns = {field_data.field_name: _decode_field_data(field_data) for field_data in request.fields_data}
+        rows = request.num_rows
+        primary = collection.primary
+        with self._lock:
+            if primary.name not in columns:
+                start = self._next_id
+                self._next_id += rows
+                columns[primary.name] = numpy.arange(start, start + rows, dtype=numpy.int64)
+            for field in collection.schema.fields:
+                values = columns.get(field.name, None)
+                if values is None or len(values) != rows:
+                    raise FakeServerError(common_pb2.IllegalArgument, f"field {field.name} has wrong row count")
+            collection.segments.append({"id": self._new_id(), "partition": partition, "columns": columns,
+                                        "rows": rows, "flushed": False})
+            collection.version += 1
+        return milvus_pb2.MutationResult(
+            status=_status(), IDs=schema_pb2.IDs(int_id=schema_pb2.LongArray(data=columns[primary.name].tolist())),
+            insert_cnt=rows)
+
+    def Flush(self, request, context):
+        response = milvus_pb2.FlushResponse(status=_status())
+        with self._lock:
+            for name in request.collection_names:
+                try:
+                    collection = self._collection(name)
+                except FakeServerError as err:
+                    return milvus_pb2.FlushResponse(status=_error_status(err))
+                for segment in collection.segments:
+                    segment["flushed"] = True
+                response.coll_segIDs[name].data.extend(s["id"] for s in collection.segments)
+        return response
+
+    def Search(self, request, context):
+        try:
+            return self._search(request)
+        except FakeServerError as err:
+            return milvus_pb2.SearchResults(status=_error_status(err))
+
+    def _search(self, request):
+        collection = self._collection(request.collection_name)
+        params = _kv_dict(request.search_params)
+        field = collection.field(params["anns_field"])
+        topk = int(params["topk"])
+        with self._lock:
+            columns = collection.columns(self._partition_names(collection, request.partition_names))
+        vectors, ids = columns[field.name], columns[collection.primary.name]
+        mask = _evaluate(request.dsl, columns, len(ids))
+        if not mask.all():
+            candidates = numpy.flatnonzero(mask)
+            vectors = vectors[candidates]
+        else:
+            candidates = None
+
+        group = milvus_pb2.PlaceholderGroup.FromString(request.placeholder_group)
+        values = group.placeholders[0].values
+        if field.data_type == DataType.BINARY_VECTOR:
+            queries = numpy.frombuffer(b"".join(values), dtype=numpy.uint8).reshape(len(values), -1)
+        else:
+            queries = numpy.frombuffer(b"".join(values), dtype=numpy.float32).reshape(len(values), -1)
+        nq, k = len(values), min(topk, len(vectors))
+
+        results = schema_pb2.SearchResultData(num_queries=nq, top_k=topk)
+        if k > 0:
+            dist, ascending = _distances(queries, vectors, params.get("metric_type", "L2"))
+            ranked = dist if ascending else -dist
+            top = numpy.argpartition(ranked, k - 1, axis=1)[:, :k]
+            order = numpy.take_along_axis(ranked, top, axis=1).argsort(axis=1, kind="stable")
+            top = numpy.take_along_axis(top, order, axis=1)
+            rows = top if candidates is None else candidates[top]
+            results.scores.extend(numpy.take_along_axis(dist, top, axis=1).ravel().tolist())
+            results.ids.int_id.data.extend(ids[rows].ravel().tolist())
+            for name in request.output_fields:
+                out = collection.field(name)
+                results.fields_data.append(_encode_field_data(out, columns[name][rows.ravel()]))
+        results.topks.extend([k] * nq)
+        return milvus_pb2.SearchResults(status=_status(), results=results)
+
+    def Query(self, request, context):
+        try:
+            collection = self._collection(request.collection_name)
+            with self._lock:
+                columns = collection.columns(self._partition_names(collection, request.partition_names))
+            primary = collection.primary.name
+            mask = _evaluate(request.expr, columns, len(columns[primary]))
+            names = [primary] + [name for name in request.output_fields if name != primary]
+            fields_data = [_encode_field_data(collection.field(name), columns[name][mask]) for name in names]
+        except FakeServerError as err:
+            return milvus_pb2.QueryResults(status=_error_status(err))
+        if not mask.any():
+            return milvus_pb2.QueryResults(status=_status(common_pb2.EmptyCollection, "empty result"))
+        return milvus_pb2.QueryResults(status=_status(), fields_data=fields_data)
+
+    def _vectors_array(self, array):
+        if array.HasField("data_array"):
+            data = array.data_array
+            if data.float_vector.data:
+                return numpy.asarray(data.float_vector.data, dtype=numpy.float32).reshape(-1, data.dim)
+            return numpy.frombuffer(data.binary_vector, dtype=numpy.uint8).reshape(-1, data.dim // 8)
+        ids = array.id_array
+        collection = self._collection(ids.collection_name)
+        with self._lock:
+            columns = collection.columns(self._partition_names(collection, ids.partition_names))
+        wanted = numpy.asarray(ids.id_array.int_id.data, dtype=numpy.int64)
+        positions = {pk: i for i, pk in enumerate(columns[collection.primary.name].tolist())}
+        missing = [pk for pk in wanted.tolist() if pk not in positions]
+        if missing:
+            raise FakeServerError(common_pb2.IllegalArgument, f"ids not found: {missing[:10]}")
+        return columns[ids.field_name][[positions[pk] for pk in wanted.tolist()]]
+
+    def CalcDistance(self, request, context):
+        try:
+            left, right = self._vectors_array(request.op_left), self._vectors_array(request.op_right)
+            metric = _kv_dict(request.params).get("metric", "L2")
+            dist, _ = _distances(left, right, metric)
+        except FakeServerError as err:
+            return milvus_pb2.CalcDistanceResults(status=_error_status(err))
+        if metric.upper() == "HAMMING":
+            return milvus_pb2.CalcDistanceResults(
+                status=_status(), int_dist=schema_pb2.IntArray(data=dist.astype(numpy.int32).ravel().tolist()))
+        return milvus_pb2.CalcDistanceResults(
+            status=_status(), float_dist=schema_pb2.FloatArray(data=dist.ravel().tolist()))
+
+    def GetPersistentSegmentInfo(self, request, context):
+        try:
+            collection = self._collection(request.collectionName)
+        except FakeServerError as err:
+            return milvus_pb2.GetPersistentSegmentInfoResponse(status=_error_status(err))
+        response = milvus_pb2.GetPersistentSegmentInfoResponse(status=_status())
+        for segment in list(collection.segments):
+            response.infos.add(segmentID=segment["id"], collectionID=collection.id,
+                               partitionID=collection.partitions.get(segment["partition"], 0),
+                               num_rows=segment["rows"],
+                               state=common_pb2.Flushed if segment["flushed"] else common_pb2.Growing)
+        return response
+
+    def GetQuerySegmentInfo(self, request, context):
+        try:
+            collection = self._collection(request.collectionName)
+        except FakeServerError as err:
+            return milvus_pb2.GetQuerySegmentInfoResponse(status=_error_status(err))
+        response = milvus_pb2.GetQuerySegmentInfoResponse(status=_status())
+        if collection.loaded:
+            for segment in list(collection.segments):
+                response.infos.add(segmentID=segment["id"], collectionID=collection.id,
+                                   partitionID=collection.partitions.get(segment["partition"], 0),
+                                   num_rows=segment["rows"], index_name="_default_idx", indexID=collection.id)
+        return response
+
+    def Dummy(self, request, context):
+        return milvus_pb2.DummyResponse(response=json.dumps({"request_type": request.request_type}))
+
+    def RegisterLink(self, request, context):
+        return milvus_pb2.RegisterLinkResponse(status=_status())
+
+
+def start_server(host="127.0.0.1", port=0, max_workers=16):
+    """
+    Starts a fake Milvus server in background threads.
+
+    :param port: The port to listen on, 0 picks a free one.
+    :param max_workers: The number of threads serving RPCs concurrently.
+
+    :return tuple:
+        The grpc server and the bound port.
+    """
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers),
+                         options=[("grpc.max_send_message_length", -1),
+                                  ("grpc.max_receive_message_length", -1)])
+    milvus_pb2_grpc.add_MilvusServiceServicer_to_server(FakeMilvusServicer(), server)
+    port = server.add_insecure_port(f"{host}:{port}")
+    server.start()
+    return server, port
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a fake Milvus on NumPy.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=19530)
+    parser.add_argument("--workers", type=int, default=16)
+    args = parser.parse_args()
+    server, port = start_server(args.host, args.port, args.workers)
+    print(f"fake milvus serving on {args.host}:{port}")
+    server.wait_for_termination()
+
+
+if __name__ == "__main__":
+    main()
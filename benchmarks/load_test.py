@@ -0,0 +1,124 @@
+# Copyright (C) 2019-2021 Zilliz. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+
+"""
+End-to-end load test of the ORM against the in-process fake Milvus gRPC server.
+
+Usage::
+
+    python benchmarks/load_test.py --rows 100000 --threads 8 --duration 10
+
+Inserts ``--rows`` entities in batches, then runs searches from ``--threads`` client
+threads for ``--duration`` seconds and reports throughput and latency percentiles.
+Pass ``--host``/``--port`` to target an already running server instead.
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+import numpy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from pymilvus_orm import Collection, CollectionSchema, DataType, FieldSchema, connections, utility
+from fake_server import start_server
+
+
+def _percentiles(latencies):
+    latencies = numpy.asarray(latencies) * 1000
+    return {p: numpy.percentile(latencies, p) for p in (50, 95, 99)}
+
+
+def _report(name, count, elapsed, latencies):
+    pct = _percentiles(latencies)
+    print(f"{name:8s} {count:>8d} calls {count / elapsed:>10.1f} /s   "
+          f"p50 {pct[50]:8.2f} ms   p95 {pct[95]:8.2f} ms   p99 {pct[99]:8.2f} ms")
+
+
+def run_insert(collection, rows, batch, dim):
+    latencies = []
+    start = time.perf_counter()
+    for begin in range(0, rows, batch):
+        nb = min(batch, rows - begin)
+        data = [list(range(begin, begin + nb)), numpy.random.random((nb, dim)).astype(numpy.float32).tolist()]
+        t = time.perf_counter()
+        collection.insert(data)
+        latencies.append(time.perf_counter() - t)
+    elapsed = time.perf_counter() - start
+    _report("insert", len(latencies), elapsed, latencies)
+    print(f"{'':8s} {rows / elapsed:>25.1f} rows/s")
+
+
+def run_search(collection, threads, duration, nq, topk, dim):
+    latencies = [[] for _ in range(threads)]
+    stop = time.perf_counter() + duration
+
+    def worker(out):
+        queries = numpy.random.random((nq, dim)).astype(numpy.float32).tolist()
+        while time.perf_counter() < stop:
+            t = time.perf_counter()
+            collection.search(queries, "vec", {"metric_type": "L2"}, topk)
+            out.append(time.perf_counter() - t)
+
+    workers = [threading.Thread(target=worker, args=(out,)) for out in latencies]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+    merged = [lat for out in latencies for lat in out]
+    _report("search", len(merged), elapsed, merged)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=None, help="target a running server instead of starting one")
+    parser.add_argument("--port", default="19530")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--batch", type=int, default=2000)
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=5)
+    parser.add_argument("--nq", type=int, default=10)
+    parser.add_argument("--topk", type=int, default=10)
+    args = parser.parse_args()
+
+    server = None
+    host, port = args.host, args.port
+    if host is None:
+        server, port = start_server(max_workers=max(args.threads * 2, 4))
+        host = "127.0.0.1"
+    connections.connect(host=host, port=str(port))
+
+    name = "load_test"
+    if utility.has_collection(name):
+        Collection(name).drop()
+    schema = CollectionSchema([FieldSchema("id", DataType.INT64, is_primary=True),
+                               FieldSchema("vec", DataType.FLOAT_VECTOR, dim=args.dim)])
+    collection = Collection(name, schema)
+    try:
+        run_insert(collection, args.rows, args.batch, args.dim)
+        collection.load()
+        run_search(collection, args.threads, args.duration, args.nq, args.topk, args.dim)
+    finally:
+        collection.drop()
+        if server is not None:
+            server.stop(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# Copyright (C) 2019-2021 Zilliz. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+
+"""
+Recall, throughput and latency of search params on a SIFT/GIST style dataset.
+
+Usage::
+
+    python benchmarks/recall.py --data-dir sift --name sift --host 127.0.0.1 \\
+        --index '{"index_type": "IVF_FLAT", "params": {"nlist": 1024}}' --nprobe 8 32 128 --nq 1 100
+
+Loads ``<name>_base.fvecs``, ``<name>_query.fvecs`` and ``<name>_groundtruth.ivecs`` from
+``--data-dir``, inserts the base set, builds the index and reports one row per search
+param, nq and topk. Without ``--host`` it runs against the in-process fake server.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from pymilvus_orm import Collection, CollectionSchema, DataType, FieldSchema, connections, utility
+from pymilvus_orm.evaluation import Dataset, evaluate, insert_base, param_grid
+from fake_server import start_server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-dir", required=True)
+    parser.add_argument("--name", required=True)
+    parser.add_argument("--host", default=None, help="target a running server instead of starting one")
+    parser.add_argument("--port", default="19530")
+    parser.add_argument("--metric", default="L2")
+    parser.add_argument("--index", default=None, help="index params as JSON, no index if omitted")
+    parser.add_argument("--nprobe", type=int, nargs="*", default=[])
+    parser.add_argument("--ef", type=int, nargs="*", default=[])
+    parser.add_argument("--nq", type=int, nargs="+", default=[1])
+    parser.add_argument("--topk", type=int, nargs="+", default=[10])
+    parser.add_argument("--max-queries", type=int, default=None)
+    parser.add_argument("--batch", type=int, default=10000)
+    args = parser.parse_args()
+
+    dataset = Dataset.from_directory(args.data_dir, args.name)
+    server = None
+    host, port = args.host, args.port
+    if host is None:
+        server, port = start_server()
+        host = "127.0.0.1"
+    connections.connect(host=host, port=str(port))
+
+    name = f"recall_{args.name}"
+    if utility.has_collection(name):
+        Collection(name).drop()
+    schema = CollectionSchema([FieldSchema("id", DataType.INT64, is_primary=True),
+                               FieldSchema("vec", DataType.FLOAT_VECTOR, dim=dataset.dim)])
+    collection = Collection(name, schema)
+    try:
+        insert_base(collection, dataset.base, batch_size=args.batch)
+        if args.index:
+            index_params = json.loads(args.index)
+            index_params.setdefault("metric_type", args.metric)
+            collection.create_index("vec", index_params)
+            utility.wait_for_index_building_complete(name, "vec")
+        collection.load()
+        grid = {key: values for key, values in (("nprobe", args.nprobe), ("ef", args.ef)) if values}
+        for row in evaluate(collection, "vec", dataset.queries, dataset.groundtruth, param_grid(args.metric, **grid),
+                            nq=args.nq, topk=args.topk, max_queries=args.max_queries):
+            print(row)
+    finally:
+        collection.drop()
+        if server is not None:
+            server.stop(0)
+
+
+if __name__ == "__main__":
+    main()
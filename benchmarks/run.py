@@ -0,0 +1,241 @@
+# Copyright (C) 2019-2021 Zilliz. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+
+"""
+Micro-benchmarks of the ORM hot paths, run against the in-process ``StubMilvus``.
+
+Usage::
+
+    python benchmarks/run.py                      # run and compare with baseline.json
+    python benchmarks/run.py -k insert            # only cases whose name contains "insert"
+    python benchmarks/run.py --update-baseline    # rewrite baseline.json with this run
+
+The process exits with status 1 when a case is slower than its baseline median by more
+than ``--tolerance``. Baselines are machine dependent, refresh them on the machine used
+for comparison.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from unittest import mock
+
+import numpy
+import pandas
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from pymilvus_orm import Collection, CollectionSchema, DataType, FieldSchema, VectorArray, connections
+from pymilvus_orm.prepare import InsertPlan, Prepare
+from pymilvus_orm.schema import parse_fields_from_dataframe
+from pymilvus_orm import utility
+from stub_milvus import StubMilvus
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DIM = 128
+NB = 2000
+NQ = 100
+TOPK = 10
+
+_CASES = []
+
+
+def case(func):
+    _CASES.append(func)
+    return func
+
+
+def _schema():
+    return CollectionSchema([
+        FieldSchema("id", DataType.INT64, is_primary=True),
+        FieldSchema("age", DataType.INT64),
+        FieldSchema("score", DataType.DOUBLE),
+        FieldSchema("vec", DataType.FLOAT_VECTOR, dim=DIM),
+    ])
+
+
+def _vectors(nb):
+    return numpy.random.random((nb, DIM)).astype(numpy.float32)
+
+
+def _list_data(nb):
+    return [list(range(nb)), [random.randint(0, 100) for _ in range(nb)],
+            [random.random() for _ in range(nb)], _vectors(nb).tolist()]
+
+
+def _dataframe(nb, vectors=None):
+    vectors = _vectors(nb) if vectors is None else vectors
+    return pandas.DataFrame({
+        "id": numpy.arange(nb, dtype=numpy.int64),
+        "age": numpy.random.randint(0, 100, nb),
+        "score": numpy.random.random(nb),
+        "vec": list(vectors),
+    })
+
+
+def _collection(name):
+    if connections.get_connection().has_collection(name):
+        connections.get_connection().drop_collection(name)
+    return Collection(name, _schema())
+
+
+@case
+def insert_prepare_list():
+    schema, data = _schema(), _list_data(NB)
+    return lambda: Prepare.prepare_insert_data(data, schema)
+
+
+@case
+def insert_plan_list():
+    plan, data = InsertPlan(_schema()), _list_data(NB)
+    return lambda: plan.apply(data)
+
+
+@case
+def insert_prepare_dataframe():
+    schema, data = _schema(), _dataframe(NB, _vectors(NB).tolist())
+    return lambda: Prepare.prepare_insert_data(data, schema)
+
+
+@case
+def insert_prepare_ndarray_rows():
+    schema, data = _schema(), _dataframe(NB)
+    return lambda: Prepare.prepare_insert_data(data, schema)
+
+
+@case
+def insert_prepare_vector_array():
+    schema, data = _schema(), _dataframe(NB, VectorArray(_vectors(NB)))
+    return lambda: Prepare.prepare_insert_data(data, schema)
+
+
+@case
+def insert_small_batch():
+    collection, data = _collection("bench_insert_small"), _list_data(10)
+    return lambda: collection.insert(data)
+
+
+@case
+def insert_large_batch():
+    collection, data = _collection("bench_insert_large"), _list_data(NB)
+    return lambda: collection.insert(data)
+
+
+@case
+def schema_inference_dataframe():
+    data = _dataframe(NB, _vectors(NB).tolist())
+    return lambda: parse_fields_from_dataframe(data)
+
+
+@case
+def search_result_wrapping():
+    collection = _collection("bench_search")
+    queries = _vectors(NQ).tolist()
+
+    def run():
+        res = collection.search(queries, "vec", {"metric_type": "L2"}, TOPK)
+        return [(hits.ids, hits.distances) for hits in res]
+
+    return run
+
+
+@case
+def calc_distance_reshape():
+    left = {"float_vectors": _vectors(50).tolist()}
+    right = {"float_vectors": _vectors(50).tolist()}
+    return lambda: utility.calc_distance(left, right)
+
+
+@case
+def connection_lookup():
+    def run():
+        for _ in range(1000):
+            connections.get_connection("default")
+
+    return run
+
+
+def measure(func, repeat, min_time):
+    func()
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2
+    samples = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return {"median_us": round(statistics.median(samples) * 1e6, 2),
+            "min_us": round(min(samples) * 1e6, 2),
+            "loops": number}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="keyword", default="", help="only run cases containing this keyword")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.05, help="seconds per sample")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown ratio")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    random.seed(0)
+    numpy.random.seed(0)
+    with mock.patch("pymilvus_orm.connections.Milvus", StubMilvus):
+        connections.connect()
+        results = {}
+        for func in _CASES:
+            if args.keyword in func.__name__:
+                results[func.__name__] = measure(func(), args.repeat, args.min_time)
+        connections.remove_connection("default")
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    regressions = []
+    for name, res in results.items():
+        line = f"{name:32s} {res['median_us']:>12.2f} us"
+        base = baseline.get(name, None)
+        if base is not None:
+            ratio = res["median_us"] / base["median_us"]
+            line += f"   baseline {base['median_us']:>12.2f} us   x{ratio:.2f}"
+            if ratio > 1 + args.tolerance:
+                regressions.append(name)
+                line += "   REGRESSION"
+        print(line)
+
+    if args.update_baseline:
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        return 0
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
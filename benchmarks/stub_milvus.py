@@ -0,0 +1,204 @@
+# Copyright (C) 2019-2021 Zilliz. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+
+"""
+In-process stand-in for ``pymilvus.Milvus`` used by the benchmarks.
+
+Unlike ``tests/mock_milvus.py`` every data-bearing call pays the client-side cost of a real
+RPC: the request is built with pymilvus' own ``Prepare`` helpers, serialized to protobuf
+bytes and parsed back, and the response is built as a protobuf message, serialized, parsed
+and wrapped in pymilvus' result classes. Nothing is sent over the network and search hits
+are synthetic.
+"""
+
+import copy
+
+import numpy
+from pymilvus.client.abstract import ChunkedQueryResult, MutationResult
+from pymilvus.client.prepare import Prepare
+from pymilvus.grpc_gen import common_pb2, milvus_pb2, schema_pb2
+
+
+def _roundtrip(message):
+    return type(message).FromString(message.SerializeToString())
+
+
+class StubMilvus:
+    def __init__(self, host=None, port=None, handler="GRPC", pool="SingletonThread", **kwargs):
+        self._collections = {}
+        self._partitions = {}
+        self._indexes = {}
+        self._row_counts = {}
+
+    def _check_collection(self, collection_name):
+        if collection_name not in self._collections:
+            raise BaseException(1, f"can't find collection: {collection_name}")
+
+    def create_collection(self, collection_name, fields, timeout=None, **kwargs):
+        if collection_name in self._collections:
+            raise BaseException(1, f"collection {collection_name} exist")
+        _roundtrip(Prepare.create_collection_request(collection_name, fields))
+        self._collections[collection_name] = {
+            "collection_name": collection_name,
+            "auto_id": fields.get("auto_id", False),
+            "description": fields.get("description", ""),
+            "fields": copy.deepcopy(fields["fields"]),
+        }
+        self._partitions[collection_name] = {"_default"}
+        self._indexes[collection_name] = None
+        self._row_counts[collection_name] = 0
+
+    def drop_collection(self, collection_name, timeout=None):
+        self._check_collection(collection_name)
+        for state in (self._collections, self._partitions, self._indexes, self._row_counts):
+            state.pop(collection_name)
+
+    def has_collection(self, collection_name, timeout=None):
+        _roundtrip(Prepare.has_collection_request(collection_name))
+        return collection_name in self._collections
+
+    def describe_collection(self, collection_name, timeout=None):
+        self._check_collection(collection_name)
+        _roundtrip(Prepare.describe_collection_request(collection_name))
+        return copy.deepcopy(self._collections[collection_name])
+
+    def list_collections(self, timeout=None):
+        return list(self._collections)
+
+    def load_collection(self, collection_name, timeout=None, **kwargs):
+        self._check_collection(collection_name)
+
+    def release_collection(self, collection_name, timeout=None, **kwargs):
+        self._check_collection(collection_name)
+
+    def get_collection_stats(self, collection_name, timeout=None, **kwargs):
+        self._check_collection(collection_name)
+        return {"row_count": self._row_counts[collection_name]}
+
+    def create_partition(self, collection_name, partition_name, timeout=None):
+        self._check_collection(collection_name)
+        self._partitions[collection_name].add(partition_name)
+
+    def drop_partition(self, collection_name, partition_name, timeout=None, **kwargs):
+        self._check_collection(collection_name)
+        self._partitions[collection_name].discard(partition_name)
+
+    def has_partition(self, collection_name, partition_name, timeout=None):
+        self._check_collection(collection_name)
+        return partition_name in self._partitions[collection_name]
+
+    def list_partitions(self, collection_name, timeout=None):
+        self._check_collection(collection_name)
+        return sorted(self._partitions[collection_name])
+
+    def load_partitions(self, collection_name, partition_names, timeout=None, **kwargs):
+        self._check_collection(collection_name)
+
+    def release_partitions(self, collection_name, partition_names, timeout=None, **kwargs):
+        self._check_collection(collection_name)
+
+    def get_partition_stats(self, collection_name, partition_name, timeout=None, **kwargs):
+        self._check_collection(collection_name)
+        return {"row_count": 0}
+
+    def create_index(self, collection_name, field_name, params, timeout=None, **kwargs):
+        self._check_collection(collection_name)
+        self._indexes[collection_name] = dict(params, field_name=field_name)
+
+    def describe_index(self, collection_name, index_name="", timeout=None):
+        index = self._indexes.get(collection_name, None)
+        return copy.deepcopy(index)
+
+    def drop_index(self, collection_name, field_name, timeout=None, **kwargs):
+        self._indexes[collection_name] = None
+
+    def get_index_build_progress(self, collection_name, index_name, timeout=None):
+        rows = self._row_counts.get(collection_name, 0)
+        return {"total_rows": rows, "indexed_rows": rows}
+
+    def wait_for_creating_index(self, collection_name, index_name, timeout=None):
+        return True, ""
+
+    def load_collection_progress(self, collection_name, timeout=None):
+        rows = self._row_counts.get(collection_name, 0)
+        return {"num_loaded_entities": rows, "num_total_entities": rows}
+
+    def load_partitions_progress(self, collection_name, partition_names, timeout=None):
+        return self.load_collection_progress(collection_name, timeout)
+
+    def wait_for_loading_collection_complete(self, collection_name, timeout=None):
+        pass
+
+    def wait_for_loading_partitions_complete(self, collection_name, partition_names, timeout=None):
+        pass
+
+    def insert(self, collection_name, entities, ids=None, partition_name=None, timeout=None, **kwargs):
+        self._check_collection(collection_name)
+        fields_info = self._collections[collection_name]["fields"]
+        request = _roundtrip(Prepare.bulk_insert_param(collection_name, entities, partition_name,
+                                                       fields_info))
+        first = self._row_counts[collection_name]
+        response = milvus_pb2.MutationResult(
+            status=common_pb2.Status(error_code=0),
+            IDs=schema_pb2.IDs(int_id=schema_pb2.LongArray(data=range(first, first + request.num_rows))),
+            insert_cnt=request.num_rows,
+        )
+        self._row_counts[collection_name] += request.num_rows
+        return MutationResult(_roundtrip(response))
+
+    def flush(self, collection_names=None, timeout=None, **kwargs):
+        pass
+
+    def search_with_expression(self, collection_name, data, anns_field, param, limit, expression=None,
+                               partition_names=None, output_fields=None, timeout=None, **kwargs):
+        schema = self.describe_collection(collection_name)
+        requests = Prepare.search_requests_with_expr(collection_name, data, anns_field, param, limit,
+                                                     expression, partition_names, output_fields,
+                                                     schema=schema)
+        raws = []
+        for request in requests:
+            request = _roundtrip(request)
+            group = milvus_pb2.PlaceholderGroup.FromString(request.placeholder_group)
+            nq = len(group.placeholders[0].values)
+            response = milvus_pb2.SearchResults(
+                status=common_pb2.Status(error_code=0),
+                results=schema_pb2.SearchResultData(
+                    num_queries=nq,
+                    top_k=limit,
+                    scores=[float(i) for _ in range(nq) for i in range(limit)],
+                    ids=schema_pb2.IDs(int_id=schema_pb2.LongArray(data=[i for _ in range(nq)
+                                                                         for i in range(limit)])),
+                    topks=[limit] * nq,
+                ),
+            )
+            raws.append(_roundtrip(response))
+        return ChunkedQueryResult(raws, schema["auto_id"])
+
+    def query(self, collection_name, expr, output_fields=None, partition_names=None, timeout=None):
+        self._check_collection(collection_name)
+        _roundtrip(Prepare.query_request(collection_name, expr, output_fields, partition_names))
+        return []
+
+    def calc_distance(self, vectors_left, vectors_right, params=None, timeout=None, **kwargs):
+        params = params or {"metric": "L2"}
+        request = _roundtrip(Prepare.calc_distance_request(vectors_left, vectors_right, params))
+        left = numpy.array(request.op_left.data_array.float_vector.data, dtype=numpy.float32)
+        right = numpy.array(request.op_right.data_array.float_vector.data, dtype=numpy.float32)
+        dim = request.op_left.data_array.dim
+        left, right = left.reshape(-1, dim), right.reshape(-1, dim)
+        dist = ((left[:, None, :] - right[None, :, :]) ** 2).sum(axis=-1)
+        response = milvus_pb2.CalcDistanceResults(status=common_pb2.Status(error_code=0),
+                                                  float_dist=schema_pb2.FloatArray(data=dist.ravel()))
+        return _roundtrip(response).float_dist.data
+
+    def close(self):
+        pass
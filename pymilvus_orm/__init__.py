@@ -23,8 +23,11 @@ from .connections import (
         remove_connection,
         connect,
         get_connection,
+        get_default_timeout,
+        get_single_flight_reads,
         disconnect
 )
+from .deadline import deadline
 
 from .index import Index
 from .partition import Partition
@@ -33,15 +36,26 @@ from .utility import (
         index_building_progress,
         wait_for_loading_complete,
         wait_for_index_building_complete,
+        wait_for_all_loading_complete,
+        wait_for_all_index_building_complete,
+        build_indexes,
+        load_many,
+        release_many,
         has_collection,
         has_partition,
         list_collections,
+        inventory,
 )
 
 from .search import SearchResult, Hits, Hit
 from .types import DataType
+from .expression import Expr, Fields
 from .schema import FieldSchema, CollectionSchema
 from .future import SearchFuture, MutationFuture
+from .index_build import IndexBuildFuture, IndexBuildManager
+from .retention import RetentionManager, RetentionPlan
+from .snapshot import CollectionSnapshot, Inventory
+from .vectors import VectorArray, VectorDtype
 
 __version__ = '0.0.0.dev'
 
@@ -0,0 +1,169 @@
+# Copyright (C) 2019-2021 Zilliz. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+
+"""
+Search micro-batching: concurrent searches sharing their parameters are sent as one search
+request holding the vectors of all of them, and the result is split back to every caller.
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy
+
+from .deadline import current_deadline, deadline_at, remaining_timeout
+from .instrumentation import span, record_vectors
+from .search import _QueryResultSlice
+
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_DELAY = 0.002
+DEFAULT_MAX_IN_FLIGHT = 4
+
+
+def _batch_key(anns_field, param, limit, expr, partition_names, output_fields):
+    return (anns_field, json.dumps(param, sort_keys=True, default=str), limit, expr,
+            tuple(partition_names or ()), tuple(output_fields or ()))
+
+
+def _concat(chunks):
+    if all(isinstance(chunk, numpy.ndarray) for chunk in chunks):
+        return numpy.concatenate(chunks)
+    vectors = []
+    for chunk in chunks:
+        vectors.extend(chunk)
+    return vectors
+
+
+class _Batch:
+    __slots__ = ("args", "chunks", "futures", "expires", "nq", "opened_at")
+
+    def __init__(self, args):
+        self.args = args
+        self.chunks = []
+        self.futures = []
+        self.expires = []
+        self.nq = 0
+        self.opened_at = time.monotonic()
+
+
+class SearchCoalescer:
+    """
+    Collects the searches on a collection that share ``anns_field``, ``param``, ``limit``,
+    ``expr``, ``partition_names`` and ``output_fields``, and sends them as one search
+    request once ``max_delay`` seconds passed since the first of them or ``max_batch_size``
+    query vectors are collected.
+
+    Requests are sent from a pool of ``max_in_flight`` threads. A batched request runs under
+    the latest deadline of its callers, and every caller waits for its own part of the
+    result within its own deadline.
+
+    Created by `collection.Collection.enable_search_coalescing`.
+    """
+
+    def __init__(self, collection, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_delay=DEFAULT_MAX_DELAY,
+                 max_in_flight=DEFAULT_MAX_IN_FLIGHT):
+        self._collection = collection
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="SearchCoalescer")
+        self._cond = threading.Condition()
+        self._batches = {}
+        self._thread = None
+        self._closed = False
+        self.requests = 0
+        self.batches = 0
+
+    def submit(self, data, anns_field, param, limit, expr=None, partition_names=None, output_fields=None):
+        """
+        Queues a search.
+
+        :return concurrent.futures.Future:
+            Resolves to the query result of ``data`` alone, to be wrapped in a `SearchResult`.
+        """
+        future = Future()
+        key = _batch_key(anns_field, param, limit, expr, partition_names, output_fields)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("cannot submit searches after the coalescer is closed")
+            batch = self._batches.get(key)
+            if batch is None:
+                batch = self._batches[key] = _Batch((anns_field, param, limit, expr, partition_names,
+                                                     output_fields))
+            batch.chunks.append(data)
+            batch.futures.append(future)
+            batch.expires.append(current_deadline())
+            batch.nq += len(data)
+            self.requests += 1
+            if batch.nq >= self.max_batch_size:
+                del self._batches[key]
+                self._dispatch(batch)
+            elif self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="SearchCoalescer", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return future
+
+    def _dispatch(self, batch):
+        self.batches += 1
+        self._executor.submit(self._send, batch)
+
+    def _run(self):
+        with self._cond:
+            while not self._closed or self._batches:
+                now = time.monotonic()
+                for key, batch in list(self._batches.items()):
+                    if self._closed or now - batch.opened_at >= self.max_delay:
+                        del self._batches[key]
+                        self._dispatch(batch)
+                if self._batches:
+                    opened = min(batch.opened_at for batch in self._batches.values())
+                    self._cond.wait(max(0.0, opened + self.max_delay - now))
+                elif not self._closed:
+                    self._cond.wait()
+
+    def _send(self, batch):
+        anns_field, param, limit, expr, partition_names, output_fields = batch.args
+        expire = None if None in batch.expires else max(batch.expires)
+        data = _concat(batch.chunks)
+        try:
+            conn = self._collection._get_connection()
+            with deadline_at(expire), span("search.rpc") as rpc_span:
+                record_vectors(rpc_span, data)
+                res = conn.search_with_expression(self._collection.name, data, anns_field, param, limit, expr,
+                                                  partition_names, output_fields, remaining_timeout())
+        except Exception as err:
+            for future in batch.futures:
+                future.set_exception(err)
+            return
+        start = 0
+        for chunk, future in zip(batch.chunks, batch.futures):
+            future.set_result(_QueryResultSlice(res, start, start + len(chunk)))
+            start += len(chunk)
+
+    def stats(self):
+        """
+        Returns the searches submitted and the search requests sent for them.
+        """
+        return {"requests": self.requests, "batches": self.batches}
+
+    def close(self):
+        """
+        Sends the searches still queued and stops the coalescer.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+        self._executor.shutdown(wait=True)
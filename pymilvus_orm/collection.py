@@ -11,31 +11,52 @@
 # the License.
 import copy
 import json
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 
+import numpy
 import pandas
 
-from .connections import get_connection
+from .connections import get_connection, get_default_timeout, get_single_flight_reads
+from .deadline import deadline, deadline_at, current_deadline, remaining_timeout
+from .instrumentation import span, record_entities, record_vectors, ATTR_ROWS
 from .schema import (
     CollectionSchema,
     FieldSchema,
     parse_fields_from_data,
-    infer_dtype_bydata,
 )
-from .prepare import Prepare
+from .prepare import InsertPlan, group_rows, take_entities, DEFAULT_INSERT_CONCURRENCY
+from .loader import load_from_files, DEFAULT_BATCH_SIZE, DEFAULT_MAX_PENDING
 from .partition import Partition
 from .index import Index
-from .search import SearchResult
+from .index_build import IndexBuildFuture
+from .singleflight import single_flight, fingerprint
+from .coalescer import SearchCoalescer, DEFAULT_MAX_BATCH_SIZE, DEFAULT_MAX_DELAY, DEFAULT_MAX_IN_FLIGHT
+from .search_cache import SemanticSearchCache, DEFAULT_MAX_ENTRIES, LRU
+from .expression import Fields, parse_expr, render_expr
+from .routing import route
+from .snapshot import take_snapshot, DEFAULT_METADATA_TTL
+from .fetch import EntityCache, fetch_entities, DEFAULT_FETCH_BATCH_SIZE, DEFAULT_FETCH_CONCURRENCY
+from .search import SearchResult, _QueryResultSlice, _empty_query_result
 from .mutation import MutationResult
-from .types import DataType
+from .types import (
+    DataType,
+    infer_dtypes_of_column,
+    infer_vector_dim_of_column,
+    is_vector_column_of,
+    is_arrow_data,
+    is_arrow_reader,
+)
 from .exceptions import (
     SchemaNotReadyException,
-    DataTypeNotMatchException,
     DataNotMatchException,
     ConnectionNotExistException,
     PartitionAlreadyExistException,
     PartitionNotExistException,
     IndexNotExistException,
     AutoIDException,
+    DeadlineExceededException,
+    InvalidArgumentException,
+    InvalidExpressionException,
     ExceptionsMessage,
 )
 from .future import SearchFuture, MutationFuture
@@ -55,18 +76,21 @@ def _check_schema(schema):
 
 
 def _check_data_schema(fields, data):
+    if is_arrow_data(data):
+        # Arrow columns are typed, the schema of the data already describes them
+        return
     if isinstance(data, pandas.DataFrame):
-        for i, field in enumerate(fields):
-            for j, _ in enumerate(data[field.name]):
-                tmp_type = infer_dtype_bydata(data[field.name].iloc[j])
-                if tmp_type != field.dtype:
-                    raise DataNotMatchException(0, ExceptionsMessage.DataTypeInconsistent)
+        columns = [data[field.name] for field in fields]
     else:
-        for i, field in enumerate(fields):
-            for j, _ in enumerate(data[i]):
-                tmp_type = infer_dtype_bydata(data[i][j])
-                if tmp_type != field.dtype:
-                    raise DataNotMatchException(0, ExceptionsMessage.DataTypeInconsistent)
+        columns = data
+    for field, column in zip(fields, columns):
+        if field.dtype in (DataType.FLOAT_VECTOR, DataType.BINARY_VECTOR):
+            if not is_vector_column_of(column, field.dtype):
+                raise DataNotMatchException(0, ExceptionsMessage.DataTypeInconsistent)
+            if infer_vector_dim_of_column(column) is None:
+                raise DataNotMatchException(0, ExceptionsMessage.VectorDimInconsistent)
+        elif infer_dtypes_of_column(column) - {field.dtype}:
+            raise DataNotMatchException(0, ExceptionsMessage.DataTypeInconsistent)
 
 
 class Collection:
@@ -89,6 +113,18 @@ class Collection:
         :param using: Milvus link of create collection
         :type using: str
 
+        :param kwargs:
+            * *default_timeout* (``float``) --
+              The timeout in seconds applied to every call on this collection when the caller
+              passes no timeout. Falls back to the default timeout of the connection.
+            * *single_flight_reads* (``bool``) --
+              Whether concurrent identical searches and queries on this collection share one
+              in-flight RPC. Falls back to the option of the connection.
+            * *metadata_ttl* (``float``) --
+              The seconds `partitions`, `indexes`, `index` and the representation of the
+              collection reuse a metadata snapshot, see `describe`. 1 by default, 0 to always
+              ask the server. Changes made through this collection are seen at once.
+
         :example:
             >>> from pymilvus_orm import connections, Collection, FieldSchema, CollectionSchema, DataType
             >>> connections.connect()
@@ -112,10 +148,24 @@ class Collection:
         self._name = name
         self._using = using
         self._kwargs = kwargs
+        self._insert_plan = None
+        self._search_coalescer = None
+        self._search_cache = None
+        self._entity_cache = None
+        self._partition_rules = []
+        self._known_partitions = None
+        self._expr_fields = None
+        self._snapshot = None
+        with self._deadline(None):
+            self._init_schema(schema)
+
+    def _init_schema(self, schema):
         conn = self._get_connection()
-        has = conn.has_collection(self._name)
+        has = single_flight(self._using, ("has_collection", self._name),
+                            lambda: conn.has_collection(self._name, timeout=remaining_timeout()))
         if has:
-            resp = conn.describe_collection(self._name)
+            resp = single_flight(self._using, ("describe_collection", self._name),
+                                 lambda: conn.describe_collection(self._name, timeout=remaining_timeout()))
             server_schema = CollectionSchema.construct_from_dict(resp)
             if schema is None:
                 self._schema = server_schema
@@ -131,7 +181,7 @@ class Collection:
                 raise SchemaNotReadyException(0, ExceptionsMessage.NoSchema)
             if isinstance(schema, CollectionSchema):
                 _check_schema(schema)
-                conn.create_collection(self._name, fields=schema.to_dict())
+                conn.create_collection(self._name, fields=schema.to_dict(), timeout=remaining_timeout())
                 self._schema = schema
             else:
                 raise SchemaNotReadyException(0, ExceptionsMessage.SchemaType)
@@ -144,45 +194,98 @@ class Collection:
             'description': self.description,
         })
 
+    def describe(self, full=False, timeout=None):
+        """
+        Returns a snapshot of the metadata of the collection: its partitions and index, and
+        with ``full`` the entity counts of the collection and of every partition. The RPCs
+        are sent concurrently, the partition counts once the partitions are listed, so the
+        snapshot costs two round trips whatever the number of partitions.
+
+        The snapshot is kept, and `partitions`, `indexes`, `index` and the representation of
+        the collection read it while it is younger than the ``metadata_ttl`` of the
+        collection.
+
+        :param full: Whether to also get the entity counts, without a flush.
+        :type  full: bool
+        :param timeout: The time in seconds to allow for all the RPCs.
+        :type  timeout: float
+
+        :return CollectionSnapshot:
+
+        :example:
+            >>> snapshot = collection.describe(full=True)
+            >>> snapshot.partition_names, snapshot.partition_entities
+            (['_default', 'comedy'], {'_default': 0, 'comedy': 120})
+            >>> snapshot.to_dict()["index"]
+            {'field_name': 'films', 'index_type': 'IVF_FLAT', 'metric_type': 'L2', 'params': {'nlist': 128}}
+        """
+        conn = self._get_connection()
+        with self._deadline(timeout), span("describe"):
+            snapshot = take_snapshot(self, conn, full)
+        self._snapshot = snapshot
+        return snapshot
+
+    def _metadata(self):
+        """
+        Returns the kept snapshot if it is younger than the metadata TTL, or takes one.
+        """
+        snapshot = self._snapshot
+        ttl = self._kwargs.get("metadata_ttl", DEFAULT_METADATA_TTL)
+        if snapshot is None or snapshot.age() > ttl:
+            snapshot = self.describe()
+        return snapshot
+
+    def _invalidate_metadata(self):
+        """
+        Drops the metadata kept after a change of partitions or index through this collection.
+        """
+        self._snapshot = None
+        self._known_partitions = None
+
+    def _invalidate_results(self):
+        """
+        Drops the cached search hits and entities after a write through this collection.
+        """
+        if self._search_cache is not None:
+            self._search_cache.clear()
+        if self._entity_cache is not None:
+            self._entity_cache.clear()
+
     def _get_connection(self):
         conn = get_connection(self._using)
         if conn is None:
             raise ConnectionNotExistException(0, ExceptionsMessage.ConnectFirst)
         return conn
 
-    def _check_insert_data_schema(self, data):
+    def _deadline(self, timeout):
         """
-        Checks whether the data type matches the schema.
+        Returns the deadline context bounding all RPCs of one call on this collection.
         """
-        if self._schema is None:
-            return False
-        if self._schema.auto_id:
-            if isinstance(data, pandas.DataFrame):
-                if self._schema.primary_field.name in data:
-                    if not data[self._schema.primary_field.name].isnull().all():
-                        raise DataNotMatchException(0, ExceptionsMessage.AutoIDWithData)
-                    data = data.drop(self._schema.primary_field.name, axis=1)
-
-        infer_fields = parse_fields_from_data(data)
-        tmp_fields = copy.deepcopy(self._schema.fields)
-
-        for i, field in enumerate(self._schema.fields):
-            if field.is_primary and field.auto_id:
-                tmp_fields.pop(i)
+        if timeout is None:
+            timeout = self._kwargs.get("default_timeout", None)
+        if timeout is None:
+            timeout = get_default_timeout(self._using)
+        return deadline(timeout)
 
-        if len(infer_fields) != len(tmp_fields):
-            raise DataTypeNotMatchException(0, ExceptionsMessage.FieldsNumInconsistent)
-
-        _check_data_schema(infer_fields, data)
-
-        for x, y in zip(infer_fields, tmp_fields):
-            if x.dtype != y.dtype:
-                return False
-            if isinstance(data, pandas.DataFrame):
-                if x.name != y.name:
-                    return False
-            # todo check dim
-        return True
+    def _describe_index(self, conn):
+        """
+        Describes the index of the collection, sharing the RPC with identical concurrent calls.
+        """
+        index = single_flight(self._using, ("describe_index", self._name),
+                              lambda: conn.describe_index(self._name, "", timeout=remaining_timeout()))
+        return None if index is None else dict(index)
+
+    def _single_flight_reads(self):
+        enabled = self._kwargs.get("single_flight_reads", None)
+        if enabled is None:
+            enabled = get_single_flight_reads(self._using)
+        return enabled
+
+    def _get_insert_plan(self):
+        plan = self._insert_plan
+        if plan is None or plan.schema is not self._schema:
+            plan = self._insert_plan = InsertPlan(self._schema)
+        return plan
 
     def _check_schema(self):
         if self._schema is None:
@@ -225,10 +328,8 @@ class Collection:
             fields.insert(pk_index, FieldSchema(name=primary_field, dtype=DataType.INT64, is_primary=True, auto_id=True,
                                                 **kwargs))
         else:
-            for field in fields:
-                if field.name == primary_field:
-                    field.is_primary = True
-                    field.auto_id = False
+            fields = [field._replace(is_primary=True, auto_id=False) if field.name == primary_field else field
+                      for field in fields]
 
         schema = CollectionSchema(fields=fields)
         _check_schema(schema)
@@ -345,8 +446,10 @@ class Collection:
             2
             """
         conn = self._get_connection()
-        conn.flush([self._name])
-        status = conn.get_collection_stats(db_name="", collection_name=self._name)
+        with self._deadline(None):
+            conn.flush([self._name], timeout=remaining_timeout())
+            status = conn.get_collection_stats(db_name="", collection_name=self._name,
+                                               timeout=remaining_timeout())
         return status["row_count"]
 
     @property
@@ -398,10 +501,14 @@ class Collection:
             False
         """
         conn = self._get_connection()
-        indexes = self.indexes
-        for index in indexes:
-            index.drop(timeout=timeout, **kwargs)
-        conn.drop_collection(self._name, timeout=timeout, **kwargs)
+        self._invalidate_metadata()
+        with self._deadline(timeout):
+            indexes = self.indexes
+            for index in indexes:
+                index.drop(**kwargs)
+            conn.drop_collection(self._name, timeout=remaining_timeout(), **kwargs)
+        self._invalidate_metadata()
+        self._invalidate_results()
 
     def load(self, partition_names=None, timeout=None, **kwargs):
         """
@@ -434,10 +541,11 @@ class Collection:
             2
         """
         conn = self._get_connection()
-        if partition_names is not None:
-            conn.load_partitions(self._name, partition_names, timeout=timeout, **kwargs)
-        else:
-            conn.load_collection(self._name, timeout=timeout, **kwargs)
+        with self._deadline(timeout):
+            if partition_names is not None:
+                conn.load_partitions(self._name, partition_names, timeout=remaining_timeout(), **kwargs)
+            else:
+                conn.load_collection(self._name, timeout=remaining_timeout(), **kwargs)
 
     def release(self, timeout=None, **kwargs):
         """
@@ -467,15 +575,19 @@ class Collection:
             >>> collection.release()    # release the collection from memory
         """
         conn = self._get_connection()
-        conn.release_collection(self._name, timeout=timeout, **kwargs)
+        with self._deadline(timeout):
+            conn.release_collection(self._name, timeout=remaining_timeout(), **kwargs)
 
-    def insert(self, data, partition_name=None, timeout=None, **kwargs):
+    def insert(self, data, partition_name=None, timeout=None, partition_by=None, create_partitions=False,
+               max_concurrency=DEFAULT_INSERT_CONCURRENCY, **kwargs):
         """
         Insert data into the collection.
 
         :param data: The specified data to insert, the dimension of data needs to align with column
-                     number
-        :type  data: list-like(list, tuple) object or pandas.DataFrame
+                     number. A pyarrow RecordBatchReader is inserted batch by batch, one request
+                     per batch, and the merged result is returned; ``_async`` is ignored for it.
+        :type  data: list-like(list, tuple) object, pandas.DataFrame, pyarrow.Table,
+                     pyarrow.RecordBatch or pyarrow.RecordBatchReader
         :param partition_name: The partition name which the data will be inserted to, if partition
                                name is not passed, then the data will be inserted to "_default"
                                partition
@@ -486,7 +598,21 @@ class Collection:
               An optional duration of time in seconds to allow for the RPC. If timeout
               is set to None, the client keeps waiting until the server responds or an error occurs.
 
+        :param partition_by: Routes every row to a partition instead of ``partition_name``: the
+                             name of a field whose values are the partition names, or a callable
+                             returning the partition name of every row of ``data``. The rows of
+                             each partition are inserted by their own request, ``max_concurrency``
+                             at a time, and one merged result is returned; ``_async`` is ignored.
+        :type  partition_by: str or callable
+        :param create_partitions: Whether to create the partitions ``partition_by`` routes to that
+                                  do not exist yet.
+        :type  create_partitions: bool
+        :param max_concurrency: The number of insert requests in flight with ``partition_by``.
+        :type  max_concurrency: int
+
         :raises CollectionNotExistException: If the specified collection does not exist.
+        :raises DataNotMatchException: If the types or dimensions of the data do not match the
+                                       schema.
         :raises ParamError: If input parameters are invalid.
         :raises BaseException: If the specified partition does not exist.
 
@@ -507,18 +633,129 @@ class Collection:
             >>> collection.insert(data)
             >>> collection.num_entities
             10
+            >>> df = pandas.DataFrame({"film_id": [1, 2, 3], "genre": ["comedy", "drama", "comedy"], ...})
+            >>> collection.insert(df, partition_by="genre", create_partitions=True)
         """
         if data is None:
             return MutationResult(data)
-        if not self._check_insert_data_schema(data):
-            raise SchemaNotReadyException(0, ExceptionsMessage.TypeOfDataAndSchemaInconsistent)
+        if partition_by is not None and partition_name is not None:
+            raise InvalidArgumentException(0, ExceptionsMessage.PartitionByWithName)
+        if is_arrow_reader(data):
+            return self._insert_batches(data, partition_name, timeout, partition_by=partition_by,
+                                        create_partitions=create_partitions, max_concurrency=max_concurrency,
+                                        **kwargs)
+        self._check_schema()
         conn = self._get_connection()
-        entities = Prepare.prepare_insert_data(data, self._schema)
-        res = conn.insert(collection_name=self._name, entities=entities, ids=None,
-                          partition_name=partition_name, timeout=timeout, **kwargs)
+        with span("insert.prepare") as prepare_span:
+            entities = self._get_insert_plan().apply(data, check=True)
+            record_entities(prepare_span, entities)
+        if partition_by is not None:
+            kwargs.pop("_async", None)
+            with self._deadline(timeout):
+                return self._insert_partitioned(conn, data, entities, partition_by, create_partitions,
+                                                max_concurrency, **kwargs)
+        with self._deadline(timeout), span("insert.rpc") as rpc_span:
+            record_entities(rpc_span, entities)
+            res = conn.insert(collection_name=self._name, entities=entities, ids=None,
+                              partition_name=partition_name, timeout=remaining_timeout(), **kwargs)
+        self._invalidate_results()
         if kwargs.get("_async", False):
             return MutationFuture(res)
-        return MutationResult(res)
+        with span("insert.result"):
+            return MutationResult(res)
+
+    def load_from_files(self, paths, partition_name=None, batch_size=DEFAULT_BATCH_SIZE,
+                        max_pending=DEFAULT_MAX_PENDING, timeout=None, **kwargs):
+        """
+        Inserts the rows of Parquet, npy, npz, fvecs, ivecs or bvecs files into the collection.
+
+        Parquet files are streamed by row groups and the other files are memory-mapped, both
+        in chunks of ``batch_size`` rows. Each chunk is sent as its own insert request while
+        the next chunk is read, with at most ``max_pending`` requests in flight, so the files
+        do not need to fit in memory. Columns are mapped to the fields of the schema by name;
+        an auto_id primary field is not read.
+
+        :param paths: Parquet or npz files with one column or array per field, read one after
+                      another. Or a dict mapping each field to a npy, fvecs, ivecs or bvecs file
+                      holding its data, read side by side. A single array file can be passed
+                      directly if the collection has one field to insert.
+        :type  paths: str, list[str] or dict
+        :param partition_name: The partition the rows are inserted into, "_default" if None.
+        :type  partition_name: str
+        :param batch_size: The number of rows of each insert request.
+        :type  batch_size: int
+        :param max_pending: The number of insert requests in flight while reading.
+        :type  max_pending: int
+        :param timeout: The budget in seconds of the whole load.
+        :type  timeout: float
+
+        :return MutationResult:
+            The merged result of all insert requests.
+
+        :raises DataNotMatchException: If a file misses a field or its data does not match it.
+        :raises DataTypeNotSupportException: If a file type is not supported.
+
+        :example:
+            >>> from pymilvus_orm import connections, Collection, FieldSchema, CollectionSchema, DataType
+            >>> connections.connect()
+            >>> schema = CollectionSchema([
+            ...     FieldSchema("film_id", DataType.INT64, is_primary=True, auto_id=True),
+            ...     FieldSchema("films", dtype=DataType.FLOAT_VECTOR, dim=128)
+            ... ])
+            >>> collection = Collection("test_collection_load_from_files", schema)
+            >>> res = collection.load_from_files("sift_base.fvecs")
+            >>> res = collection.load_from_files(["films-0.parquet", "films-1.parquet"], batch_size=50000)
+        """
+        with self._deadline(timeout):
+            return load_from_files(self, paths, partition_name=partition_name, batch_size=batch_size,
+                                   max_pending=max_pending, **kwargs)
+
+    def _insert_partitioned(self, conn, data, entities, partition_by, create_partitions, max_concurrency,
+                            **kwargs):
+        if callable(partition_by):
+            keys = partition_by(data)
+        else:
+            column = next((entity for entity in entities if entity["name"] == partition_by), None)
+            if column is None:
+                raise InvalidArgumentException(0, ExceptionsMessage.PartitionByNotExist % partition_by)
+            keys = column["values"]
+        with span("insert.partition"):
+            keys, groups, order = group_rows(keys)
+            if len(order) != (len(entities[0]["values"]) if entities else 0):
+                raise DataNotMatchException(0, ExceptionsMessage.DataLengthsInconsistent)
+            names = [str(key) for key in keys]
+        if create_partitions and names:
+            existing = set(conn.list_partitions(self._name, timeout=remaining_timeout()))
+            for name in names:
+                if name not in existing:
+                    conn.create_partition(self._name, name, timeout=remaining_timeout())
+        expire = current_deadline()
+
+        def send(name, rows):
+            with deadline_at(expire), span("insert.rpc") as rpc_span:
+                group = take_entities(entities, rows)
+                record_entities(rpc_span, group)
+                return MutationResult(conn.insert(collection_name=self._name, entities=group, ids=None,
+                                                  partition_name=name, timeout=remaining_timeout(), **kwargs))
+
+        result = MutationResult(None)
+        if len(names) <= 1:
+            results = [send(name, rows) for name, rows in zip(names, groups)]
+        else:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(names)))) as executor:
+                results = list(executor.map(send, names, groups))
+        self._invalidate_results()
+        for res in results:
+            result._merge(res)
+        return result._reorder(order)
+
+    def _insert_batches(self, reader, partition_name, timeout, **kwargs):
+        kwargs.pop("_async", None)
+        result = MutationResult(None)
+        with self._deadline(timeout):
+            for batch in reader:
+                result._merge(self.insert(batch, partition_name, **kwargs))
+        return result
 
     def search(self, data, anns_field, param, limit, expr=None, partition_names=None,
                output_fields=None, timeout=None, **kwargs):
@@ -534,9 +771,11 @@ class Collection:
         :type  param: dict
         :param limit: The max number of returned record, also known as ``topk``.
         :type  limit: int
-        :param expr: The boolean expression used to filter attribute.
-        :type  expr: str
-        :param partition_names: The names of partitions to search.
+        :param expr: The boolean expression used to filter attribute, a string or an `Expr`
+                     built with `pymilvus_orm.expression.Fields`.
+        :type  expr: str or Expr
+        :param partition_names: The names of partitions to search. If None, the partition rules
+                                narrow them from ``expr``, see `add_partition_rule`.
         :type  partition_names: list[str]
         :param output_fields: The fields to return in the search result, not supported now.
         :type  output_fields: list[str]
@@ -551,6 +790,11 @@ class Collection:
               The callback function which is invoked after server response successfully.
               It functions only if _async is set to True.
 
+            When search coalescing is enabled, see `enable_search_coalescing`, searches without
+            other keyword arguments than ``_async`` are batched with concurrent ones. When the
+            search cache is enabled, see `enable_search_cache`, float vectors of searches without
+            keyword arguments are looked up in it first.
+
         :return: SearchResult:
             SearchResult is iterable and is a 2d-array-like class, the first dimension is
             the number of vectors to query (nq), the second dimension is the number of limit(topk).
@@ -597,27 +841,175 @@ class Collection:
             >>> print(f"- Top1 hit id: {hits[0].id}, distance: {hits[0].distance}, score: {hits[0].score} ")
             - Top1 hit id: 8, distance: 0.10143111646175385, score: 0.10143111646175385
         """
-        if expr is not None and not isinstance(expr, str):
-            raise DataTypeNotMatchException(0, ExceptionsMessage.ExprType % type(expr))
+        if partition_names is None and self._partition_rules:
+            with self._deadline(timeout):
+                partition_names = self._route_partitions(expr)
+            if partition_names == []:
+                res = _empty_query_result(len(data))
+                if kwargs.get("_async", False):
+                    future = Future()
+                    future.set_result(res)
+                    return SearchFuture(future)
+                return SearchResult(res)
+        if expr is not None:
+            expr = render_expr(expr, self._schema)
+
+        cache = self._search_cache
+        if cache is not None and not kwargs:
+            queries = cache.as_matrix(data)
+            if queries is not None:
+                return self._search_cached(cache, queries, data, anns_field, param, limit, expr, partition_names,
+                                           output_fields, timeout)
+        return self._search(data, anns_field, param, limit, expr, partition_names, output_fields, timeout,
+                            **kwargs)
+
+    def _search_cached(self, cache, queries, data, anns_field, param, limit, expr, partition_names, output_fields,
+                       timeout):
+        key = cache.key(anns_field, param, limit, expr, partition_names, output_fields)
+        with span("search.cache"):
+            hits, missing = cache.lookup(key, queries)
+        if missing:
+            res = self._search([data[i] for i in missing], anns_field, param, limit, expr, partition_names,
+                               output_fields, timeout)
+            for position, i in enumerate(missing):
+                hits[i] = res[position]
+                cache.store(key, queries[i], hits[i])
+        return SearchResult(_QueryResultSlice(hits, 0, len(hits)))
+
+    def _search(self, data, anns_field, param, limit, expr, partition_names, output_fields, timeout, **kwargs):
+        coalescer = self._search_coalescer
+        if coalescer is not None and not set(kwargs) - {"_async"}:
+            with self._deadline(timeout):
+                future = coalescer.submit(data, anns_field, param, limit, expr, partition_names, output_fields)
+                if kwargs.get("_async", False):
+                    return SearchFuture(future)
+                try:
+                    res = future.result(remaining_timeout())
+                except FutureTimeoutError:
+                    raise DeadlineExceededException(0, ExceptionsMessage.DeadlineExceeded) from None
+            with span("search.result"):
+                return SearchResult(res)
 
         conn = self._get_connection()
-        res = conn.search_with_expression(self._name, data, anns_field, param, limit, expr,
-                                          partition_names, output_fields, timeout, **kwargs)
+
+        def send():
+            with span("search.rpc") as rpc_span:
+                record_vectors(rpc_span, data)
+                return conn.search_with_expression(self._name, data, anns_field, param, limit, expr,
+                                                   partition_names, output_fields, remaining_timeout(),
+                                                   **kwargs)
+
+        with self._deadline(timeout):
+            if not kwargs and self._single_flight_reads():
+                key = ("search", self._name,
+                       fingerprint(data, anns_field, param, limit, expr, partition_names, output_fields))
+                res = single_flight(self._using, key, send)
+                # every caller iterates its own view of the shared result
+                res = _QueryResultSlice(res, 0, len(res))
+            else:
+                res = send()
         if kwargs.get("_async", False):
             return SearchFuture(res)
-        return SearchResult(res)
+        with span("search.result"):
+            return SearchResult(res)
+
+    def enable_search_coalescing(self, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_delay=DEFAULT_MAX_DELAY,
+                                 max_in_flight=DEFAULT_MAX_IN_FLIGHT):
+        """
+        Batches concurrent searches on this collection object: searches sharing
+        ``anns_field``, ``param``, ``limit``, ``expr``, ``partition_names`` and
+        ``output_fields`` are sent as one search request with the vectors of all of them, and
+        every caller receives the result of its own vectors.
+
+        A batch is sent ``max_delay`` seconds after its first search, or as soon as it holds
+        ``max_batch_size`` query vectors, so a search waits at most ``max_delay`` longer.
+
+        :param max_batch_size: The number of query vectors that sends a batch right away.
+        :type  max_batch_size: int
+        :param max_delay: The longest time in seconds a search waits for others to join it.
+        :type  max_delay: float
+        :param max_in_flight: The number of batched search requests sent at a time.
+        :type  max_in_flight: int
+
+        :return SearchCoalescer:
+            The coalescer, whose ``stats()`` counts the searches and the requests sent.
+
+        :example:
+            >>> collection.enable_search_coalescing(max_batch_size=128, max_delay=0.002)
+            >>> with ThreadPoolExecutor(32) as pool:
+            ...     results = list(pool.map(lambda v: collection.search([v], "films", param, 10), vectors))
+            >>> collection.disable_search_coalescing()
+        """
+        self.disable_search_coalescing()
+        self._search_coalescer = SearchCoalescer(self, max_batch_size, max_delay, max_in_flight)
+        return self._search_coalescer
+
+    def disable_search_coalescing(self):
+        """
+        Sends the searches still waiting for a batch and stops coalescing searches.
+        """
+        coalescer, self._search_coalescer = self._search_coalescer, None
+        if coalescer is not None:
+            coalescer.close()
+
+    def enable_search_cache(self, threshold, metric_type="L2", max_entries=DEFAULT_MAX_ENTRIES, policy=LRU,
+                            ttl=None):
+        """
+        Answers query vectors close to recently searched ones from a cache: a query vector is
+        answered with the cached hits of a vector searched with the same ``anns_field``,
+        ``param``, ``limit``, ``expr``, ``partition_names`` and ``output_fields`` when the two
+        are within ``threshold``. Only the query vectors missing from the cache are searched.
+
+        Inserts and partition drops through this collection clear the cache. Cached results
+        do not see the changes of other clients, limit their age with ``ttl`` or call
+        ``clear()`` on the cache after them.
+
+        :param threshold: The largest squared L2 distance, for ``L2``, or the smallest inner
+                          product, for ``IP``, at which a cached vector answers a query.
+        :type  threshold: float
+        :param metric_type: ``L2`` or ``IP``, the metric the threshold is measured with.
+        :type  metric_type: str
+        :param max_entries: The number of query vectors cached.
+        :type  max_entries: int
+        :param policy: ``lru`` or ``lfu``, the vectors evicted once the cache is full.
+        :type  policy: str
+        :param ttl: The seconds a cached result is used for, None to keep it until evicted.
+        :type  ttl: float
+
+        :return SemanticSearchCache:
+            The cache, whose ``stats()`` reports its hit rate and the search requests saved.
+
+        :raises InvalidMetricTypeException: If the metric type is neither L2 nor IP.
+
+        :example:
+            >>> cache = collection.enable_search_cache(threshold=1e-4, max_entries=50000, ttl=60)
+            >>> res = collection.search([[1.0, 1.0]], "films", {"metric_type": "L2"}, limit=2)
+            >>> res = collection.search([[1.0, 1.001]], "films", {"metric_type": "L2"}, limit=2)
+            >>> cache.stats()["saved_rpcs"]
+            1
+        """
+        self._search_cache = SemanticSearchCache(threshold, metric_type, max_entries, policy, ttl)
+        return self._search_cache
+
+    def disable_search_cache(self):
+        """
+        Drops the search cache.
+        """
+        self._search_cache = None
 
     def query(self, expr, output_fields=None, partition_names=None, timeout=None):
         """
         Query with a set of criteria, and results in a list of records that match the query exactly.
 
-        :param expr: The query expression
-        :type  expr: str
+        :param expr: The query expression, a string or an `Expr` built with
+                     `pymilvus_orm.expression.Fields`.
+        :type  expr: str or Expr
 
         :param output_fields: A list of fields to return
         :type  output_fields: list[str]
 
-        :param partition_names: Name of partitions that contain entities
+        :param partition_names: Name of partitions that contain entities. If None, the partition
+                                rules narrow them from ``expr``, see `add_partition_rule`.
         :type  partition_names: list[str]
 
         :param timeout: An optional duration of time in seconds to allow for the RPC. When timeout
@@ -661,12 +1053,155 @@ class Collection:
             >>> print(f"- Query results: {res}")
             - Query results: [{'film_id': 0, 'film_date': 2000}, {'film_id': 1, 'film_date': 2001}]
         """
-        if not isinstance(expr, str):
-            raise DataTypeNotMatchException(0, ExceptionsMessage.ExprType % type(expr))
+        if partition_names is None and self._partition_rules:
+            with self._deadline(timeout):
+                partition_names = self._route_partitions(expr)
+            if partition_names == []:
+                return []
+        expr = render_expr(expr, self._schema)
 
         conn = self._get_connection()
-        res = conn.query(self._name, expr, output_fields, partition_names, timeout)
-        return res
+
+        def send():
+            with span("query.rpc") as rpc_span:
+                rows = conn.query(self._name, expr, output_fields, partition_names, remaining_timeout())
+                if rpc_span.recording:
+                    rpc_span.set_attribute(ATTR_ROWS, len(rows))
+                return rows
+
+        with self._deadline(timeout):
+            if self._single_flight_reads():
+                key = ("query", self._name, fingerprint(expr, output_fields, partition_names))
+                return [dict(row) for row in single_flight(self._using, key, send)]
+            return send()
+
+    def add_partition_rule(self, rule):
+        """
+        Adds a rule `search` and `query` narrow the partitions they look in with, when called
+        without ``partition_names``. The filter is matched against the rules, and only the
+        partitions that can hold matching entities are searched; a search or query that no
+        partition can match returns no hits without a request. String filters are parsed for this, and are
+        searched in all partitions if they cannot be.
+
+        Partitions that do not exist are left out. The partitions are listed once and again
+        only when a rule names a partition not seen yet, so partitions dropped by other
+        clients may still be searched.
+
+        :param rule: The rule, such as a `pymilvus_orm.routing.ValueRule` for a partition per
+                     value of a field or a `pymilvus_orm.routing.RangeRule` for a partition per
+                     range of values.
+        :type  rule: pymilvus_orm.routing.PartitionRule
+
+        :example:
+            >>> from pymilvus_orm.routing import ValueRule
+            >>> collection.add_partition_rule(ValueRule("day", "day_{}"))
+            >>> collection.search(vectors, "films", param, 10, expr="day in [20261017, 20261018]")
+        """
+        self._partition_rules.append(rule)
+
+    @property
+    def partition_rules(self):
+        """
+        Returns the partition rules added with `add_partition_rule`.
+        """
+        return list(self._partition_rules)
+
+    def clear_partition_rules(self):
+        """
+        Removes all partition rules.
+        """
+        self._partition_rules = []
+
+    def _route_partitions(self, expr):
+        if expr is None:
+            return None
+        if self._expr_fields is None or self._expr_fields.schema is not self._schema:
+            self._expr_fields = Fields(self._schema)
+        if isinstance(expr, str):
+            try:
+                expr = parse_expr(expr, self._expr_fields)
+            except InvalidExpressionException:
+                return None
+        names = route(self._partition_rules, expr)
+        if names is None:
+            return None
+        known = self._known_partitions
+        if known is None or not names <= known:
+            conn = self._get_connection()
+            known = set(single_flight(self._using, ("list_partitions", self._name),
+                                      lambda: conn.list_partitions(self._name, timeout=remaining_timeout())))
+            self._known_partitions = known
+        return sorted(names & known)
+
+    def get(self, ids, output_fields=None, partition_names=None, timeout=None, batch_size=DEFAULT_FETCH_BATCH_SIZE,
+            max_concurrency=DEFAULT_FETCH_CONCURRENCY):
+        """
+        Fetches entities by primary key.
+
+        The ids are queried with compact expressions: runs of consecutive ids become range
+        predicates and the other ids ``in`` lists, split into queries of at most ``batch_size``
+        ids sent in parallel. When the entity cache is enabled, see `enable_entity_cache`,
+        ids fetched before are served from it.
+
+        :param ids: The primary keys to fetch.
+        :type  ids: list[int] or numpy.ndarray
+        :param output_fields: The fields to return, the primary field is always returned.
+        :type  output_fields: list[str]
+        :param partition_names: The partitions to look in, None for the whole collection.
+                                The entity cache is not used with partitions.
+        :type  partition_names: list[str]
+        :param timeout: The time in seconds to allow for all the queries.
+        :type  timeout: float
+        :param batch_size: The number of ids selected by one query.
+        :type  batch_size: int
+        :param max_concurrency: The number of queries in flight at a time.
+        :type  max_concurrency: int
+
+        :return list[dict]:
+            The entities in the order of ``ids``, None for the ids not found.
+
+        :example:
+            >>> collection.get([3, 1, 2], output_fields=["film_date"])
+            [{'film_id': 3, 'film_date': 2003}, {'film_id': 1, 'film_date': 2001}, {'film_id': 2, 'film_date': 2002}]
+        """
+        pk_name = self._schema.primary_field.name
+        if output_fields is not None and pk_name not in output_fields:
+            output_fields = list(output_fields) + [pk_name]
+        fields = None if output_fields is None else tuple(sorted(output_fields))
+        ids = numpy.asarray(ids, dtype=numpy.int64).tolist()
+        cache = self._entity_cache if not partition_names else None
+
+        with self._deadline(timeout):
+            if cache is not None:
+                found, missing = cache.get_many(fields, ids)
+            else:
+                found, missing = {}, ids
+            if missing:
+                fetched = fetch_entities(lambda expr: self.query(expr, output_fields, partition_names), pk_name,
+                                         missing, batch_size, max_concurrency)
+                if cache is not None:
+                    cache.put_many(fields, fetched)
+                found.update(fetched)
+        return [None if found.get(pk) is None else dict(found[pk]) for pk in ids]
+
+    def enable_entity_cache(self, max_entries=10000):
+        """
+        Keeps the entities fetched by `get` in a least recently used cache of ``max_entries``
+        entities, keyed by primary key and output fields. Inserts and partition drops through
+        this collection clear the cache; call ``clear()`` on it after changes made by other
+        clients.
+
+        :return EntityCache:
+            The cache, whose ``stats()`` counts the ids served from it.
+        """
+        self._entity_cache = EntityCache(max_entries)
+        return self._entity_cache
+
+    def disable_entity_cache(self):
+        """
+        Drops the entity cache.
+        """
+        self._entity_cache = None
 
     @property
     def partitions(self) -> list:
@@ -690,8 +1225,8 @@ class Collection:
             >>> collection.partitions
             [{"name": "_default", "description": "", "num_entities": 0}]
         """
-        conn = self._get_connection()
-        partition_strs = conn.list_partitions(self._name)
+        with self._deadline(None):
+            partition_strs = self._metadata().partition_names
         partitions = []
         for partition in partition_strs:
             partitions.append(Partition(self, partition, construct_only=True))
@@ -724,8 +1259,9 @@ class Collection:
             >>> collection.partition("partition")
 
         """
-        if self.has_partition(partition_name) is False:
-            return None
+        with self._deadline(None):
+            if self.has_partition(partition_name) is False:
+                return None
         return Partition(self, partition_name, construct_only=True)
 
     def create_partition(self, partition_name, description=""):
@@ -757,9 +1293,10 @@ class Collection:
             >>> collection.partition("comedy")
             {"name": "partition", "description": "comedy films", "num_entities": 0}
         """
-        if self.has_partition(partition_name) is True:
-            raise PartitionAlreadyExistException(0, ExceptionsMessage.PartitionAlreadyExist)
-        return Partition(self, partition_name, description=description)
+        with self._deadline(None):
+            if self.has_partition(partition_name) is True:
+                raise PartitionAlreadyExistException(0, ExceptionsMessage.PartitionAlreadyExist)
+            return Partition(self, partition_name, description=description)
 
     def has_partition(self, partition_name, timeout=None) -> bool:
         """
@@ -793,7 +1330,9 @@ class Collection:
             False
         """
         conn = self._get_connection()
-        return conn.has_partition(self._name, partition_name, timeout=timeout)
+        with self._deadline(timeout):
+            return single_flight(self._using, ("has_partition", self._name, partition_name),
+                                 lambda: conn.has_partition(self._name, partition_name, timeout=remaining_timeout()))
 
     def drop_partition(self, partition_name, timeout=None, **kwargs):
         """
@@ -826,10 +1365,14 @@ class Collection:
             >>> collection.has_partition("comedy")
             False
         """
-        if self.has_partition(partition_name) is False:
-            raise PartitionNotExistException(0, ExceptionsMessage.PartitionNotExist)
-        conn = self._get_connection()
-        return conn.drop_partition(self._name, partition_name, timeout=timeout, **kwargs)
+        with self._deadline(timeout):
+            if self.has_partition(partition_name) is False:
+                raise PartitionNotExistException(0, ExceptionsMessage.PartitionNotExist)
+            conn = self._get_connection()
+            res = conn.drop_partition(self._name, partition_name, timeout=remaining_timeout(), **kwargs)
+        self._invalidate_metadata()
+        self._invalidate_results()
+        return res
 
     @property
     def indexes(self) -> list:
@@ -852,9 +1395,9 @@ class Collection:
             >>> collection.indexes
             []
         """
-        conn = self._get_connection()
         indexes = []
-        tmp_index = conn.describe_index(self._name)
+        with self._deadline(None):
+            tmp_index = copy.deepcopy(self._metadata().index)
         if tmp_index is not None:
             field_name = tmp_index.pop("field_name", None)
             indexes.append(Index(self, field_name, tmp_index, construct_only=True))
@@ -886,8 +1429,8 @@ class Collection:
             >>> collection.index()
             <pymilvus_orm.index.Index object at 0x7f44355a1460>
         """
-        conn = self._get_connection()
-        tmp_index = conn.describe_index(self._name)
+        with self._deadline(None):
+            tmp_index = copy.deepcopy(self._metadata().index)
         if tmp_index is not None:
             field_name = tmp_index.pop("field_name", None)
             return Index(self, field_name, tmp_index, construct_only=True)
@@ -907,6 +1450,11 @@ class Collection:
                         is set to None, client waits until server response or error occur
         :type  timeout: float
 
+        :param kwargs:
+            * *_async* (``bool``) --
+              Indicate if invoke asynchronously. When value is true, the build is started
+              without waiting and an IndexBuildFuture is returned.
+
         :raises CollectionNotExistException: If the collection does not exist.
         :raises ParamError: If the index parameters are invalid.
         :raises BaseException: If field does not exist.
@@ -926,9 +1474,15 @@ class Collection:
             >>> collection.index()
             <pymilvus_orm.index.Index object at 0x7f44355a1460>
         """
+        if kwargs.pop("_async", False):
+            future = IndexBuildFuture(self, field_name, index_params)
+            future.start()
+            return future
         conn = self._get_connection()
-        return conn.create_index(self._name, field_name, index_params,
-                                 timeout=timeout, **kwargs)
+        with self._deadline(timeout):
+            res = conn.create_index(self._name, field_name, index_params, timeout=remaining_timeout(), **kwargs)
+        self._invalidate_metadata()
+        return res
 
     def has_index(self, timeout=None) -> bool:
         """
@@ -958,8 +1512,9 @@ class Collection:
         """
         conn = self._get_connection()
         # TODO(yukun): Need field name, but provide index name
-        if conn.describe_index(self._name, "", timeout=timeout) is None:
-            return False
+        with self._deadline(timeout):
+            if self._describe_index(conn) is None:
+                return False
         return True
 
     def drop_index(self, timeout=None, **kwargs):
@@ -991,10 +1546,11 @@ class Collection:
             >>> collection.has_index()
             False
         """
-        if self.has_index() is False:
-            raise IndexNotExistException(0, ExceptionsMessage.IndexNotExist)
-        conn = self._get_connection()
-        tmp_index = conn.describe_index(self._name, "")
-        if tmp_index is not None:
-            index = Index(self, tmp_index['field_name'], tmp_index, construct_only=True)
-            index.drop(timeout=timeout, **kwargs)
+        with self._deadline(timeout):
+            if self.has_index() is False:
+                raise IndexNotExistException(0, ExceptionsMessage.IndexNotExist)
+            conn = self._get_connection()
+            tmp_index = self._describe_index(conn)
+            if tmp_index is not None:
+                index = Index(self, tmp_index['field_name'], tmp_index, construct_only=True)
+                index.drop(**kwargs)
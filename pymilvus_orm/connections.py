@@ -31,6 +31,13 @@ def synchronized(func):
     return lock_func
 
 
+def _check_default_timeout(timeout):
+    if timeout is None:
+        return
+    if isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or timeout <= 0:
+        raise ConnectionConfigException(0, ExceptionsMessage.TimeoutType)
+
+
 class SingleInstanceMetaClass(type):
     instance = None
 
@@ -87,6 +94,7 @@ class Connections(metaclass=SingleInstanceMetaClass):
                 raise ConnectionConfigException(0, ExceptionsMessage.HostType)
             if not isinstance(kwargs.get(k)["port"], (str, int)):
                 raise ConnectionConfigException(0, ExceptionsMessage.PortType)
+            _check_default_timeout(kwargs.get(k).get("default_timeout", None))
 
             self._kwargs[k] = kwargs.get(k, None)
 
@@ -123,6 +131,14 @@ class Connections(metaclass=SingleInstanceMetaClass):
         :param alias: The name of milvus connection
         :type  alias: str
 
+        :param kwargs:
+            * *default_timeout* (``float``) --
+              The timeout in seconds applied to every ORM call made through this connection
+              when the caller passes no timeout. None (default) waits forever.
+            * *single_flight_reads* (``bool``) --
+              Whether concurrent identical searches and queries made through this connection
+              share one in-flight RPC, as metadata calls always do. False by default.
+
         :return Milvus:
             A milvus connection created by the passed parameters.
 
@@ -138,9 +154,12 @@ class Connections(metaclass=SingleInstanceMetaClass):
         """
         if not isinstance(alias, str):
             raise ConnectionConfigException(0, ExceptionsMessage.AliasType % type(alias))
+        _check_default_timeout(kwargs.get("default_timeout", None))
 
         def connect_milvus(**kwargs):
             tmp_kwargs = copy.deepcopy(kwargs)
+            tmp_kwargs.pop("default_timeout", None)
+            tmp_kwargs.pop("single_flight_reads", None)
             tmp_host = tmp_kwargs.pop("host", None)
             tmp_port = tmp_kwargs.pop("port", None)
             handler = tmp_kwargs.pop("handler", DefaultConfig.DEFAULT_HANDLER)
@@ -234,6 +253,44 @@ class Connections(metaclass=SingleInstanceMetaClass):
 
         return self._kwargs.get(alias, {})
 
+    def get_default_timeout(self, alias=DefaultConfig.DEFAULT_USING):
+        """
+        Retrieves the default timeout configured for the connection by alias.
+
+        :param alias: The name of milvus connection
+        :type  alias: str
+
+        :return float:
+            The default timeout in seconds, or None if not configured.
+
+        :example:
+            >>> from pymilvus_orm import connections
+            >>> connections.connect("test", host="localhost", port="19530", default_timeout=5)
+            <pymilvus.client.stub.Milvus object at 0x7f4045335f10>
+            >>> connections.get_default_timeout("test")
+            5
+        """
+        if not isinstance(alias, str):
+            raise ConnectionConfigException(0, ExceptionsMessage.AliasType % type(alias))
+
+        return self._kwargs.get(alias, {}).get("default_timeout", None)
+
+    def get_single_flight_reads(self, alias=DefaultConfig.DEFAULT_USING):
+        """
+        Retrieves whether identical concurrent searches and queries made through the connection
+        by alias share one in-flight RPC.
+
+        :param alias: The name of milvus connection
+        :type  alias: str
+
+        :return bool:
+            The ``single_flight_reads`` option of the connection, False if not configured.
+        """
+        if not isinstance(alias, str):
+            raise ConnectionConfigException(0, ExceptionsMessage.AliasType % type(alias))
+
+        return bool(self._kwargs.get(alias, {}).get("single_flight_reads", False))
+
 
 # Singleton Mode in Python
 
@@ -244,4 +301,6 @@ get_connection_addr = connections.get_connection_addr
 remove_connection = connections.remove_connection
 connect = connections.connect
 get_connection = connections.get_connection
+get_default_timeout = connections.get_default_timeout
+get_single_flight_reads = connections.get_single_flight_reads
 disconnect = connections.disconnect
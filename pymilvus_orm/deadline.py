@@ -0,0 +1,90 @@
+# Copyright (C) 2019-2021 Zilliz. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+
+import contextlib
+import threading
+import time
+
+from .exceptions import DeadlineExceededException, ExceptionsMessage
+
+_local = threading.local()
+
+
+def current_deadline():
+    """
+    Returns the absolute deadline of the calling thread, in ``time.monotonic()`` seconds.
+
+    :return float:
+        The deadline, or None if no deadline is active.
+    """
+    return getattr(_local, "deadline", None)
+
+
+@contextlib.contextmanager
+def deadline_at(expire):
+    """
+    Activates an absolute deadline for the calling thread. A deadline never extends an
+    enclosing one, the earlier of the two always wins.
+
+    :param expire: The absolute deadline in ``time.monotonic()`` seconds, None to inherit.
+    :type  expire: float
+    """
+    previous = current_deadline()
+    if expire is not None and previous is not None and previous < expire:
+        expire = previous
+    if expire is not None:
+        _local.deadline = expire
+    try:
+        yield
+    finally:
+        _local.deadline = previous
+
+
+def deadline(timeout):
+    """
+    Limits all RPCs issued inside the block to a total budget of ``timeout`` seconds.
+
+    Every ORM call made inside the block passes the remaining budget to each of its RPCs,
+    so a call issuing several RPCs cannot overrun the budget. Nested blocks can only
+    shorten the budget.
+
+    :param timeout: The budget in seconds. None inherits the enclosing budget, if any.
+    :type  timeout: float
+
+    :example:
+        >>> from pymilvus_orm import connections, Collection, deadline
+        >>> connections.connect()
+        >>> collection = Collection("test_collection_deadline")
+        >>> with deadline(0.05):
+        ...     res = collection.search([[1.0, 1.0]], "films", {"metric_type": "L2"}, limit=2)
+    """
+    if timeout is None:
+        return deadline_at(None)
+    return deadline_at(time.monotonic() + timeout)
+
+
+def remaining_timeout():
+    """
+    Returns the remaining budget of the active deadline, to be passed as an RPC timeout.
+
+    :return float:
+        Remaining seconds, or None if no deadline is active.
+
+    :raises DeadlineExceededException: If the deadline has already expired.
+    """
+    expire = current_deadline()
+    if expire is None:
+        return None
+    left = expire - time.monotonic()
+    if left <= 0:
+        raise DeadlineExceededException(0, ExceptionsMessage.DeadlineExceeded)
+    return left
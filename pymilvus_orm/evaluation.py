@@ -0,0 +1,304 @@
+# Copyright (C) 2019-2021 Zilliz. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+
+"""
+Recall and throughput evaluation of collections with SIFT/GIST style datasets.
+
+A dataset is a base set, a query set and the ids of the true nearest neighbors of every
+query, as distributed in fvecs/bvecs and ivecs files. The ids are row numbers of the base
+set, so base vectors are inserted with their row number as primary key.
+"""
+
+import itertools
+import os
+import time
+
+import numpy
+
+from .exceptions import InvalidMetricTypeException, ExceptionsMessage
+from .loader import open_vecs, insert_batches, DEFAULT_BATCH_SIZE, DEFAULT_MAX_PENDING
+
+PERCENTILES = (50, 95, 99)
+
+
+class Dataset:
+    """
+    A base set, a query set and the ground truth of a nearest neighbor benchmark.
+
+    :param base: The base vectors, of shape (rows, dim).
+    :type  base: numpy.ndarray
+    :param queries: The query vectors, of shape (nq, dim).
+    :type  queries: numpy.ndarray
+    :param groundtruth: The base row numbers of the nearest neighbors of every query, nearest
+                        first, of shape (nq, k).
+    :type  groundtruth: numpy.ndarray
+    """
+
+    def __init__(self, base, queries, groundtruth=None):
+        self.base = base
+        self.queries = queries
+        self.groundtruth = groundtruth
+
+    @classmethod
+    def from_files(cls, base, queries, groundtruth=None):
+        """
+        Memory-maps a dataset from fvecs/bvecs base and query files and an ivecs ground truth.
+        """
+        return cls(open_vecs(base), open_vecs(queries), None if groundtruth is None else open_vecs(groundtruth))
+
+    @classmethod
+    def from_directory(cls, directory, name):
+        """
+        Memory-maps a dataset laid out as the TEXMEX corpus, ``<name>_base.fvecs``,
+        ``<name>_query.fvecs`` and ``<name>_groundtruth.ivecs``, bvecs also accepted.
+
+        :example:
+            >>> from pymilvus_orm.evaluation import Dataset
+            >>> sift = Dataset.from_directory("sift", "sift")
+            >>> sift.base.shape
+            (1000000, 128)
+        """
+        def find(kind, extensions):
+            for ext in extensions:
+                path = os.path.join(directory, f"{name}_{kind}{ext}")
+                if os.path.exists(path):
+                    return path
+            raise FileNotFoundError(os.path.join(directory, f"{name}_{kind}{extensions[0]}"))
+
+        return cls.from_files(find("base", (".fvecs", ".bvecs")), find("query", (".fvecs", ".bvecs")),
+                              find("groundtruth", (".ivecs",)))
+
+    @property
+    def dim(self):
+        return self.base.shape[1]
+
+    def __repr__(self):
+        return f"Dataset(base={self.base.shape}, queries={self.queries.shape}, " \
+               f"groundtruth={None if self.groundtruth is None else self.groundtruth.shape})"
+
+
+class Evaluation:
+    """
+    The recall, throughput and latency of one search parameter set at one nq and topk, and
+    the index params they were measured with, if known.
+    """
+    __slots__ = ("param", "nq", "topk", "recall", "qps", "latencies", "index")
+
+    def __init__(self, param, nq, topk, recall, qps, latencies, index=None):
+        self.index = index
+        self.param = param
+        self.nq = nq
+        self.topk = topk
+        self.recall = recall
+        self.qps = qps
+        self.latencies = latencies
+
+    def latency(self, percentile):
+        """
+        Returns a percentile of the latencies of the search requests, in seconds.
+        """
+        return float(numpy.percentile(self.latencies, percentile))
+
+    def to_dict(self):
+        row = {"index": self.index, "param": self.param, "nq": self.nq, "topk": self.topk, "recall": self.recall, "qps": self.qps}
+        for p in PERCENTILES:
+            row[f"p{p}"] = self.latency(p)
+        return row
+
+    def __repr__(self):
+        latencies = ", ".join(f"p{p}={self.latency(p) * 1000:.2f}ms" for p in PERCENTILES)
+        recall = "None" if self.recall is None else f"{self.recall:.4f}"
+        index = "" if self.index is None else f"index={self.index}, "
+        return f"Evaluation({index}param={self.param}, nq={self.nq}, topk={self.topk}, " \
+               f"recall={recall}, qps={self.qps:.1f}, {latencies})"
+
+
+def param_grid(metric_type, **params):
+    """
+    Expands lists of search parameter values into every combination of search params.
+
+    :param metric_type: The metric type of the searches.
+    :type  metric_type: str
+
+    :return list[dict]:
+        The search params, as passed to `Collection.search`.
+
+    :example:
+        >>> from pymilvus_orm.evaluation import param_grid
+        >>> param_grid("L2", nprobe=[8, 32])
+        [{'metric_type': 'L2', 'params': {'nprobe': 8}}, {'metric_type': 'L2', 'params': {'nprobe': 32}}]
+    """
+    names = list(params)
+    return [{"metric_type": metric_type, "params": dict(zip(names, values))}
+            for values in itertools.product(*(params[name] for name in names))]
+
+
+def recall_at_k(ids, groundtruth, k):
+    """
+    Returns the mean fraction of the k true nearest neighbors found in the first k results.
+
+    :param ids: The result ids of every query, padded with -1, of shape (nq, >= k).
+    :type  ids: numpy.ndarray
+    :param groundtruth: The true nearest neighbors of every query, of shape (nq, >= k).
+    :type  groundtruth: numpy.ndarray
+    :param k: The number of neighbors compared, at most the number of true neighbors given.
+    :type  k: int
+
+    :return float:
+        The recall, between 0 and 1.
+    """
+    truth = numpy.asarray(groundtruth)
+    k = min(k, truth.shape[1])
+    ids = numpy.asarray(ids)[:, :k]
+    truth = truth[:len(ids), :k]
+    found = (ids[:, :, None] == truth[:, None, :]).any(axis=2).sum(axis=1)
+    return float(found.mean() / k) if len(found) else 0.0
+
+
+def brute_force_groundtruth(base, queries, k, metric_type="L2", block_size=65536):
+    """
+    Computes the exact k nearest neighbors of every query with NumPy, reading the base set
+    in blocks of ``block_size`` rows so it can be memory-mapped.
+
+    :param base: The base vectors, of shape (rows, dim).
+    :type  base: numpy.ndarray
+    :param queries: The query vectors, of shape (nq, dim).
+    :type  queries: numpy.ndarray
+    :param k: The number of neighbors.
+    :type  k: int
+    :param metric_type: "L2" or "IP".
+    :type  metric_type: str
+
+    :return numpy.ndarray:
+        The base row numbers of the neighbors of every query, nearest first, of shape (nq, k).
+
+    :raises InvalidMetricTypeException: If the metric type is neither L2 nor IP.
+    """
+    if metric_type not in ("L2", "IP"):
+        raise InvalidMetricTypeException(0, ExceptionsMessage.MetricTypeNotSupport % metric_type)
+    queries = numpy.asarray(queries, dtype=numpy.float32)
+    scores = numpy.empty((len(queries), 0), dtype=numpy.float32)
+    ids = numpy.empty((len(queries), 0), dtype=numpy.int64)
+    for start in range(0, len(base), block_size):
+        block = numpy.asarray(base[start:start + block_size], dtype=numpy.float32)
+        products = queries @ block.T
+        # smaller is nearer, the norm of the query does not change the order
+        block_scores = (block * block).sum(axis=1) - 2 * products if metric_type == "L2" else -products
+        block_ids = numpy.broadcast_to(numpy.arange(start, start + len(block)), block_scores.shape)
+        scores = numpy.concatenate([scores, block_scores], axis=1)
+        ids = numpy.concatenate([ids, block_ids], axis=1)
+        if scores.shape[1] > k:
+            nearest = numpy.argpartition(scores, k - 1, axis=1)[:, :k]
+            scores = numpy.take_along_axis(scores, nearest, axis=1)
+            ids = numpy.take_along_axis(ids, nearest, axis=1)
+    order = numpy.argsort(scores, axis=1, kind="stable")
+    return numpy.take_along_axis(ids, order, axis=1)
+
+
+def result_ids(results, topk):
+    """
+    Collects the ids of search results into a (nq, topk) array padded with -1.
+    """
+    ids = numpy.full((len(results), topk), -1, dtype=numpy.int64)
+    for i, hits in enumerate(results):
+        row = hits.ids[:topk]
+        ids[i, :len(row)] = row
+    return ids
+
+
+def insert_base(collection, base, batch_size=DEFAULT_BATCH_SIZE, max_pending=DEFAULT_MAX_PENDING, **kwargs):
+    """
+    Inserts base vectors with their row number as primary key, the first field of the
+    collection, so that search results compare with the ground truth ids.
+
+    :param collection: A collection with an INT64 primary field and a vector field.
+    :type  collection: class `collection.Collection`
+    :param base: The base vectors, of shape (rows, dim).
+    :type  base: numpy.ndarray
+
+    :return MutationResult:
+        The merged result of all insert requests.
+    """
+    def batches():
+        for start in range(0, len(base), batch_size):
+            chunk = base[start:start + batch_size]
+            yield [list(range(start, start + len(chunk))), numpy.asarray(chunk, dtype=numpy.float32)]
+
+    return insert_batches(collection, batches(), max_pending=max_pending, **kwargs)
+
+
+def evaluate(collection, anns_field, queries, groundtruth, params, nq=(1,), topk=(10,), max_queries=None,
+             **kwargs):
+    """
+    Runs the query set through `Collection.search` for every search param, nq and topk and
+    measures recall@topk, throughput and request latencies.
+
+    Queries are sent in requests of ``nq`` vectors, one request at a time, so that latencies
+    are comparable between runs.
+
+    :param collection: The collection, loaded, holding the base set.
+    :type  collection: class `collection.Collection`
+    :param anns_field: The vector field searched.
+    :type  anns_field: str
+    :param queries: The query vectors, of shape (nq, dim).
+    :type  queries: numpy.ndarray
+    :param groundtruth: The true nearest neighbors of every query, None to skip recall.
+    :type  groundtruth: numpy.ndarray
+    :param params: The search params to evaluate, see `param_grid`.
+    :type  params: list[dict]
+    :param nq: The numbers of queries per request to evaluate.
+    :type  nq: list[int]
+    :param topk: The numbers of results per query to evaluate.
+    :type  topk: list[int]
+    :param max_queries: Only use the first queries of the query set.
+    :type  max_queries: int
+
+    :return list[Evaluation]:
+        One evaluation per search param, nq and topk.
+
+    :example:
+        >>> from pymilvus_orm.evaluation import Dataset, evaluate, insert_base, param_grid
+        >>> sift = Dataset.from_directory("sift", "sift")
+        >>> insert_base(collection, sift.base)
+        >>> collection.load()
+        >>> for row in evaluate(collection, "vec", sift.queries, sift.groundtruth,
+        ...                     param_grid("L2", nprobe=[8, 32]), nq=[1, 100], topk=[10]):
+        ...     print(row)
+    """
+    if max_queries is not None:
+        queries = queries[:max_queries]
+        groundtruth = None if groundtruth is None else groundtruth[:max_queries]
+    queries = numpy.asarray(queries, dtype=numpy.float32)
+    evaluations = []
+    for batch_nq in nq:
+        requests = [queries[start:start + batch_nq].tolist() for start in range(0, len(queries), batch_nq)]
+        for param in params:
+            for k in topk:
+                evaluations.append(_evaluate_one(collection, anns_field, requests, groundtruth, param,
+                                                 batch_nq, k, **kwargs))
+    return evaluations
+
+
+def _evaluate_one(collection, anns_field, requests, groundtruth, param, nq, topk, **kwargs):
+    latencies = []
+    ids = []
+    start = time.perf_counter()
+    for data in requests:
+        t = time.perf_counter()
+        results = collection.search(data, anns_field, param, topk, **kwargs)
+        latencies.append(time.perf_counter() - t)
+        ids.append(result_ids(results, topk))
+    elapsed = time.perf_counter() - start
+    ids = numpy.concatenate(ids) if ids else numpy.empty((0, topk), dtype=numpy.int64)
+    recall = None if groundtruth is None else recall_at_k(ids, groundtruth, topk)
+    qps = len(ids) / elapsed if elapsed > 0 else float("inf")
+    return Evaluation(param, nq, topk, recall, qps, numpy.asarray(latencies))
@@ -126,6 +126,10 @@ class IndexNotExistException(MilvusException):
     pass
 
 
+class IndexBuildFailedException(MilvusException):
+    pass
+
+
 class CannotInferSchemaException(MilvusException):
     pass
 
@@ -170,6 +174,14 @@ class AutoIDException(MilvusException):
     pass
 
 
+class DeadlineExceededException(MilvusException):
+    pass
+
+
+class InvalidExpressionException(MilvusException):
+    pass
+
+
 class ExceptionsMessage:
     NoHostPort = "connection configuration must contain 'host' and 'port'."
     HostType = "Type of 'host' must be str."
@@ -198,14 +210,40 @@ class ExceptionsMessage:
     DataTypeInconsistent = "The data in the same column must be of the same type."
     DataTypeNotSupport = "Data type is not support."
     DataLengthsInconsistent = "Arrays must all be same length."
+    VectorDimInconsistent = "The vectors in the same column must have the same dimension."
+    VectorDimNotMatch = "The vectors of field %r have dimension %d, the schema expects %d."
     DataFrameInvalid = "Cannot infer schema from empty dataframe."
     NdArrayNotSupport = "Data type not support numpy.ndarray."
+    FileTypeNotSupport = "File %r is not a Parquet, npy, npz, fvecs, ivecs or bvecs file."
+    FileFieldMissing = "Field %r is not found in file %r."
+    FileFieldInconsistent = "The data of field %r in file %r does not match the type or dimension of the field."
+    FileFieldsAmbiguous = "File %r holds a single array, map the fields of the collection to files with a dict."
+    FileCorrupted = "File %r is truncated or corrupted."
+    MetricTypeNotSupport = "Metric type %r is not supported, only L2 and IP are."
+    CachePolicyNotSupport = "Cache policy %r is not supported, only lru and lfu are."
+    GroundTruthRequired = "Either the ground truth or the base vectors must be given."
+    ArrowNullValues = "Arrow columns inserted into non auto_id fields must not contain null values."
     TypeOfDataAndSchemaInconsistent = "The types of schema and data do not match."
     PartitionAlreadyExist = "Partition already exist."
     PartitionNotExist = "Partition not exist."
+    RetentionPeriod = "The period of a retention manager must be a positive datetime.timedelta."
+    RetentionWindow = "The load window must be at least 1, create_ahead at least 0 and retain at least the load window."
+    RetentionAction = "Expire action %r is not supported, only drop and release are."
+    PartitionByWithName = "Pass either partition_name or partition_by, not both."
+    PartitionByNotExist = "Field %r to route rows to partitions by is not in the inserted data."
     IndexNotExist = "Index doesn't exist."
+    IndexBuildFailed = "Index building of collection %r failed: %s"
     CollectionType = "The type of collection must be pymilvus_orm.Collection."
     FieldsType = "The fields of schema must be type list."
     FieldType = "The field of schema type must be FieldSchema."
     FieldDtype = "Field dtype must be of DataType"
-    ExprType = "The type of expr must be string ,but %r is given."
+    ExprType = "The type of expr must be string or Expr, but %r is given."
+    ExprFieldNotExist = "Field %r is not in the schema."
+    ExprVectorField = "Vector field %r cannot be used in expressions."
+    ExprValueType = "Value %r does not match the type of field %r."
+    ExprOperator = "Operator %r is not supported on field %r."
+    ExprOperand = "Cannot combine %r with an expression, wrap comparisons in parentheses: (F.a > 1) & (F.b < 2)."
+    ExprParse = "Cannot parse expression %r."
+    ExprTruth = "Expressions have no truth value, combine them with &, | and ~ instead of and, or and not."
+    DeadlineExceeded = "Deadline exceeded before the request could be sent."
+    TimeoutType = "Param default_timeout must be a positive number or None."
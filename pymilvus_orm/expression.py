@@ -0,0 +1,623 @@
+# Copyright (C) 2019-2021 Zilliz. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+
+"""
+Typed filter expressions for `Collection.search` and `Collection.query`.
+
+Expressions are built from the fields of a schema and checked against it as they are built,
+so a wrong field name or value type fails locally instead of after a round trip to the
+server. An expression renders to the Milvus expression syntax once and keeps the string.
+
+:example:
+    >>> from pymilvus_orm.expression import Fields
+    >>> F = Fields(collection.schema)
+    >>> expr = (F.film_id > 10) & F.film_date.isin([2000, 2001])
+    >>> str(expr)
+    'film_id > 10 && film_date in [2000, 2001]'
+    >>> collection.query(expr, output_fields=["film_date"])
+"""
+
+import ast
+import json
+import numbers
+import operator
+import re
+import sys
+
+import numpy
+
+from .types import DataType
+from .exceptions import InvalidExpressionException, DataTypeNotMatchException, ExceptionsMessage
+
+_INT_TYPES = {DataType.INT8: numpy.int8, DataType.INT16: numpy.int16, DataType.INT32: numpy.int32,
+              DataType.INT64: numpy.int64}
+_FLOAT_TYPES = {DataType.FLOAT, DataType.DOUBLE}
+_NUMERIC_TYPES = set(_INT_TYPES) | _FLOAT_TYPES
+_VECTOR_TYPES = {DataType.FLOAT_VECTOR, DataType.BINARY_VECTOR}
+_EQUALITY = {"==", "!="}
+
+
+def _check_scalar(field, value):
+    dtype = field.dtype
+    if dtype in _INT_TYPES:
+        ok = isinstance(value, numbers.Integral) and not isinstance(value, (bool, numpy.bool_))
+        if ok:
+            info = numpy.iinfo(_INT_TYPES[dtype])
+            ok = info.min <= value <= info.max
+    elif dtype in _FLOAT_TYPES:
+        ok = isinstance(value, numbers.Real) and not isinstance(value, (bool, numpy.bool_))
+    elif dtype == DataType.BOOL:
+        ok = isinstance(value, (bool, numpy.bool_))
+    else:
+        ok = isinstance(value, str)
+    if not ok:
+        raise InvalidExpressionException(0, ExceptionsMessage.ExprValueType % (value, field.name))
+
+
+def _render_scalar(field, value):
+    dtype = field.dtype
+    if dtype in _INT_TYPES:
+        return str(int(value))
+    if dtype in _FLOAT_TYPES:
+        return repr(float(value))
+    if dtype == DataType.BOOL:
+        return "true" if value else "false"
+    return json.dumps(value)
+
+
+def _as_array(field, values):
+    """
+    Returns ``values`` as an array of the type of ``field``, checked with array operations
+    rather than value by value.
+    """
+    dtype = field.dtype
+    array = numpy.asarray(values)
+    if array.ndim != 1:
+        array = array.reshape(-1)
+    if len(array) == 0:
+        return array
+    kind = array.dtype.kind
+    if dtype in _INT_TYPES:
+        ok = kind in "iu"
+        if ok:
+            info = numpy.iinfo(_INT_TYPES[dtype])
+            ok = info.min <= array.min() and array.max() <= info.max
+    elif dtype in _FLOAT_TYPES:
+        ok = kind in "iuf"
+    elif dtype == DataType.BOOL:
+        ok = kind == "b"
+    else:
+        ok = kind == "U"
+    if not ok:
+        raise InvalidExpressionException(0, ExceptionsMessage.ExprValueType % (array[:5].tolist(), field.name))
+    return array
+
+
+def format_values(field, values):
+    """
+    Renders a list of values of ``field``, such as the right side of ``in``. The values are
+    checked and converted to Python values with one array operation each, then joined, which
+    is several times faster than casting the array to strings with NumPy.
+
+    :example:
+        >>> format_values(FieldSchema("id", DataType.INT64), numpy.arange(3))
+        '[0, 1, 2]'
+    """
+    array = _as_array(field, values)
+    dtype = field.dtype
+    if dtype in _INT_TYPES:
+        items = map(str, array.astype(numpy.int64).tolist())
+    elif dtype in _FLOAT_TYPES:
+        items = map(repr, array.astype(numpy.float64).tolist())
+    elif dtype == DataType.BOOL:
+        items = ("true" if value else "false" for value in array.tolist())
+    else:
+        items = map(json.dumps, array.tolist())
+    return "[" + ", ".join(items) + "]"
+
+
+class Constraint:
+    """
+    The values of one field an expression can match: a finite set of ``values``, or the
+    interval from ``low`` to ``high``, either end None when unbounded.
+    """
+    __slots__ = ("values", "low", "high", "low_inclusive", "high_inclusive")
+
+    def __init__(self, values=None, low=None, high=None, low_inclusive=True, high_inclusive=True):
+        self.values = None if values is None else frozenset(values)
+        self.low = low
+        self.high = high
+        self.low_inclusive = low_inclusive
+        self.high_inclusive = high_inclusive
+
+    def allows(self, value):
+        """
+        Returns whether ``value`` is within the constraint.
+        """
+        if self.values is not None:
+            return value in self.values
+        if self.low is not None and (value < self.low or (value == self.low and not self.low_inclusive)):
+            return False
+        return self.high is None or value < self.high or (value == self.high and self.high_inclusive)
+
+    def overlaps(self, low, high):
+        """
+        Returns whether the constraint may allow a value of the half-open range from ``low``
+        to ``high``, either None when unbounded.
+        """
+        if self.values is not None:
+            return any((low is None or value >= low) and (high is None or value < high) for value in self.values)
+        if high is not None and self.low is not None and self.low >= high:
+            return False
+        if low is not None and self.high is not None:
+            return self.high > low or (self.high == low and self.high_inclusive)
+        return True
+
+    def intersect(self, other):
+        if self.values is not None:
+            return Constraint(value for value in self.values if other.allows(value))
+        if other.values is not None:
+            return other.intersect(self)
+        low, low_inclusive = self.low, self.low_inclusive
+        if other.low is not None and (low is None or other.low > low or (other.low == low and not other.low_inclusive)):
+            low, low_inclusive = other.low, other.low_inclusive
+        high, high_inclusive = self.high, self.high_inclusive
+        if other.high is not None and (high is None or other.high < high or
+                                       (other.high == high and not other.high_inclusive)):
+            high, high_inclusive = other.high, other.high_inclusive
+        return Constraint(low=low, high=high, low_inclusive=low_inclusive, high_inclusive=high_inclusive)
+
+    def union(self, other):
+        if self.values is not None and other.values is not None:
+            return Constraint(self.values | other.values)
+        left, right = self._interval(), other._interval()
+        if left is None:
+            return right
+        if right is None:
+            return left
+        low = None if left.low is None or right.low is None else min(left.low, right.low)
+        high = None if left.high is None or right.high is None else max(left.high, right.high)
+        return Constraint(low=low, high=high)
+
+    def _interval(self):
+        if self.values is None:
+            return self
+        if not self.values:
+            return None
+        return Constraint(low=min(self.values), high=max(self.values))
+
+    def __repr__(self):
+        if self.values is not None:
+            return f"<Constraint: {sorted(self.values)}>"
+        return f"<Constraint: {self.low}..{self.high}>"
+
+
+class Expr:
+    """
+    A boolean filter expression. Combine expressions with ``&``, ``|`` and ``~``; wrap
+    comparisons in parentheses since ``&`` and ``|`` bind tighter than comparisons.
+    """
+    __slots__ = ("_rendered",)
+
+    def __init__(self):
+        self._rendered = None
+
+    def __and__(self, other):
+        return _BoolOp("&&", self, _check_expr(other))
+
+    def __or__(self, other):
+        return _BoolOp("||", self, _check_expr(other))
+
+    def __invert__(self):
+        return _Not(self)
+
+    def __rand__(self, other):
+        raise InvalidExpressionException(0, ExceptionsMessage.ExprOperand % other)
+
+    __ror__ = __rand__
+
+    def __bool__(self):
+        raise InvalidExpressionException(0, ExceptionsMessage.ExprTruth)
+
+    def render(self):
+        """
+        Returns the expression in the Milvus expression syntax, rendered on the first call.
+        """
+        if self._rendered is None:
+            self._rendered = self._render()
+        return self._rendered
+
+    def fields(self):
+        """
+        Returns the fields the expression refers to.
+        """
+        raise NotImplementedError
+
+    def constraint(self, name):
+        """
+        Returns the `Constraint` on the values of field ``name`` an entity must meet to
+        match, None if the expression does not constrain it. The constraint may allow more
+        values than the expression, never fewer.
+        """
+        return None
+
+    def validate(self, schema):
+        """
+        Checks that the fields of the expression are in ``schema`` with the same types.
+
+        :raises InvalidExpressionException: If a field is not in the schema.
+        """
+        types = {field.name: field.dtype for field in schema.fields}
+        for field in self.fields():
+            if types.get(field.name) != field.dtype:
+                raise InvalidExpressionException(0, ExceptionsMessage.ExprFieldNotExist % field.name)
+
+    def _render(self):
+        raise NotImplementedError
+
+    def __str__(self):
+        return self.render()
+
+    def __repr__(self):
+        return f"<{type(self).__name__}: {self.render()}>"
+
+
+def _check_expr(other):
+    if not isinstance(other, Expr):
+        raise InvalidExpressionException(0, ExceptionsMessage.ExprOperand % other)
+    return other
+
+
+class _Compare(Expr):
+    __slots__ = ("_field", "_op", "_value")
+
+    def __init__(self, field, op, value):
+        super().__init__()
+        if field.dtype in (DataType.BOOL, DataType.STRING) and op not in _EQUALITY:
+            raise InvalidExpressionException(0, ExceptionsMessage.ExprOperator % (op, field.name))
+        if isinstance(value, FieldRef):
+            other = value.schema
+            if not (field.dtype == other.dtype or {field.dtype, other.dtype} <= _NUMERIC_TYPES):
+                raise InvalidExpressionException(0, ExceptionsMessage.ExprValueType % (other.name, field.name))
+        else:
+            _check_scalar(field, value)
+        self._field = field
+        self._op = op
+        self._value = value
+
+    def fields(self):
+        if isinstance(self._value, FieldRef):
+            return [self._field, self._value.schema]
+        return [self._field]
+
+    def constraint(self, name):
+        if self._field.name != name or isinstance(self._value, FieldRef) or self._op == "!=":
+            return None
+        if self._op == "==":
+            return Constraint([self._value])
+        if self._op in ("<", "<="):
+            return Constraint(high=self._value, high_inclusive=self._op == "<=")
+        return Constraint(low=self._value, low_inclusive=self._op == ">=")
+
+    def _render(self):
+        if isinstance(self._value, FieldRef):
+            return f"{self._field.name} {self._op} {self._value.schema.name}"
+        return f"{self._field.name} {self._op} {_render_scalar(self._field, self._value)}"
+
+
+class _In(Expr):
+    __slots__ = ("_field", "_values", "_negate")
+
+    def __init__(self, field, values, negate=False):
+        super().__init__()
+        self._field = field
+        self._values = _as_array(field, values)
+        self._negate = negate
+
+    def fields(self):
+        return [self._field]
+
+    def constraint(self, name):
+        if self._field.name != name or self._negate:
+            return None
+        return Constraint(self._values.tolist())
+
+    def _render(self):
+        op = "not in" if self._negate else "in"
+        return f"{self._field.name} {op} {format_values(self._field, self._values)}"
+
+
+class _BoolOp(Expr):
+    __slots__ = ("_op", "_operands")
+
+    def __init__(self, op, *operands):
+        super().__init__()
+        flat = []
+        for operand in operands:
+            if isinstance(operand, _BoolOp) and operand._op == op:
+                flat.extend(operand._operands)
+            else:
+                flat.append(operand)
+        self._op = op
+        self._operands = tuple(flat)
+
+    def fields(self):
+        return [field for operand in self._operands for field in operand.fields()]
+
+    def constraint(self, name):
+        result = None
+        for operand in self._operands:
+            constraint = operand.constraint(name)
+            if constraint is None:
+                if self._op == "||":
+                    return None
+                continue
+            if result is None:
+                result = constraint
+            else:
+                result = result.intersect(constraint) if self._op == "&&" else result.union(constraint)
+        return result
+
+    def _render(self):
+        parts = []
+        for operand in self._operands:
+            text = operand.render()
+            parts.append(f"({text})" if isinstance(operand, _BoolOp) else text)
+        return f" {self._op} ".join(parts)
+
+
+class _Not(Expr):
+    __slots__ = ("_operand",)
+
+    def __init__(self, operand):
+        super().__init__()
+        self._operand = operand
+
+    def fields(self):
+        return self._operand.fields()
+
+    def _render(self):
+        return f"not ({self._operand.render()})"
+
+
+class FieldRef:
+    """
+    A scalar field of a schema, compared with values or other fields to build expressions.
+    """
+    __slots__ = ("schema",)
+
+    def __init__(self, schema):
+        if schema.dtype in _VECTOR_TYPES:
+            raise InvalidExpressionException(0, ExceptionsMessage.ExprVectorField % schema.name)
+        self.schema = schema
+
+    def __eq__(self, value):
+        return _Compare(self.schema, "==", value)
+
+    def __ne__(self, value):
+        return _Compare(self.schema, "!=", value)
+
+    def __lt__(self, value):
+        return _Compare(self.schema, "<", value)
+
+    def __le__(self, value):
+        return _Compare(self.schema, "<=", value)
+
+    def __gt__(self, value):
+        return _Compare(self.schema, ">", value)
+
+    def __ge__(self, value):
+        return _Compare(self.schema, ">=", value)
+
+    __hash__ = None
+
+    def isin(self, values):
+        """
+        Matches the entities whose field is one of ``values``, a list or a NumPy array.
+        """
+        return _In(self.schema, values)
+
+    def notin(self, values):
+        """
+        Matches the entities whose field is none of ``values``.
+        """
+        return _In(self.schema, values, negate=True)
+
+    def between(self, low, high):
+        """
+        Matches the entities whose field is within ``low`` and ``high``, both included.
+        """
+        return (self >= low) & (self <= high)
+
+    def __repr__(self):
+        return f"<FieldRef: {self.schema.name}>"
+
+
+class Fields:
+    """
+    The fields of a schema, as attributes or items for names that are not identifiers.
+
+    :param schema: The schema the expressions are checked against.
+    :type  schema: CollectionSchema
+
+    :raises InvalidExpressionException: If a field is not in the schema or is a vector field.
+
+    :example:
+        >>> F = Fields(collection.schema)
+        >>> (F.film_id >= 10) & ~F["film-date"].isin([2000, 2001])
+        <_BoolOp: film_id >= 10 && not (film-date in [2000, 2001])>
+    """
+
+    def __init__(self, schema):
+        self._schema = schema
+        self._fields = {field.name: field for field in schema.fields}
+        self._refs = {}
+
+    @property
+    def schema(self):
+        return self._schema
+
+    def __getitem__(self, name):
+        ref = self._refs.get(name)
+        if ref is None:
+            field = self._fields.get(name)
+            if field is None:
+                raise InvalidExpressionException(0, ExceptionsMessage.ExprFieldNotExist % name)
+            ref = self._refs[name] = FieldRef(field)
+        return ref
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    def __dir__(self):
+        return list(super().__dir__()) + list(self._fields)
+
+
+_COMPARATORS = {ast.Eq: operator.eq, ast.NotEq: operator.ne, ast.Lt: operator.lt, ast.LtE: operator.le,
+                ast.Gt: operator.gt, ast.GtE: operator.ge}
+_FLIPPED = {ast.Lt: ast.Gt, ast.LtE: ast.GtE, ast.Gt: ast.Lt, ast.GtE: ast.LtE, ast.Eq: ast.Eq, ast.NotEq: ast.NotEq}
+_LITERALS = {"true": True, "True": True, "false": False, "False": False}
+_QUOTED = re.compile(r'"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'')
+NOT_CONSTANT = object()
+
+
+def _to_python(text):
+    """
+    Rewrites the operators of an expression into Python ones, leaving quoted strings as is.
+    """
+    def rewrite(span):
+        span = span.replace("&&", " and ").replace("||", " or ").replace("!=", "<>")
+        return span.replace("!", " not ").replace("<>", "!=")
+
+    parts, end = [], 0
+    for match in _QUOTED.finditer(text):
+        parts.append(rewrite(text[end:match.start()]))
+        parts.append(match.group())
+        end = match.end()
+    parts.append(rewrite(text[end:]))
+    return "".join(parts)
+
+
+def parse_tree(text):
+    """
+    Parses an expression string into the tree of the equivalent Python expression, with
+    ``&&``, ``||`` and ``!`` rewritten outside quoted strings.
+
+    :raises SyntaxError: If the expression is not a valid expression.
+    """
+    return ast.parse(_to_python(text).strip(), mode="eval").body
+
+
+def constant_value(node):
+    """
+    Returns the value of a constant node of `parse_tree`, also in the trees of Python 3.6
+    and 3.7, or `NOT_CONSTANT` if the node is not a constant.
+    """
+    if isinstance(node, ast.Constant):
+        return node.value
+    if sys.version_info < (3, 8):
+        if isinstance(node, ast.Num):
+            return node.n
+        if isinstance(node, ast.Str):
+            return node.s
+        if isinstance(node, ast.NameConstant):
+            return node.value
+    return NOT_CONSTANT
+
+
+def parse_expr(text, fields):
+    """
+    Parses an expression string into an `Expr`, checked against ``fields``, so that code
+    looking into expressions handles strings and built expressions alike.
+
+    Only comparisons, ``in``, ``not in``, ``&&``, ``||`` and ``not`` are understood, with field
+    names that are identifiers.
+
+    :param fields: The fields of the schema.
+    :type  fields: Fields
+
+    :raises InvalidExpressionException: If the expression cannot be parsed or checked.
+
+    :example:
+        >>> parse_expr("film_id in [1, 2] && film_date > 2000", Fields(collection.schema))
+        <_BoolOp: film_id in [1, 2] && film_date > 2000>
+    """
+    try:
+        tree = parse_tree(text)
+    except SyntaxError:
+        raise InvalidExpressionException(0, ExceptionsMessage.ExprParse % text) from None
+
+    def literal(node):
+        if isinstance(node, ast.Name) and node.id in _LITERALS:
+            return _LITERALS[node.id]
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            return -literal(node.operand)
+        if isinstance(node, (ast.List, ast.Tuple)):
+            return [literal(item) for item in node.elts]
+        value = constant_value(node)
+        if value is not NOT_CONSTANT and not isinstance(value, bytes):
+            return value
+        raise InvalidExpressionException(0, ExceptionsMessage.ExprParse % text)
+
+    def is_field(node):
+        return isinstance(node, ast.Name) and node.id not in _LITERALS
+
+    def compare(left, op, right):
+        if isinstance(op, (ast.In, ast.NotIn)) and is_field(left):
+            ref = fields[left.id]
+            return ref.notin(literal(right)) if isinstance(op, ast.NotIn) else ref.isin(literal(right))
+        if type(op) not in _COMPARATORS:
+            raise InvalidExpressionException(0, ExceptionsMessage.ExprParse % text)
+        if not is_field(left):
+            left, op, right = right, _FLIPPED[type(op)](), left
+            if not is_field(left):
+                raise InvalidExpressionException(0, ExceptionsMessage.ExprParse % text)
+        value = fields[right.id] if is_field(right) else literal(right)
+        return _COMPARATORS[type(op)](fields[left.id], value)
+
+    def visit(node):
+        if isinstance(node, ast.BoolOp):
+            combine = operator.and_ if isinstance(node.op, ast.And) else operator.or_
+            result = visit(node.values[0])
+            for value in node.values[1:]:
+                result = combine(result, visit(value))
+            return result
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            return ~visit(node.operand)
+        if isinstance(node, ast.Compare):
+            terms, left = [], node.left
+            for op, right in zip(node.ops, node.comparators):
+                terms.append(compare(left, op, right))
+                left = right
+            result = terms[0]
+            for term in terms[1:]:
+                result = result & term
+            return result
+        raise InvalidExpressionException(0, ExceptionsMessage.ExprParse % text)
+
+    return visit(tree)
+
+
+def render_expr(expr, schema):
+    """
+    Returns ``expr`` as an expression string, checking an `Expr` against ``schema``.
+
+    :raises DataTypeNotMatchException: If ``expr`` is neither a string nor an `Expr`.
+    """
+    if isinstance(expr, str):
+        return expr
+    if not isinstance(expr, Expr):
+        raise DataTypeNotMatchException(0, ExceptionsMessage.ExprType % type(expr))
+    expr.validate(schema)
+    return expr.render()
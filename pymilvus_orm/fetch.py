@@ -0,0 +1,172 @@
+# Copyright (C) 2019-2021 Zilliz. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+
+"""
+Fetching entities by primary key: the ids are turned into compact query expressions, runs of
+consecutive ids into range predicates and the others into ``in`` lists, split into chunks
+queried in parallel.
+"""
+
+import collections
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy
+
+from .deadline import current_deadline, deadline_at
+
+DEFAULT_FETCH_BATCH_SIZE = 1000
+DEFAULT_FETCH_CONCURRENCY = 4
+DEFAULT_MIN_RUN = 16
+
+
+def _format_ids(ids):
+    return ", ".join(map(str, ids.tolist()))
+
+
+def plan_id_queries(pk_name, ids, batch_size=DEFAULT_FETCH_BATCH_SIZE, min_run=DEFAULT_MIN_RUN):
+    """
+    Returns the query expressions selecting the entities of ``ids``, each selecting at most
+    ``batch_size`` ids. Runs of at least ``min_run`` consecutive ids become range predicates.
+
+    :param ids: The primary keys, in any order, duplicates allowed.
+    :type  ids: list[int] or numpy.ndarray
+
+    :return list[str]:
+        The expressions.
+
+    :example:
+        >>> plan_id_queries("film_id", [7, 1, 2, 3, 4], min_run=3)
+        ['film_id in [7] || (film_id >= 1 && film_id <= 4)']
+    """
+    ids = numpy.unique(numpy.asarray(ids, dtype=numpy.int64))
+    if len(ids) == 0:
+        return []
+    breaks = numpy.flatnonzero(numpy.diff(ids) != 1) + 1
+    starts = numpy.concatenate(([0], breaks))
+    ends = numpy.concatenate((breaks, [len(ids)]))
+
+    expressions = []
+    singles, ranges, size = [], [], 0
+
+    def flush():
+        nonlocal singles, ranges, size
+        terms = []
+        if singles:
+            terms.append(f"{pk_name} in [{_format_ids(numpy.concatenate(singles))}]")
+        terms.extend(f"({pk_name} >= {low} && {pk_name} <= {high})" for low, high in ranges)
+        if terms:
+            expressions.append(" || ".join(terms))
+        singles, ranges, size = [], [], 0
+
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        while start < end:
+            run = end - start
+            take = min(run, batch_size - size)
+            if take < min_run <= run and size:
+                flush()
+                continue
+            if run >= min_run:
+                ranges.append((int(ids[start]), int(ids[start + take - 1])))
+            else:
+                singles.append(ids[start:start + take])
+            size += take
+            start += take
+            if size >= batch_size:
+                flush()
+    flush()
+    return expressions
+
+
+class EntityCache:
+    """
+    A least recently used cache of fetched entities, keyed by the primary key and the output
+    fields they were fetched with.
+
+    :param max_entries: The number of entities kept.
+    :type  max_entries: int
+    """
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._entities = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, fields, ids):
+        """
+        Returns the cached entities of ``ids``, and the ids missing from the cache.
+        """
+        found, missing = {}, []
+        with self._lock:
+            for pk in ids:
+                entity = self._entities.get((fields, pk))
+                if entity is None:
+                    missing.append(pk)
+                    continue
+                self._entities.move_to_end((fields, pk))
+                found[pk] = entity
+            self.hits += len(found)
+            self.misses += len(missing)
+        return found, missing
+
+    def put_many(self, fields, entities):
+        with self._lock:
+            for pk, entity in entities.items():
+                self._entities[(fields, pk)] = entity
+                self._entities.move_to_end((fields, pk))
+            while len(self._entities) > self.max_entries:
+                self._entities.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entities.clear()
+
+    def __len__(self):
+        return len(self._entities)
+
+    def stats(self):
+        """
+        Returns the ids served from the cache, the ones fetched and the entities cached.
+        """
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entities)}
+
+
+def fetch_entities(query, pk_name, ids, batch_size=DEFAULT_FETCH_BATCH_SIZE,
+                   max_concurrency=DEFAULT_FETCH_CONCURRENCY, min_run=DEFAULT_MIN_RUN):
+    """
+    Queries the entities of ``ids`` with ``query(expr)``, the chunks in parallel under the
+    deadline of the calling thread.
+
+    :return dict:
+        The entities found, by primary key.
+    """
+    expressions = plan_id_queries(pk_name, ids, batch_size, min_run)
+    if not expressions:
+        return {}
+    expire = current_deadline()
+
+    def run(expr):
+        with deadline_at(expire):
+            return query(expr)
+
+    entities = {}
+    if len(expressions) == 1:
+        chunks = [run(expressions[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(expressions)))) as executor:
+            chunks = list(executor.map(run, expressions))
+    for chunk in chunks:
+        for entity in chunk:
+            entities[entity[pk_name]] = entity
+    return entities
@@ -12,9 +12,21 @@
 
 import copy
 
+from .deadline import remaining_timeout
 from .exceptions import CollectionNotExistException, ExceptionsMessage, IndexNotExistException
 
 
+def same_index_exists(collection, conn, field_name, index_params):
+    """
+    Returns whether the index of ``collection`` is already on ``field_name`` with
+    ``index_params``, in which case creating it again is skipped.
+    """
+    index = collection._describe_index(conn)
+    if index is None:
+        return False
+    return index.pop("field_name", None) == field_name and index == index_params
+
+
 class Index:
     def __init__(self, collection, field_name, index_params, **kwargs):
         """
@@ -29,6 +41,10 @@ class Index:
         :param index_params: Indexing parameters.
         :type  index_params: dict
 
+        :param kwargs:
+            * *timeout* (``float``) --
+              An optional duration of time in seconds to allow for the RPCs creating the index.
+
         :raises ParamError: If parameters are invalid.
         :raises IndexConflictException:
         If an index of the same name but of different param already exists.
@@ -65,11 +81,11 @@ class Index:
             return
 
         conn = self._get_connection()
-        index = conn.describe_index(self._collection.name)
-        if index is not None:
-            tmp_field_name = index.pop("field_name", None)
-        if index is None or index != index_params or tmp_field_name != field_name:
-            conn.create_index(self._collection.name, self._field_name, self._index_params)
+        with self._collection._deadline(kwargs.get("timeout", None)):
+            if not same_index_exists(self._collection, conn, field_name, index_params):
+                conn.create_index(self._collection.name, self._field_name, self._index_params,
+                                  timeout=remaining_timeout())
+                self._collection._invalidate_metadata()
 
     def _get_connection(self):
         return self._collection._get_connection()
@@ -134,6 +150,8 @@ class Index:
         :raises IndexNotExistException: If the specified index does not exist.
         """
         conn = self._get_connection()
-        if conn.describe_index(self._collection.name) is None:
-            raise IndexNotExistException(0, ExceptionsMessage.IndexNotExist)
-        conn.drop_index(self._collection.name, self.field_name, timeout=timeout, **kwargs)
+        with self._collection._deadline(timeout):
+            if self._collection._describe_index(conn) is None:
+                raise IndexNotExistException(0, ExceptionsMessage.IndexNotExist)
+            conn.drop_index(self._collection.name, self.field_name, timeout=remaining_timeout(), **kwargs)
+        self._collection._invalidate_metadata()
@@ -0,0 +1,377 @@
+# Copyright (C) 2019-2021 Zilliz. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+
+"""
+Non-blocking index builds.
+
+An `IndexBuildFuture` sends the create index request without waiting and follows the build
+through `index_building_progress`, checking it with the backoff of `waiter.ProgressTracker`.
+An `IndexBuildManager` runs the builds of many collections at once from a single thread,
+with a limit on the builds in progress.
+"""
+
+import collections
+import threading
+import time
+
+from .deadline import deadline, remaining_timeout
+from .exceptions import IndexBuildFailedException, ExceptionsMessage
+from .index import Index, same_index_exists
+from .waiter import (
+    Backoff,
+    ProgressTracker,
+    DEFAULT_INITIAL_INTERVAL,
+    INDEX_STATE_FAILED,
+    check_index_building,
+    index_building_measure,
+)
+
+DEFAULT_POLL_INTERVAL = 1.0
+
+PENDING = "pending"
+BUILDING = "building"
+FINISHED = "finished"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+class IndexBuildFuture:
+    """
+    The handle of an index build, returned by ``Collection.create_index(..., _async=True)``
+    and `IndexBuildManager.submit`.
+
+    The build is finished once all rows of the collection are indexed or the server reports
+    it finished, and failed once the server reports it failed. The handle can be
+    polled with `poll`, waited on with `result` or awaited in a coroutine.
+
+    :example:
+        >>> future = collection.create_index("films", index_params, _async=True)
+        >>> future.add_progress_callback(lambda f, progress: print(progress))
+        >>> index = future.result(timeout=600)
+    """
+
+    def __init__(self, collection, field_name, index_params, poll_interval=DEFAULT_POLL_INTERVAL):
+        self._collection = collection
+        self._field_name = field_name
+        self._index_params = index_params
+        self._tracker = ProgressTracker(Backoff(min(DEFAULT_INITIAL_INTERVAL, poll_interval), poll_interval))
+        self._next_delay = 0.0
+        self._state = PENDING
+        self._progress = None
+        self._result = None
+        self._exception = None
+        self._managed = False
+        self._lock = threading.Lock()
+        self._done_event = threading.Event()
+        self._progress_callbacks = []
+        self._done_callbacks = []
+
+    @property
+    def collection_name(self):
+        return self._collection.name
+
+    @property
+    def field_name(self):
+        return self._field_name
+
+    @property
+    def index_params(self):
+        return self._index_params
+
+    @property
+    def state(self):
+        """
+        Returns the state of the build: pending, building, finished, failed or cancelled.
+        """
+        return self._state
+
+    def progress(self):
+        """
+        Returns the last progress seen, ``{'total_rows': ..., 'indexed_rows': ...}``, or None.
+        """
+        return self._progress
+
+    def add_progress_callback(self, fn):
+        """
+        Calls ``fn(future, progress)`` every time the progress of the build changes.
+        """
+        self._progress_callbacks.append(fn)
+
+    def add_done_callback(self, fn):
+        """
+        Calls ``fn(future)`` once the build is finished, failed or cancelled.
+        """
+        with self._lock:
+            if not self._done_event.is_set():
+                self._done_callbacks.append(fn)
+                return
+        fn(self)
+
+    def start(self):
+        """
+        Sends the create index request without waiting for the build. As with `index.Index`,
+        the request is skipped if the field already has an index of the same parameters, and
+        the build of that index is followed instead.
+        """
+        with self._lock:
+            if self._state != PENDING:
+                return
+            self._state = BUILDING
+        try:
+            conn = self._collection._get_connection()
+            with self._collection._deadline(None):
+                if same_index_exists(self._collection, conn, self._field_name, self._index_params):
+                    return
+                conn.create_index(self._collection.name, self._field_name, self._index_params,
+                                  timeout=remaining_timeout(), sync=False)
+            self._collection._invalidate_metadata()
+        except Exception as err:
+            self._finish(FAILED, exception=err)
+
+    def poll(self):
+        """
+        Checks the progress of the build once, starting it first if it is pending.
+
+        :return dict:
+            The progress, None if the build has not reported any.
+        """
+        if self._state == PENDING:
+            self.start()
+        if self.done():
+            return self._progress
+        try:
+            conn = self._collection._get_connection()
+            with self._collection._deadline(None):
+                progress = check_index_building(conn, self._collection.name, "", self._field_name, self._progress)
+        except Exception as err:
+            self._finish(FAILED, exception=err)
+            return self._progress
+        self._set_progress(progress)
+        if progress.get("state") == INDEX_STATE_FAILED:
+            message = ExceptionsMessage.IndexBuildFailed % (self._collection.name, progress["fail_reason"])
+            self._finish(FAILED, exception=IndexBuildFailedException(0, message))
+            return progress
+        indexed, total = index_building_measure(progress)
+        if indexed >= total:
+            self._finish(FINISHED, result=Index(self._collection, self._field_name, self._index_params,
+                                                construct_only=True))
+        else:
+            self._next_delay = self._tracker.update(indexed, total)
+        return progress
+
+    def _set_progress(self, progress):
+        if progress == self._progress:
+            return
+        self._progress = progress
+        for fn in self._progress_callbacks:
+            fn(self, progress)
+
+    def _finish(self, state, result=None, exception=None):
+        with self._lock:
+            if self._done_event.is_set():
+                return
+            self._state = state
+            self._result = result
+            self._exception = exception
+            self._done_event.set()
+            callbacks, self._done_callbacks = self._done_callbacks, []
+        for fn in callbacks:
+            fn(self)
+
+    def done(self):
+        """
+        Returns whether the build is finished, failed or cancelled.
+        """
+        return self._done_event.is_set()
+
+    def cancel(self):
+        """
+        Cancels a build that has not been started yet.
+
+        :return bool:
+            Whether the build was cancelled.
+        """
+        with self._lock:
+            if self._state != PENDING:
+                return False
+        self._finish(CANCELLED)
+        return True
+
+    def result(self, timeout=None):
+        """
+        Waits for the build to finish.
+
+        :param timeout: The time in seconds to wait, None to wait until the build is done.
+        :type  timeout: float
+
+        :return Index:
+            The built index.
+
+        :raises DeadlineExceededException: If the build is not done within ``timeout``.
+        :raises BaseException: If the build failed.
+        """
+        with deadline(timeout):
+            while not self.done():
+                left = remaining_timeout()
+                if self._managed:
+                    self._done_event.wait(left)
+                    continue
+                self.poll()
+                if not self.done():
+                    time.sleep(self._next_delay if left is None else min(self._next_delay, left))
+        if self._exception is not None:
+            raise self._exception
+        return self._result
+
+    def __await__(self):
+        return self._wait_async().__await__()
+
+    async def _wait_async(self):
+        import asyncio
+
+        loop = asyncio.get_event_loop()
+        while not self.done():
+            if self._managed:
+                await loop.run_in_executor(None, self._done_event.wait)
+                continue
+            await loop.run_in_executor(None, self.poll)
+            if not self.done():
+                await asyncio.sleep(self._next_delay)
+        return self.result()
+
+    def __repr__(self):
+        return f"IndexBuildFuture(collection={self.collection_name!r}, field={self._field_name!r}, " \
+               f"state={self._state}, progress={self._progress})"
+
+
+class IndexBuildManager:
+    """
+    Runs index builds on many collections at once, at most ``max_concurrent`` of them in
+    progress, all polled from one background thread. Each build is checked again after its
+    own backoff delay, so builds close to completion are checked sooner than stalled ones.
+    The thread exits once no build is queued or in progress, and is started again by the
+    next `submit`; `shutdown`, or leaving the ``with`` block, stops accepting builds.
+
+    :param max_concurrent: The number of builds in progress at a time.
+    :type  max_concurrent: int
+    :param poll_interval: The longest delay in seconds between two progress checks of a build.
+    :type  poll_interval: float
+    :param using: The connection of the collections given by name.
+    :type  using: str
+
+    :example:
+        >>> from pymilvus_orm.index_build import IndexBuildManager
+        >>> with IndexBuildManager(max_concurrent=16) as manager:
+        ...     futures = [manager.submit(name, "films", index_params) for name in utility.list_collections()]
+        >>> [future.state for future in futures]
+    """
+
+    def __init__(self, max_concurrent=8, poll_interval=DEFAULT_POLL_INTERVAL, using="default"):
+        self._max_concurrent = max_concurrent
+        self._poll_interval = poll_interval
+        self._using = using
+        self._queue = collections.deque()
+        self._futures = []
+        self._cond = threading.Condition()
+        self._thread = None
+        self._closed = False
+
+    def submit(self, collection, field_name, index_params):
+        """
+        Queues an index build.
+
+        :param collection: The collection, or its name.
+        :type  collection: class `collection.Collection` or str
+
+        :return IndexBuildFuture:
+            The handle of the build.
+        """
+        if isinstance(collection, str):
+            from .collection import Collection
+            collection = Collection(collection, using=self._using)
+        future = IndexBuildFuture(collection, field_name, index_params, self._poll_interval)
+        future._managed = True
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("cannot submit index builds after shutdown")
+            self._queue.append(future)
+            self._futures.append(future)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="IndexBuildManager", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return future
+
+    def _run(self):
+        active = {}
+        while True:
+            with self._cond:
+                if not self._queue and not active:
+                    self._thread = None
+                    return
+                starting = []
+                while self._queue and len(active) + len(starting) < self._max_concurrent:
+                    future = self._queue.popleft()
+                    if future.state == PENDING:
+                        starting.append(future)
+            for future in starting:
+                future.start()
+                active[future] = 0.0
+            now = time.monotonic()
+            for future, due in list(active.items()):
+                if due > now:
+                    continue
+                future.poll()
+                if future.done():
+                    del active[future]
+                else:
+                    active[future] = time.monotonic() + future._next_delay
+            with self._cond:
+                if active and not (self._queue and len(active) < self._max_concurrent):
+                    self._cond.wait(max(0.0, min(active.values()) - time.monotonic()))
+
+    def wait(self, timeout=None):
+        """
+        Waits for all builds submitted so far to be done.
+
+        :return list[IndexBuildFuture]:
+            The handles of the builds, in submission order.
+
+        :raises DeadlineExceededException: If the builds are not done within ``timeout``.
+        """
+        with deadline(timeout):
+            futures = list(self._futures)
+            for future in futures:
+                while not future.done():
+                    left = remaining_timeout()
+                    future._done_event.wait(self._poll_interval if left is None else left)
+        return futures
+
+    def shutdown(self, wait=True, cancel_pending=False):
+        """
+        Stops accepting builds, and waits for the submitted ones to be done if ``wait``.
+        """
+        with self._cond:
+            self._closed = True
+            if cancel_pending:
+                for future in self._queue:
+                    future.cancel()
+            self._cond.notify()
+            thread = self._thread
+        if wait and thread is not None:
+            thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown(wait=exc_type is None, cancel_pending=exc_type is not None)
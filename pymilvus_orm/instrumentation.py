@@ -0,0 +1,253 @@
+# Copyright (C) 2019-2021 Zilliz. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+
+import time
+
+import numpy
+
+from .types import DataType
+
+ATTR_ROWS = "rows"
+ATTR_BYTES = "bytes"
+
+
+# the instrumentation backend of all ORM calls, None when disabled
+_instrument = None
+
+
+class _NoopSpan:
+    recording = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+    def set_attribute(self, key, value):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    """
+    A timed phase of an ORM call. Attributes such as row counts and payload bytes are
+    attached with ``set_attribute`` and reported to the instrument when the phase ends.
+    """
+    recording = True
+
+    def __init__(self, instrument, name):
+        self._instrument = instrument
+        self.name = name
+        self.attributes = {}
+        self.duration = None
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.duration = time.perf_counter() - self._start
+        self._instrument.on_span_end(self, exc_val)
+        return False
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+
+class Instrument:
+    """
+    Base class of instrumentation backends.
+
+    Subclasses override ``on_span_end`` to export finished spans, or ``start_span`` to
+    hand span lifecycle to a tracing library.
+    """
+
+    def start_span(self, name):
+        return Span(self, name)
+
+    def on_span_end(self, current, error):
+        pass
+
+
+class PrometheusInstrument(Instrument):
+    """
+    Exports phase latencies as a histogram and rows, payload bytes and errors as counters,
+    all labelled by phase. Requires ``prometheus_client``.
+
+    :param registry: The collector registry, the global default registry if None.
+    :param namespace: The prefix of the metric names.
+    """
+
+    def __init__(self, registry=None, namespace="pymilvus_orm"):
+        try:
+            import prometheus_client
+        except ImportError:
+            raise ImportError("PrometheusInstrument requires the prometheus_client package.") from None
+        if registry is None:
+            registry = prometheus_client.REGISTRY
+        self._latency = prometheus_client.Histogram(f"{namespace}_phase_duration_seconds",
+                                                    "Duration of ORM call phases.", ["phase"],
+                                                    registry=registry)
+        self._rows = prometheus_client.Counter(f"{namespace}_rows", "Rows handled by ORM call phases.",
+                                               ["phase"], registry=registry)
+        self._bytes = prometheus_client.Counter(f"{namespace}_payload_bytes",
+                                                "Payload bytes handled by ORM call phases.", ["phase"],
+                                                registry=registry)
+        self._errors = prometheus_client.Counter(f"{namespace}_errors", "Failed ORM call phases.",
+                                                 ["phase"], registry=registry)
+
+    def on_span_end(self, current, error):
+        self._latency.labels(current.name).observe(current.duration)
+        rows = current.attributes.get(ATTR_ROWS, None)
+        if rows:
+            self._rows.labels(current.name).inc(rows)
+        nbytes = current.attributes.get(ATTR_BYTES, None)
+        if nbytes:
+            self._bytes.labels(current.name).inc(nbytes)
+        if error is not None:
+            self._errors.labels(current.name).inc()
+
+
+class _OpenTelemetrySpan:
+    recording = True
+
+    def __init__(self, tracer, name):
+        self._tracer = tracer
+        self.name = name
+        self._ctx = None
+        self._span = None
+
+    def __enter__(self):
+        self._ctx = self._tracer.start_as_current_span(f"pymilvus_orm.{self.name}")
+        self._span = self._ctx.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return self._ctx.__exit__(exc_type, exc_val, exc_tb)
+
+    def set_attribute(self, key, value):
+        self._span.set_attribute(f"milvus.{key}", value)
+
+
+class OpenTelemetryInstrument(Instrument):
+    """
+    Emits every phase as an OpenTelemetry span, nested under the caller's current span.
+    Requires ``opentelemetry-api``.
+
+    :param tracer: The tracer to use, the tracer of the global provider if None.
+    """
+
+    def __init__(self, tracer=None):
+        if tracer is None:
+            try:
+                from opentelemetry import trace
+            except ImportError:
+                raise ImportError("OpenTelemetryInstrument requires the opentelemetry-api package.") from None
+            tracer = trace.get_tracer("pymilvus_orm")
+        self._tracer = tracer
+
+    def start_span(self, name):
+        return _OpenTelemetrySpan(self._tracer, name)
+
+
+def set_instrument(instrument):
+    """
+    Installs the instrumentation backend of all ORM calls.
+
+    :param instrument: The backend, None disables instrumentation.
+    :type  instrument: Instrument
+
+    :example:
+        >>> from pymilvus_orm.instrumentation import set_instrument, PrometheusInstrument
+        >>> set_instrument(PrometheusInstrument())
+    """
+    global _instrument  # pylint: disable=global-statement
+    _instrument = instrument
+
+
+def get_instrument():
+    return _instrument
+
+
+def span(name):
+    """
+    Returns a span timing the phase ``name``, or a shared no-op span when instrumentation
+    is disabled. Callers should guard costly attribute computation with ``span.recording``.
+    """
+    instrument = _instrument
+    if instrument is None:
+        return _NOOP_SPAN
+    return instrument.start_span(name)
+
+
+def record_entities(current, entities):
+    """
+    Attaches row count and payload size of prepared insert entities to a span.
+    """
+    if current.recording:
+        current.set_attribute(ATTR_ROWS, len(entities[0]["values"]) if entities else 0)
+        current.set_attribute(ATTR_BYTES, entities_nbytes(entities))
+
+
+def record_vectors(current, data):
+    """
+    Attaches query count and payload size of search vectors to a span.
+    """
+    if current.recording:
+        current.set_attribute(ATTR_ROWS, len(data))
+        current.set_attribute(ATTR_BYTES, vectors_nbytes(data))
+
+
+def entities_nbytes(entities):
+    """
+    Estimates the wire size of prepared insert entities.
+    """
+    total = 0
+    for entity in entities:
+        values = entity["values"]
+        if isinstance(values, numpy.ndarray):
+            total += values.nbytes
+            continue
+        rows = len(values)
+        if rows == 0:
+            continue
+        dtype = entity["type"]
+        if dtype == DataType.FLOAT_VECTOR:
+            total += rows * len(values[0]) * 4
+        elif dtype == DataType.BINARY_VECTOR:
+            total += rows * len(values[0])
+        elif dtype == DataType.STRING:
+            total += sum(len(v) for v in values)
+        elif dtype == DataType.BOOL:
+            total += rows
+        elif dtype in (DataType.INT8, DataType.INT16, DataType.INT32, DataType.FLOAT):
+            total += rows * 4
+        else:
+            total += rows * 8
+    return total
+
+
+def vectors_nbytes(data):
+    """
+    Estimates the wire size of search vectors.
+    """
+    if isinstance(data, numpy.ndarray):
+        return data.nbytes
+    if len(data) == 0:
+        return 0
+    if isinstance(data[0], bytes):
+        return len(data) * len(data[0])
+    return len(data) * len(data[0]) * 4
@@ -0,0 +1,273 @@
+# Copyright (C) 2019-2021 Zilliz. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+
+"""
+Bulk loading of collections from Parquet, npy, npz and fvecs/ivecs/bvecs files.
+
+Files are read in bounded chunks, memory-mapped where the format allows, and every chunk
+is sent as its own insert request while the next chunk is read, so the files never have
+to fit in memory.
+"""
+
+import collections
+import os
+import struct
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy
+
+from .deadline import current_deadline, deadline_at, remaining_timeout
+from .exceptions import DataNotMatchException, DataTypeNotSupportException, ExceptionsMessage
+from .instrumentation import span, record_entities
+from .mutation import MutationResult
+from .types import DataType
+
+DEFAULT_BATCH_SIZE = 10000
+DEFAULT_MAX_PENDING = 2
+
+# every record of these files is an int32 dimension followed by the components
+_VECS_DTYPES = {
+    ".fvecs": numpy.dtype("<f4"),
+    ".ivecs": numpy.dtype("<i4"),
+    ".bvecs": numpy.dtype("u1"),
+}
+
+_NPY_HEADER_READERS = {
+    (1, 0): numpy.lib.format.read_array_header_1_0,
+    (2, 0): numpy.lib.format.read_array_header_2_0,
+}
+
+
+def _extension(path):
+    return os.path.splitext(str(path))[1].lower()
+
+
+def open_vecs(path):
+    """
+    Memory-maps a fvecs, ivecs or bvecs file.
+
+    :param path: The file path.
+    :type  path: str
+
+    :return numpy.ndarray:
+        A read-only (rows, dim) view of the vectors.
+    """
+    dtype = _VECS_DTYPES[_extension(path)]
+    size = os.path.getsize(path)
+    if size == 0:
+        return numpy.empty((0, 0), dtype=dtype)
+    with open(path, "rb") as f:
+        dim = struct.unpack("<i", f.read(4))[0]
+    record = numpy.dtype([("dim", "<i4"), ("vector", dtype, (dim,))])
+    if dim <= 0 or size % record.itemsize:
+        raise DataNotMatchException(0, ExceptionsMessage.FileCorrupted % str(path))
+    return numpy.memmap(path, dtype=record, mode="r")["vector"]
+
+
+def _open_npz_member(path, info):
+    if info.compress_type != zipfile.ZIP_STORED:
+        return None
+    with open(path, "rb") as f:
+        f.seek(info.header_offset)
+        name_len, extra_len = struct.unpack("<HH", f.read(30)[26:30])
+        f.seek(info.header_offset + 30 + name_len + extra_len)
+        read_header = _NPY_HEADER_READERS.get(numpy.lib.format.read_magic(f))
+        if read_header is None:
+            return None
+        shape, fortran_order, dtype = read_header(f)
+        offset = f.tell()
+    if dtype.hasobject:
+        return None
+    order = "F" if fortran_order else "C"
+    return numpy.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape, order=order)
+
+
+def open_npz(path):
+    """
+    Opens the arrays of a npz file by name. Members stored without compression, as written
+    by `numpy.savez`, are memory-mapped; compressed members are read into memory.
+
+    :param path: The file path.
+    :type  path: str
+
+    :return dict:
+        The arrays by name.
+    """
+    arrays = {}
+    with zipfile.ZipFile(path) as archive:
+        infos = archive.infolist()
+    loaded = None
+    for info in infos:
+        name = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+        array = _open_npz_member(path, info)
+        if array is None:
+            if loaded is None:
+                loaded = numpy.load(path)
+            array = loaded[name]
+        arrays[name] = array
+    return arrays
+
+
+def open_array(path):
+    """
+    Memory-maps a file holding a single array, a npy file or a fvecs, ivecs or bvecs file.
+    """
+    ext = _extension(path)
+    if ext == ".npy":
+        return numpy.load(path, mmap_mode="r")
+    if ext in _VECS_DTYPES:
+        return open_vecs(path)
+    raise DataTypeNotSupportException(0, ExceptionsMessage.FileTypeNotSupport % str(path))
+
+
+def _check_array(name, dtype, dim, array, path):
+    if dtype == DataType.FLOAT_VECTOR:
+        matches = array.ndim == 2 and array.shape[1] == dim
+    elif dtype == DataType.BINARY_VECTOR:
+        matches = array.ndim == 2 and array.dtype.itemsize == 1 and array.shape[1] * 8 == dim
+    else:
+        matches = array.ndim == 1
+    if not matches:
+        raise DataNotMatchException(0, ExceptionsMessage.FileFieldInconsistent % (name, str(path)))
+
+
+def _array_column(values, dtype):
+    if dtype == DataType.FLOAT_VECTOR:
+        return numpy.asarray(values, dtype=numpy.float32)
+    if dtype == DataType.BINARY_VECTOR:
+        return [row.tobytes() for row in values]
+    return values.tolist()
+
+
+def _array_batches(plan, arrays, paths, batch_size):
+    rows = None
+    for name, dtype, dim in zip(plan.names, plan.dtypes, plan.dims):
+        if name not in arrays:
+            raise DataNotMatchException(0, ExceptionsMessage.FileFieldMissing % (name, str(paths[name])))
+        _check_array(name, dtype, dim, arrays[name], paths[name])
+        if rows is not None and len(arrays[name]) != rows:
+            raise DataNotMatchException(0, ExceptionsMessage.DataLengthsInconsistent)
+        rows = len(arrays[name])
+    for start in range(0, rows or 0, batch_size):
+        yield [_array_column(arrays[name][start:start + batch_size], dtype)
+               for name, dtype in zip(plan.names, plan.dtypes)]
+
+
+def _parquet_batches(plan, path, batch_size):
+    try:
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Loading Parquet files requires the pyarrow package.") from None
+    parquet_file = pyarrow.parquet.ParquetFile(path)
+    schema = parquet_file.schema_arrow
+    for name, dtype, dim in zip(plan.names, plan.dtypes, plan.dims):
+        index = schema.get_field_index(name)
+        if index < 0:
+            raise DataNotMatchException(0, ExceptionsMessage.FileFieldMissing % (name, str(path)))
+        list_size = getattr(schema.field(index).type, "list_size", None)
+        if dtype == DataType.FLOAT_VECTOR and list_size is not None and list_size != dim:
+            raise DataNotMatchException(0, ExceptionsMessage.FileFieldInconsistent % (name, str(path)))
+    yield from parquet_file.iter_batches(batch_size=batch_size, columns=list(plan.names))
+
+
+def iter_file_batches(plan, paths, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Reads files as insert batches of at most ``batch_size`` rows.
+
+    :param plan: The insert plan of the collection.
+    :type  plan: class `prepare.InsertPlan`
+    :param paths: Parquet or npz files, read one after another, or a dict mapping each field
+                  to a npy, fvecs, ivecs or bvecs file, read side by side. A single array file
+                  can also be passed directly when the collection has one field to insert.
+    :type  paths: str, list[str] or dict
+
+    :return iterator:
+        The batches, each a pyarrow.RecordBatch or a list of columns in plan order.
+    """
+    if isinstance(paths, dict):
+        arrays = {name: open_array(path) for name, path in paths.items()}
+        yield from _array_batches(plan, arrays, paths, batch_size)
+        return
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+    for path in paths:
+        ext = _extension(path)
+        if ext == ".parquet":
+            yield from _parquet_batches(plan, path, batch_size)
+        elif ext == ".npz":
+            arrays = open_npz(path)
+            yield from _array_batches(plan, arrays, {name: path for name in plan.names}, batch_size)
+        elif ext == ".npy" or ext in _VECS_DTYPES:
+            if len(plan.names) != 1:
+                raise DataNotMatchException(0, ExceptionsMessage.FileFieldsAmbiguous % str(path))
+            arrays = {plan.names[0]: open_array(path)}
+            yield from _array_batches(plan, arrays, {plan.names[0]: path}, batch_size)
+        else:
+            raise DataTypeNotSupportException(0, ExceptionsMessage.FileTypeNotSupport % str(path))
+
+
+def insert_batches(collection, batches, partition_name=None, max_pending=DEFAULT_MAX_PENDING, **kwargs):
+    """
+    Inserts batches into a collection, one insert request per batch.
+
+    The batches are prepared on the calling thread, the requests are sent from a pool of
+    ``max_pending`` threads, so producing the next batch overlaps with sending and at most
+    ``max_pending`` batches are held in memory besides the one being produced. The deadline
+    of the calling thread applies to every request.
+
+    :param collection: The collection.
+    :type  collection: class `collection.Collection`
+    :param batches: The batches, each accepted by `prepare.InsertPlan.apply`.
+    :type  batches: iterator
+
+    :return MutationResult:
+        The merged result of all insert requests.
+    """
+    kwargs.pop("_async", None)
+    plan = collection._get_insert_plan()
+    conn = collection._get_connection()
+    expire = current_deadline()
+
+    def send(entities):
+        with deadline_at(expire), span("insert.rpc") as rpc_span:
+            record_entities(rpc_span, entities)
+            res = conn.insert(collection_name=collection.name, entities=entities, ids=None,
+                              partition_name=partition_name, timeout=remaining_timeout(), **kwargs)
+        return MutationResult(res)
+
+    result = MutationResult(None)
+    pending = collections.deque()
+    with ThreadPoolExecutor(max_workers=max_pending) as executor:
+        try:
+            for batch in batches:
+                with span("insert.prepare") as prepare_span:
+                    entities = plan.apply(batch)
+                    record_entities(prepare_span, entities)
+                if len(pending) >= max_pending:
+                    result._merge(pending.popleft().result())
+                pending.append(executor.submit(send, entities))
+            while pending:
+                result._merge(pending.popleft().result())
+        finally:
+            for future in pending:
+                future.cancel()
+    return result
+
+
+def load_from_files(collection, paths, partition_name=None, batch_size=DEFAULT_BATCH_SIZE,
+                    max_pending=DEFAULT_MAX_PENDING, **kwargs):
+    """
+    Inserts the rows of files into a collection, see `Collection.load_from_files`.
+    """
+    batches = iter_file_batches(collection._get_insert_plan(), paths, batch_size)
+    return insert_batches(collection, batches, partition_name=partition_name, max_pending=max_pending, **kwargs)
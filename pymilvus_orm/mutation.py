@@ -18,6 +18,7 @@ class MutationResult:
         self._delete_cnt = 0
         self._upsert_cnt = 0
         self._timestamp = 0
+        self._owns_keys = False
         self._pack(mr)
 
     @property
@@ -59,6 +60,34 @@ class MutationResult:
     # def error_reason(self):
     #     pass
 
+    def _merge(self, other):
+        """
+        Adds the counts and primary keys of another result, e.g. of the next batch of one
+        insert, and keeps the latest timestamp. The keys are appended to a list the result
+        owns, so merging many batches is linear in the number of keys.
+        """
+        if not self._owns_keys:
+            self._primary_keys = list(self._primary_keys)
+            self._owns_keys = True
+        self._primary_keys.extend(other.primary_keys)
+        self._insert_cnt += other.insert_count
+        self._delete_cnt += other.delete_count
+        self._upsert_cnt += other.upsert_count
+        self._timestamp = max(self._timestamp, other.timestamp)
+        return self
+
+    def _reorder(self, order):
+        """
+        Puts primary keys returned in the order ``order`` back into the input order.
+        """
+        if len(self._primary_keys) == len(order):
+            keys = [None] * len(order)
+            for position, key in zip(order.tolist(), self._primary_keys):
+                keys[position] = key
+            self._primary_keys = keys
+            self._owns_keys = True
+        return self
+
     def _pack(self, mr):
         if mr is None:
             return
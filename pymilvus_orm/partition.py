@@ -13,9 +13,13 @@
 import json
 
 from .exceptions import CollectionNotExistException, PartitionNotExistException, ExceptionsMessage
-from .prepare import Prepare
+from .deadline import remaining_timeout
+from .expression import render_expr
+from .singleflight import single_flight
+from .instrumentation import span, record_entities, record_vectors, ATTR_ROWS
 from .search import SearchResult
 from .mutation import MutationResult
+from .types import is_arrow_reader
 from .future import SearchFuture, MutationFuture
 
 
@@ -33,9 +37,15 @@ class Partition:
         conn = self._get_connection()
         if kwargs.get("construct_only", False):
             return
-        has = conn.has_partition(self._collection.name, self._name)
-        if not has:
-            conn.create_partition(self._collection.name, self._name)
+        with self._deadline(None):
+            has = self._has_partition(conn)
+            if not has:
+                conn.create_partition(self._collection.name, self._name, timeout=remaining_timeout())
+                self._collection._invalidate_metadata()
+
+    def _has_partition(self, conn):
+        return single_flight(self._collection._using, ("has_partition", self._collection.name, self._name),
+                             lambda: conn.has_partition(self._collection.name, self._name, timeout=remaining_timeout()))
 
     def __repr__(self):
         return json.dumps({
@@ -47,6 +57,9 @@ class Partition:
     def _get_connection(self):
         return self._collection._get_connection()
 
+    def _deadline(self, timeout):
+        return self._collection._deadline(timeout)
+
     @property
     def description(self) -> str:
         """
@@ -136,9 +149,10 @@ class Partition:
             10
         """
         conn = self._get_connection()
-        conn.flush([self._collection.name])
-        status = conn.get_partition_stats(db_name="", collection_name=self._collection.name,
-                                          partition_name=self._name)
+        with self._deadline(None):
+            conn.flush([self._collection.name], timeout=remaining_timeout())
+            status = conn.get_partition_stats(db_name="", collection_name=self._collection.name,
+                                              partition_name=self._name, timeout=remaining_timeout())
         return status["row_count"]
 
     def drop(self, timeout=None, **kwargs):
@@ -164,9 +178,13 @@ class Partition:
             >>> partition.drop()
         """
         conn = self._get_connection()
-        if conn.has_partition(self._collection.name, self._name, timeout=timeout) is False:
-            raise PartitionNotExistException(0, ExceptionsMessage.PartitionNotExist)
-        return conn.drop_partition(self._collection.name, self._name, timeout=timeout, **kwargs)
+        with self._deadline(timeout):
+            if self._has_partition(conn) is False:
+                raise PartitionNotExistException(0, ExceptionsMessage.PartitionNotExist)
+            res = conn.drop_partition(self._collection.name, self._name, timeout=remaining_timeout(), **kwargs)
+        self._collection._invalidate_metadata()
+        self._collection._invalidate_results()
+        return res
 
     def load(self, timeout=None, **kwargs):
         """
@@ -194,8 +212,10 @@ class Partition:
         #  raise Exception Not Supported,
         #  if index_names is not None, raise Exception Not Supported
         conn = self._get_connection()
-        if conn.has_partition(self._collection.name, self._name):
-            return conn.load_partitions(self._collection.name, [self._name], timeout=timeout, **kwargs)
+        with self._deadline(timeout):
+            if self._has_partition(conn):
+                return conn.load_partitions(self._collection.name, [self._name], timeout=remaining_timeout(),
+                                            **kwargs)
         raise PartitionNotExistException(0, ExceptionsMessage.PartitionNotExist)
 
     def release(self, timeout=None, **kwargs):
@@ -222,8 +242,10 @@ class Partition:
             >>> partition.release()
         """
         conn = self._get_connection()
-        if conn.has_partition(self._collection.name, self._name):
-            return conn.release_partitions(self._collection.name, [self._name], timeout=timeout, **kwargs)
+        with self._deadline(timeout):
+            if self._has_partition(conn):
+                return conn.release_partitions(self._collection.name, [self._name], timeout=remaining_timeout(),
+                                               **kwargs)
         raise PartitionNotExistException(0, ExceptionsMessage.PartitionNotExist)
 
     def insert(self, data, timeout=None, **kwargs):
@@ -231,8 +253,10 @@ class Partition:
         Insert data into partition.
 
         :param data: The specified data to insert, the dimension of data needs to align with column
-                     number
-        :type  data: list-like(list, tuple) object or pandas.DataFrame
+                     number. A pyarrow RecordBatchReader is inserted batch by batch as in
+                     `Collection.insert`.
+        :type  data: list-like(list, tuple) object, pandas.DataFrame, pyarrow.Table,
+                     pyarrow.RecordBatch or pyarrow.RecordBatchReader
 
         :param timeout: An optional duration of time in seconds to allow for the RPC. When timeout
                         is set to None, client waits until server response or error occur
@@ -263,15 +287,24 @@ class Partition:
             >>> partition.num_entities
             10
         """
+        if is_arrow_reader(data):
+            return self._collection.insert(data, partition_name=self._name, timeout=timeout, **kwargs)
         conn = self._get_connection()
-        if conn.has_partition(self._collection.name, self._name) is False:
-            raise PartitionNotExistException(0, ExceptionsMessage.PartitionNotExist)
-        entities = Prepare.prepare_insert_data(data, self._collection.schema)
-        res = conn.insert(self._collection.name, entities=entities, ids=None,
-                          partition_name=self._name, timeout=timeout, orm=True, **kwargs)
+        with self._deadline(timeout):
+            if self._has_partition(conn) is False:
+                raise PartitionNotExistException(0, ExceptionsMessage.PartitionNotExist)
+            with span("insert.prepare") as prepare_span:
+                entities = self._collection._get_insert_plan().apply(data)
+                record_entities(prepare_span, entities)
+            with span("insert.rpc") as rpc_span:
+                record_entities(rpc_span, entities)
+                res = conn.insert(self._collection.name, entities=entities, ids=None,
+                                  partition_name=self._name, timeout=remaining_timeout(), orm=True, **kwargs)
+        self._collection._invalidate_results()
         if kwargs.get("_async", False):
             return MutationFuture(res)
-        return MutationResult(res)
+        with span("insert.result"):
+            return MutationResult(res)
 
     def search(self, data, anns_field, param, limit, expr=None, output_fields=None, timeout=None,
                **kwargs):
@@ -287,8 +320,8 @@ class Partition:
         :type  param: dict
         :param limit: The max number of returned record, we also called this parameter as topk.
         :type  limit: int
-        :param expr: The boolean expression used to filter attribute.
-        :type  expr: str
+        :param expr: The boolean expression used to filter attribute, a string or an `Expr`.
+        :type  expr: str or Expr
         :param output_fields: The fields to return in the search result, not supported now.
         :type  output_fields: list[str]
         :param timeout: An optional duration of time in seconds to allow for the RPC. When timeout
@@ -348,19 +381,25 @@ class Partition:
             >>> print(f"- Top1 hit id: {hits[0].id}, distance: {hits[0].distance}, score: {hits[0].score} ")
             - Top1 hit id: 8, distance: 0.10143111646175385, score: 0.10143111646175385
         """
+        if expr is not None:
+            expr = render_expr(expr, self._collection.schema)
         conn = self._get_connection()
-        res = conn.search_with_expression(self._collection.name, data, anns_field, param, limit,
-                                          expr, [self._name], output_fields, timeout, **kwargs)
+        with self._deadline(timeout), span("search.rpc") as rpc_span:
+            record_vectors(rpc_span, data)
+            res = conn.search_with_expression(self._collection.name, data, anns_field, param, limit,
+                                              expr, [self._name], output_fields, remaining_timeout(),
+                                              **kwargs)
         if kwargs.get("_async", False):
             return SearchFuture(res)
-        return SearchResult(res)
+        with span("search.result"):
+            return SearchResult(res)
 
     def query(self, expr, output_fields=None, timeout=None):
         """
         Query with a set of criteria, and results in a list of records that match the query exactly.
 
-        :param expr: The query expression
-        :type  expr: str
+        :param expr: The query expression, a string or an `Expr`.
+        :type  expr: str or Expr
 
         :param output_fields: A list of fields to return
         :type  output_fields: list[str]
@@ -406,6 +445,10 @@ class Partition:
             >>> print(f"- Query results: {res}")
             - Query results: [{'film_id': 0, 'film_date': 2000}, {'film_id': 1, 'film_date': 2001}]
         """
+        expr = render_expr(expr, self._collection.schema)
         conn = self._get_connection()
-        res = conn.query(self._collection.name, expr, output_fields, [self._name], timeout)
+        with self._deadline(timeout), span("query.rpc") as rpc_span:
+            res = conn.query(self._collection.name, expr, output_fields, [self._name], remaining_timeout())
+            if rpc_span.recording:
+                rpc_span.set_attribute(ATTR_ROWS, len(res))
         return res
@@ -9,65 +9,254 @@
 # is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
 # or implied. See the License for the specific language governing permissions and limitations under
 # the License.
-import copy
-
 import numpy
 import pandas
+from pandas.api.types import is_list_like
 
 from pymilvus_orm.exceptions import DataNotMatchException, DataTypeNotSupportException, ExceptionsMessage
+from pymilvus_orm.types import (
+    DataType,
+    infer_dtypes_of_column,
+    infer_vector_dim_of_column,
+    is_arrow_data,
+    is_arrow_reader,
+    is_vector_column_of,
+    map_arrow_type_to_datatype,
+)
+from pymilvus_orm.vectors import VectorArray, as_vector_matrix
 
+DEFAULT_INSERT_CONCURRENCY = 4
 
-class Prepare:
-    @classmethod
-    def prepare_insert_data(cls, data, schema):
-        if not isinstance(data, (list, tuple, pandas.DataFrame)):
-            raise DataTypeNotSupportException(0, ExceptionsMessage.DataTypeNotSupport)
 
-        fields = schema.fields
-        entities = []
-        raw_lengths = []
-        if isinstance(data, pandas.DataFrame):
-            if schema.auto_id:
-                if schema.primary_field.name in data:
-                    if len(fields) != len(data.columns):
-                        raise DataNotMatchException(0, ExceptionsMessage.FieldsNumInconsistent)
-                    if not data[schema.primary_field.name].isnull().all():
-                        raise DataNotMatchException(0, ExceptionsMessage.AutoIDWithData)
-                else:
-                    if len(fields) != len(data.columns)+1:
-                        raise DataNotMatchException(0, ExceptionsMessage.FieldsNumInconsistent)
+def _scalar_column(series):
+    return series.tolist()
+
+
+def _float_vector_column(series):
+    matrix = as_vector_matrix(series)
+    if matrix is None:
+        return series.tolist()
+    return VectorArray(matrix)
+
+
+def _arrow_column(column, dtype):
+    if column.null_count:
+        raise DataNotMatchException(0, ExceptionsMessage.ArrowNullValues)
+    if dtype == DataType.FLOAT_VECTOR:
+        matrix = as_vector_matrix(column)
+        if matrix is None:
+            raise DataNotMatchException(0, ExceptionsMessage.VectorDimInconsistent)
+        return VectorArray(matrix)
+    if dtype == DataType.BINARY_VECTOR:
+        return column.to_pylist()
+    return column.to_numpy(zero_copy_only=False).tolist()
+
+
+class InsertPlan:
+    """
+    The insert recipe of a schema, compiled once and applied to every insert.
+
+    It holds the order, names and types of the columns an insert must provide, the
+    vector dimensions, the auto-id primary field that is skipped and a converter per
+    DataFrame column, so each insert only checks the incoming columns against the compiled
+    types and dimensions, if asked to, and converts them, without inferring a schema from
+    the data.
+    Float vectors stored natively, as a `VectorArray`, an Arrow list column or a
+    2-D ndarray, are sent as one `VectorArray` without per-row objects. pyarrow Tables and
+    RecordBatches are read column by column, and their float vectors straight from the
+    Arrow buffers.
+
+    :param schema: The schema of the collection.
+    :type  schema: class `schema.CollectionSchema`
+    """
+    __slots__ = ("schema", "names", "dtypes", "dims", "auto_id_field", "num_fields", "converters")
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.auto_id_field = None
+        columns = []
+        for field in schema.fields:
+            if field.is_primary and field.auto_id:
+                self.auto_id_field = field.name
             else:
-                if len(fields) != len(data.columns):
-                    raise DataNotMatchException(0, ExceptionsMessage.FieldsNumInconsistent)
-            for i, field in enumerate(fields):
-                if field.is_primary and field.auto_id:
-                    continue
-                entities.append({"name": field.name,
-                                 "type": field.dtype,
-                                 "values": list(data[field.name])})
-                raw_lengths.append(len(data[field.name]))
-        else:
-            if schema.auto_id:
-                if len(data) + 1 != len(fields):
+                columns.append(field)
+        self.names = tuple(field.name for field in columns)
+        self.dtypes = tuple(field.dtype for field in columns)
+        self.dims = tuple(field.dim for field in columns)
+        self.num_fields = len(schema.fields)
+        self.converters = tuple(_float_vector_column if dtype == DataType.FLOAT_VECTOR else _scalar_column
+                                for dtype in self.dtypes)
+
+    def apply(self, data, check=False):
+        """
+        Converts column data into the entities sent by an insert request.
+
+        :param data: The columns in schema order, or a DataFrame, Table or RecordBatch with
+                     one column per field.
+        :type  data: list, tuple, pandas.DataFrame, pyarrow.Table or pyarrow.RecordBatch
+        :param check: Whether to check the types and vector dimensions of the columns
+                      against the schema.
+        :type  check: bool
+
+        :return list:
+            The entities, one dict with ``name``, ``type`` and ``values`` per column.
+
+        :raises DataNotMatchException: If ``check`` and a column does not match its field.
+        """
+        if isinstance(data, pandas.DataFrame):
+            return self._apply_dataframe(data, check)
+        if is_arrow_data(data) and not is_arrow_reader(data):
+            return self._apply_arrow(data, check)
+        if not isinstance(data, (list, tuple)):
+            raise DataTypeNotSupportException(0, ExceptionsMessage.DataTypeNotSupport)
+        return self._apply_columns(data, check)
+
+    def _apply_dataframe(self, data, check):
+        expected = self.num_fields
+        if self.auto_id_field is not None:
+            if self.auto_id_field in data:
+                if len(data.columns) != expected:
                     raise DataNotMatchException(0, ExceptionsMessage.FieldsNumInconsistent)
+                if not data[self.auto_id_field].isnull().all():
+                    raise DataNotMatchException(0, ExceptionsMessage.AutoIDWithData)
+                return self._entities(self._convert(data, check))
+            expected -= 1
+        if len(data.columns) != expected:
+            raise DataNotMatchException(0, ExceptionsMessage.FieldsNumInconsistent)
+        return self._entities(self._convert(data, check))
+
+    def _apply_arrow(self, data, check):
+        names = data.schema.names
+        expected = self.num_fields
+        if self.auto_id_field is not None:
+            if self.auto_id_field in names:
+                column = data.column(self.auto_id_field)
+                if column.null_count != len(column):
+                    raise DataNotMatchException(0, ExceptionsMessage.AutoIDWithData)
+            else:
+                expected -= 1
+        if len(names) != expected:
+            raise DataNotMatchException(0, ExceptionsMessage.FieldsNumInconsistent)
+        columns = []
+        for i, (name, dtype) in enumerate(zip(self.names, self.dtypes)):
+            index = data.schema.get_field_index(name)
+            if index < 0:
+                raise DataNotMatchException(0, ExceptionsMessage.TypeOfDataAndSchemaInconsistent)
+            arrow_type = data.schema.field(index).type
+            if check and map_arrow_type_to_datatype(arrow_type) != dtype:
+                raise DataNotMatchException(0, ExceptionsMessage.TypeOfDataAndSchemaInconsistent)
+            values = _arrow_column(data.column(index), dtype)
+            if check and dtype == DataType.FLOAT_VECTOR:
+                self._check_dim(i, values.vectors.shape[1], len(values))
+            elif check and dtype == DataType.BINARY_VECTOR:
+                self._check_dim(i, arrow_type.byte_width * 8, len(values))
+            columns.append(values)
+        return self._entities(columns)
 
-            tmp_fields = copy.deepcopy(fields)
-            for i, field in enumerate(tmp_fields):
-                if field.is_primary and field.auto_id:
-                    tmp_fields.pop(i)
+    def _convert(self, data, check):
+        columns = []
+        for i, (name, convert) in enumerate(zip(self.names, self.converters)):
+            if name not in data:
+                raise DataNotMatchException(0, ExceptionsMessage.TypeOfDataAndSchemaInconsistent)
+            column = data[name]
+            if check:
+                self._check_column(i, column)
+            columns.append(convert(column))
+        return columns
 
-            for i, field in enumerate(tmp_fields):
-                if isinstance(data[i], numpy.ndarray):
+    def _apply_columns(self, data, check):
+        if len(data) != len(self.names):
+            raise DataNotMatchException(0, ExceptionsMessage.FieldsNumInconsistent)
+        columns = list(data)
+        for i, values in enumerate(columns):
+            if isinstance(values, numpy.ndarray):
+                matrix = as_vector_matrix(values) if self.dtypes[i] == DataType.FLOAT_VECTOR else None
+                if matrix is None:
                     raise DataTypeNotSupportException(0, ExceptionsMessage.NdArrayNotSupport)
+                columns[i] = VectorArray(matrix)
+            elif not is_list_like(values):
+                raise DataTypeNotSupportException(0, ExceptionsMessage.DataTypeNotSupport)
+            if check:
+                self._check_column(i, columns[i])
+        return self._entities(columns)
+
+    def _check_column(self, i, column):
+        """
+        Checks that a column holds values of the type of its field, and vectors of its
+        dimension.
+        """
+        dtype = self.dtypes[i]
+        if dtype not in (DataType.FLOAT_VECTOR, DataType.BINARY_VECTOR):
+            if infer_dtypes_of_column(column) - {dtype}:
+                raise DataNotMatchException(0, ExceptionsMessage.TypeOfDataAndSchemaInconsistent)
+            return
+        if not is_vector_column_of(column, dtype):
+            raise DataNotMatchException(0, ExceptionsMessage.TypeOfDataAndSchemaInconsistent)
+        dim = infer_vector_dim_of_column(column)
+        if dim is None:
+            raise DataNotMatchException(0, ExceptionsMessage.VectorDimInconsistent)
+        self._check_dim(i, dim * 8 if dtype == DataType.BINARY_VECTOR else dim, len(column))
+
+    def _check_dim(self, i, dim, rows):
+        if rows and self.dims[i] is not None and dim != int(self.dims[i]):
+            raise DataNotMatchException(0, ExceptionsMessage.VectorDimNotMatch % (self.names[i], dim,
+                                                                                   int(self.dims[i])))
+
+    def _entities(self, columns):
+        if columns:
+            rows = len(columns[0])
+            for values in columns:
+                if len(values) != rows:
+                    raise DataNotMatchException(0, ExceptionsMessage.DataLengthsInconsistent)
+        return [{"name": name, "type": dtype, "values": values}
+                for name, dtype, values in zip(self.names, self.dtypes, columns)]
+
 
-                entities.append({
-                    "name": field.name,
-                    "type": field.dtype,
-                    "values": data[i]})
-                raw_lengths.append(len(data[i]))
+def group_rows(keys):
+    """
+    Groups the rows of an insert by key with one sort instead of a pass per key.
 
-        lengths = list(set(raw_lengths))
-        if len(lengths) > 1:
-            raise DataNotMatchException(0, ExceptionsMessage.DataLengthsInconsistent)
+    :param keys: The key of every row.
+    :type  keys: list or numpy.ndarray
 
-        return entities
+    :return tuple:
+        The distinct keys in sorted order, the row numbers of each key in input order, and
+        the permutation of all rows grouped by key.
+
+    :example:
+        >>> group_rows(["b", "a", "b"])
+        (['a', 'b'], [array([1]), array([0, 2])], array([1, 0, 2]))
+    """
+    keys = numpy.asarray(keys)
+    if keys.ndim != 1:
+        raise DataNotMatchException(0, ExceptionsMessage.DataLengthsInconsistent)
+    if len(keys) == 0:
+        return [], [], numpy.arange(0)
+    distinct, inverse = numpy.unique(keys, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    order = numpy.argsort(inverse, kind="stable")
+    bounds = numpy.cumsum(numpy.bincount(inverse, minlength=len(distinct)))[:-1]
+    return distinct.tolist(), numpy.split(order, bounds), order
+
+
+def take_entities(entities, rows):
+    """
+    Returns the entities of an insert restricted to ``rows``.
+    """
+    taken = []
+    for entity in entities:
+        values = entity["values"]
+        if isinstance(values, VectorArray):
+            values = values.take(rows)
+        else:
+            values = [values[i] for i in rows.tolist()]
+        taken.append({"name": entity["name"], "type": entity["type"], "values": values})
+    return taken
+
+
+class Prepare:
+    @classmethod
+    def prepare_insert_data(cls, data, schema):
+        if not isinstance(data, (list, tuple, pandas.DataFrame)) and not is_arrow_data(data):
+            raise DataTypeNotSupportException(0, ExceptionsMessage.DataTypeNotSupport)
+        return InsertPlan(schema).apply(data)
@@ -0,0 +1,243 @@
+# Copyright (C) 2019-2021 Zilliz. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+
+"""
+Lifecycle of time partitions: a partition per period, such as ``day_20261018``, created ahead
+of time, loaded while recent, released when older and dropped once expired.
+"""
+
+import datetime
+
+from .deadline import deadline, remaining_timeout
+from .utility import _run_many
+from .exceptions import InvalidArgumentException, ExceptionsMessage
+
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_BATCH_SIZE = 64
+RELEASE = "release"
+DROP = "drop"
+
+
+class RetentionPlan:
+    """
+    The partition operations one run of a `RetentionManager` does, each a list of names.
+
+    :ivar create: The partitions of upcoming periods to create.
+    :ivar load: The partitions of the load window and the upcoming ones.
+    :ivar release: The partitions older than the load window, released before the expired
+                   ones among them are dropped.
+    :ivar drop: The expired partitions to drop.
+    """
+
+    def __init__(self, create=(), load=(), release=(), drop=()):
+        self.create = list(create)
+        self.load = list(load)
+        self.release = list(release)
+        self.drop = list(drop)
+
+    def is_empty(self):
+        return not (self.create or self.load or self.release or self.drop)
+
+    def to_dict(self):
+        return {"create": self.create, "load": self.load, "release": self.release, "drop": self.drop}
+
+    def __repr__(self):
+        return f"RetentionPlan(create={self.create}, load={self.load}, release={self.release}, drop={self.drop})"
+
+
+class RetentionManager:
+    """
+    Keeps a sliding window of time partitions in a collection.
+
+    Every period has a partition named ``prefix`` followed by the start of the period
+    formatted with ``name_format``. Each `run`:
+
+    * creates the partitions of the current period and of the ``create_ahead`` next ones,
+    * loads the partitions of the last ``load_window`` periods and the upcoming ones, so
+      data inserted at rollover is searchable at once,
+    * releases the older partitions, bounding query node memory,
+    * releases or drops, per ``expire_action``, the partitions older than ``retain`` periods.
+
+    Creates and drops are sent ``max_concurrency`` at a time, loads and releases as batches
+    of up to ``batch_size`` partitions per request. Partitions whose names do not follow the
+    naming are never touched.
+
+    :param collection: The collection.
+    :type  collection: Collection
+    :param period: The time span of one partition.
+    :type  period: datetime.timedelta
+    :param prefix: The prefix of the partition names.
+    :type  prefix: str
+    :param name_format: The ``strftime`` format of the period start in partition names. It
+                        must be precise enough to tell periods apart.
+    :type  name_format: str
+    :param create_ahead: The number of upcoming periods whose partitions exist in advance.
+    :type  create_ahead: int
+    :param load_window: The number of recent periods, the current one included, kept loaded.
+    :type  load_window: int
+    :param retain: The number of recent periods kept, None to keep all.
+    :type  retain: int
+    :param expire_action: What to do with expired partitions, "drop" or "release".
+    :type  expire_action: str
+    :param max_concurrency: The number of requests in flight.
+    :type  max_concurrency: int
+    :param batch_size: The number of partitions loaded or released by one request.
+    :type  batch_size: int
+
+    :example:
+        >>> import datetime
+        >>> from pymilvus_orm.retention import RetentionManager
+        >>> manager = RetentionManager(collection, datetime.timedelta(days=1), prefix="day_",
+        ...                            load_window=7, retain=30)
+        >>> manager.run(dry_run=True)
+        RetentionPlan(create=['day_20261019', 'day_20261020'], load=[...], release=[], drop=['day_20260918'])
+        >>> manager.run()
+    """
+
+    def __init__(self, collection, period, prefix="", name_format="%Y%m%d", create_ahead=1, load_window=1,
+                 retain=None, expire_action=DROP, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                 batch_size=DEFAULT_BATCH_SIZE):
+        if not isinstance(period, datetime.timedelta) or period <= datetime.timedelta(0):
+            raise InvalidArgumentException(0, ExceptionsMessage.RetentionPeriod)
+        if load_window < 1 or create_ahead < 0 or (retain is not None and retain < load_window):
+            raise InvalidArgumentException(0, ExceptionsMessage.RetentionWindow)
+        if expire_action not in (DROP, RELEASE):
+            raise InvalidArgumentException(0, ExceptionsMessage.RetentionAction % expire_action)
+        self.collection = collection
+        self.period = period
+        self.prefix = prefix
+        self.name_format = name_format
+        self.create_ahead = create_ahead
+        self.load_window = load_window
+        self.retain = retain
+        self.expire_action = expire_action
+        self.max_concurrency = max_concurrency
+        self.batch_size = batch_size
+
+    @staticmethod
+    def _epoch(moment):
+        return datetime.datetime(1970, 1, 1, tzinfo=moment.tzinfo)
+
+    def period_index(self, moment):
+        """
+        Returns the number of the period ``moment`` falls in, counted from the Unix epoch.
+        """
+        return (moment - self._epoch(moment)) // self.period
+
+    def partition_name(self, index, tzinfo=None):
+        """
+        Returns the name of the partition of period ``index``.
+        """
+        start = datetime.datetime(1970, 1, 1, tzinfo=tzinfo) + index * self.period
+        return self.prefix + start.strftime(self.name_format)
+
+    def _parse(self, name, tzinfo):
+        if not name.startswith(self.prefix):
+            return None
+        try:
+            start = datetime.datetime.strptime(name[len(self.prefix):], self.name_format)
+        except ValueError:
+            return None
+        start = start.replace(tzinfo=tzinfo)
+        index = self.period_index(start)
+        return index if self.partition_name(index, tzinfo) == name else None
+
+    def plan(self, now=None, partition_names=None):
+        """
+        Returns the operations a run at ``now`` does, without doing them.
+
+        :param now: The current time, ``datetime.datetime.now()`` if None. A timezone-aware
+                    time lays the periods out in its timezone.
+        :type  now: datetime.datetime
+        :param partition_names: The existing partitions, listed from the server if None.
+        :type  partition_names: list[str]
+
+        :return RetentionPlan:
+        """
+        now = datetime.datetime.now() if now is None else now
+        if partition_names is None:
+            partition_names = self._list_partitions()
+        tzinfo = now.tzinfo
+        current = self.period_index(now)
+        existing = {}
+        for name in partition_names:
+            index = self._parse(name, tzinfo)
+            if index is not None:
+                existing[index] = name
+
+        plan = RetentionPlan()
+        for index in range(current, current + self.create_ahead + 1):
+            if index not in existing:
+                plan.create.append(self.partition_name(index, tzinfo))
+        hot = current - self.load_window + 1
+        expired = None if self.retain is None else current - self.retain + 1
+        for index in range(hot, current + self.create_ahead + 1):
+            if index in existing:
+                plan.load.append(existing[index])
+            elif index >= current:
+                plan.load.append(self.partition_name(index, tzinfo))
+        for index in sorted(existing):
+            if index >= hot:
+                continue
+            plan.release.append(existing[index])
+            if expired is not None and index < expired and self.expire_action == DROP:
+                plan.drop.append(existing[index])
+        return plan
+
+    def run(self, now=None, dry_run=False, timeout=None):
+        """
+        Plans and does one run. Schedule it at least once per period.
+
+        :param dry_run: Whether to only return the plan.
+        :type  dry_run: bool
+        :param timeout: The time in seconds to allow for the whole run.
+        :type  timeout: float
+
+        :return RetentionPlan:
+            The operations done, or that would be done with ``dry_run``.
+
+        :raises BaseException: The first error of a failed operation. The operations of the
+                               following steps are not done.
+        """
+        with deadline(timeout):
+            plan = self.plan(now)
+            if not dry_run:
+                self.apply(plan)
+        return plan
+
+    def apply(self, plan):
+        """
+        Does the operations of ``plan``: creates first, then loads, releases and drops.
+        """
+        conn = self.collection._get_connection()
+        name = self.collection.name
+
+        def each(names, operation):
+            calls = [(partition, lambda partition=partition: operation(partition)) for partition in names]
+            _run_many(calls, self.max_concurrency, None, None)
+
+        def batched(names, operation):
+            batches = [names[i:i + self.batch_size] for i in range(0, len(names), self.batch_size)]
+            calls = [(i, lambda batch=batch: operation(batch)) for i, batch in enumerate(batches)]
+            _run_many(calls, self.max_concurrency, None, None)
+
+        each(plan.create, lambda partition: conn.create_partition(name, partition, timeout=remaining_timeout()))
+        batched(plan.load, lambda batch: conn.load_partitions(name, batch, timeout=remaining_timeout()))
+        batched(plan.release, lambda batch: conn.release_partitions(name, batch, timeout=remaining_timeout()))
+        each(plan.drop, lambda partition: conn.drop_partition(name, partition, timeout=remaining_timeout()))
+        if plan.create or plan.drop:
+            self.collection._invalidate_metadata()
+        return plan
+
+    def _list_partitions(self):
+        conn = self.collection._get_connection()
+        return conn.list_partitions(self.collection.name, timeout=remaining_timeout())
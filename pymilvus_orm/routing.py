@@ -0,0 +1,107 @@
+# Copyright (C) 2019-2021 Zilliz. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+
+"""
+Partition pruning: rules that map the values a filter allows for a field to the partitions
+that can hold matching entities, so that searches and queries skip the other partitions.
+
+:example:
+    >>> from pymilvus_orm.routing import ValueRule, RangeRule
+    >>> collection.add_partition_rule(ValueRule("day", "day_{}"))
+    >>> collection.query("day == 20261018 && film_id > 10")   # only searches partition day_20261018
+"""
+
+
+class PartitionRule:
+    """
+    Maps the values a filter allows for ``field`` to the partitions that can hold matching
+    entities. Subclasses implement `partitions`.
+
+    :param field: The name of the field the partitions are decided by.
+    :type  field: str
+    """
+
+    def __init__(self, field):
+        self.field = field
+
+    def partitions(self, constraint):
+        """
+        Returns the names of the partitions that can hold entities allowed by ``constraint``,
+        or None if the rule cannot tell.
+
+        :param constraint: The values of the field the filter allows.
+        :type  constraint: pymilvus_orm.expression.Constraint
+
+        :return set[str]:
+        """
+        raise NotImplementedError
+
+    def __repr__(self):
+        return f"<{type(self).__name__}: {self.field}>"
+
+
+class ValueRule(PartitionRule):
+    """
+    One partition per value of the field, such as a partition per tenant or per day, named
+    by formatting the value, the way `Collection.insert` names them with ``partition_by``.
+
+    :param name: A format string such as ``"day_{}"``, or a callable returning the partition
+                 name of a value.
+    :type  name: str or callable
+    """
+
+    def __init__(self, field, name="{}"):
+        super().__init__(field)
+        self.name = name.format if isinstance(name, str) else name
+
+    def partitions(self, constraint):
+        if constraint.values is None:
+            return None
+        return {self.name(value) for value in constraint.values}
+
+
+class RangeRule(PartitionRule):
+    """
+    Partitions each holding a range of the field, such as a partition per month.
+
+    :param ranges: The half-open range ``(low, high)`` of every partition, by name. Either end
+                   can be None when unbounded.
+    :type  ranges: dict
+    """
+
+    def __init__(self, field, ranges):
+        super().__init__(field)
+        self.ranges = dict(ranges)
+
+    def partitions(self, constraint):
+        return {name for name, (low, high) in self.ranges.items() if constraint.overlaps(low, high)}
+
+
+def route(rules, expr):
+    """
+    Returns the names of the partitions that can hold entities matching ``expr`` under
+    ``rules``, or None if no rule applies. When several rules apply, a partition must be
+    allowed by all of them.
+
+    :param expr: The filter.
+    :type  expr: pymilvus_orm.expression.Expr
+    """
+    names = None
+    for rule in rules:
+        constraint = expr.constraint(rule.field)
+        if constraint is None:
+            continue
+        allowed = rule.partitions(constraint)
+        if allowed is None:
+            continue
+        names = set(allowed) if names is None else names & set(allowed)
+    return names
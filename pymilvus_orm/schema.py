@@ -10,14 +10,20 @@
 # or implied. See the License for the specific language governing permissions and limitations under
 # the License.
 
-import copy
 import json
 from typing import List
 import pandas
 from pandas.api.types import is_list_like
 
 from pymilvus_orm.constants import VECTOR_COMMON_TYPE_PARAMS
-from pymilvus_orm.types import DataType, map_numpy_dtype_to_datatype, infer_dtype_bydata
+from pymilvus_orm.types import (
+    DataType,
+    map_numpy_dtype_to_datatype,
+    map_arrow_type_to_datatype,
+    infer_dtype_bydata,
+    is_arrow_data,
+)
+from pymilvus_orm.vectors import as_vector_matrix
 from pymilvus_orm.exceptions import (
     CannotInferSchemaException,
     DataTypeNotSupportException,
@@ -30,44 +36,76 @@ from pymilvus_orm.exceptions import (
 
 
 class CollectionSchema:
+    """
+    Schemas are immutable and hashable. Equality and hashing use a fingerprint computed
+    once at construction, so schemas can be compared and shared without copying.
+    """
+    __slots__ = ("_fields", "_primary_field", "_auto_id", "_description", "_kwargs", "_fingerprint", "_hash")
+
     def __init__(self, fields, description="", **kwargs):
         if not isinstance(fields, list):
             raise FieldsTypeException(0, ExceptionsMessage.FieldsType)
-        self._fields = [copy.deepcopy(field) for field in fields]
+        fields = list(fields)
         primary_field = kwargs.get("primary_field", None)
-        for field in self._fields:
+        for i, field in enumerate(fields):
             if not isinstance(field, FieldSchema):
                 raise FieldTypeException(0, ExceptionsMessage.FieldType)
-            if primary_field == field.name:
-                field.is_primary = True
-        self._primary_field = None
-        for field in self._fields:
+            if primary_field == field.name and not field.is_primary:
+                fields[i] = field._replace(is_primary=True)
+        primary_index = None
+        for i, field in enumerate(fields):
             if field.is_primary:
                 if primary_field is not None and primary_field != field.name:
                     raise PrimaryKeyException(0, ExceptionsMessage.PrimaryKeyOnlyOne)
-                self._primary_field = field
+                primary_index = i
                 primary_field = field.name
 
-        if self._primary_field is None:
+        if primary_index is None:
             raise PrimaryKeyException(0, ExceptionsMessage.PrimaryKeyNotExist)
 
-        if self._primary_field.dtype not in [DataType.INT64]:
+        primary = fields[primary_index]
+        if primary.dtype not in [DataType.INT64]:
             raise PrimaryKeyException(0, ExceptionsMessage.PrimaryKeyType)
 
-        self._auto_id = kwargs.get("auto_id", None)
+        auto_id = kwargs.get("auto_id", None)
         if "auto_id" in kwargs:
-            if not isinstance(self._auto_id, bool):
+            if not isinstance(auto_id, bool):
                 raise AutoIDException(0, ExceptionsMessage.AutoIDType)
-            if self._primary_field.auto_id is not None and self._primary_field.auto_id != self._auto_id:
+            if primary.auto_id is not None and primary.auto_id != auto_id:
                 raise AutoIDException(0, ExceptionsMessage.AutoIDInconsistent)
-            self._primary_field.auto_id = self._auto_id
         else:
-            if self._primary_field.auto_id is None:
-                self._primary_field.auto_id = False
-            self._auto_id = self._primary_field.auto_id
+            auto_id = bool(primary.auto_id)
+        if primary.auto_id is not auto_id:
+            primary = primary._replace(auto_id=auto_id)
+            fields[primary_index] = primary
+
+        _set = object.__setattr__
+        _set(self, "_fields", tuple(fields))
+        _set(self, "_primary_field", primary)
+        _set(self, "_auto_id", auto_id)
+        _set(self, "_description", description)
+        _set(self, "_kwargs", dict(kwargs))
+        _set(self, "_fingerprint", (auto_id, description, tuple(f._fingerprint for f in self._fields)))
+        _set(self, "_hash", hash(self._fingerprint))
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, key):
+        raise AttributeError(f"{type(self).__name__} is immutable")
 
-        self._description = description
-        self._kwargs = copy.deepcopy(kwargs)
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memodict=None):
+        return self
+
+    def __reduce__(self):
+        return self.__class__._from_fields, (list(self._fields), self._description, self._kwargs)
+
+    @classmethod
+    def _from_fields(cls, fields, description, kwargs):
+        return cls(fields, description, **kwargs)
 
     def __repr__(self):
         return json.dumps(self.to_dict())
@@ -76,13 +114,20 @@ class CollectionSchema:
         return str(json.dumps(self.to_dict()))
 
     def __len__(self):
-        return len(self.fields)
+        return len(self._fields)
 
     def __eq__(self, other):
         """
         The order of the fields of schema must be consistent.
         """
-        return self.to_dict() == other.to_dict()
+        if self is other:
+            return True
+        if not isinstance(other, CollectionSchema):
+            return False
+        return self._hash == other._hash and self._fingerprint == other._fingerprint
+
+    def __hash__(self):
+        return self._hash
 
     @classmethod
     def construct_from_dict(cls, raw):
@@ -110,7 +155,7 @@ class CollectionSchema:
         >>> schema.fields
         [<pymilvus_orm.schema.FieldSchema object at 0x7fd3716ffc50>]
         """
-        return self._fields
+        return list(self._fields)
 
     @property
     def description(self):
@@ -160,48 +205,69 @@ class CollectionSchema:
 
 
 class FieldSchema:
+    __slots__ = ("_name", "_dtype", "_description", "_type_params", "_is_primary", "_auto_id", "_fingerprint",
+                 "_hash")
+
     def __init__(self, name, dtype, description="", **kwargs):
-        self.name = name
         try:
             DataType(dtype)
         except ValueError:
             raise DataTypeNotSupportException(0, ExceptionsMessage.FieldDtype) from None
         if dtype == DataType.UNKNOWN:
             raise DataTypeNotSupportException(0, ExceptionsMessage.FieldDtype)
-        self._dtype = dtype
-        self._description = description
-        self._type_params = {}
-        self._kwargs = copy.deepcopy(kwargs)
         if not isinstance(kwargs.get("is_primary", False), bool):
             raise PrimaryKeyException(0, ExceptionsMessage.IsPrimaryType)
-        self.is_primary = kwargs.get("is_primary", False)
-        self.auto_id = kwargs.get("auto_id", None)
+        is_primary = kwargs.get("is_primary", False)
+        auto_id = kwargs.get("auto_id", None)
         if "auto_id" in kwargs:
-            if not isinstance(self.auto_id, bool):
+            if not isinstance(auto_id, bool):
                 raise AutoIDException(0, ExceptionsMessage.AutoIDType)
-            if not self.is_primary and self.auto_id:
+            if not is_primary and auto_id:
                 raise PrimaryKeyException(0, ExceptionsMessage.AutoIDOnlyOnPK)
 
-        self._parse_type_params()
+        _set = object.__setattr__
+        _set(self, "_name", name)
+        _set(self, "_dtype", dtype)
+        _set(self, "_description", description)
+        _set(self, "_type_params", self._parse_type_params(dtype, kwargs))
+        _set(self, "_is_primary", is_primary)
+        _set(self, "_auto_id", auto_id)
+        _set(self, "_fingerprint", (name, description, int(dtype), tuple(sorted(self._type_params.items())),
+                                    is_primary, auto_id if is_primary else None))
+        _set(self, "_hash", hash(self._fingerprint))
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, key):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __copy__(self):
+        return self
 
     def __deepcopy__(self, memodict=None):
-        if memodict is None:
-            memodict = {}
-        return self.construct_from_dict(self.to_dict())
-
-    def _parse_type_params(self):
-        # update self._type_params according to self._kwargs
-        if self._dtype not in (DataType.BINARY_VECTOR, DataType.FLOAT_VECTOR):
-            return
-        if not self._kwargs:
-            return
+        return self
+
+    def __reduce__(self):
+        return self.__class__.construct_from_dict, (self.to_dict(),)
+
+    def _replace(self, **changes):
+        """
+        Returns a copy of the field with ``is_primary`` or ``auto_id`` replaced.
+        """
+        kwargs = dict(self._type_params)
+        kwargs["is_primary"] = changes.get("is_primary", self._is_primary)
+        auto_id = changes.get("auto_id", self._auto_id)
+        if auto_id is not None:
+            kwargs["auto_id"] = auto_id
+        return FieldSchema(self._name, self._dtype, self._description, **kwargs)
+
+    @staticmethod
+    def _parse_type_params(dtype, kwargs):
         # currently only support ndim
-        if self._kwargs:
-            for k in VECTOR_COMMON_TYPE_PARAMS:
-                if k in self._kwargs:
-                    if self._type_params is None:
-                        self._type_params = {}
-                    self._type_params[k] = self._kwargs[k]
+        if dtype not in (DataType.BINARY_VECTOR, DataType.FLOAT_VECTOR):
+            return {}
+        return {k: kwargs[k] for k in VECTOR_COMMON_TYPE_PARAMS if k in kwargs}
 
     @classmethod
     def construct_from_dict(cls, raw):
@@ -214,25 +280,47 @@ class FieldSchema:
 
     def to_dict(self):
         _dict = dict()
-        _dict["name"] = self.name
+        _dict["name"] = self._name
         _dict["description"] = self._description
-        _dict["type"] = self.dtype
+        _dict["type"] = self._dtype
         if self._type_params:
-            _dict["params"] = copy.deepcopy(self.params)
-        if self.is_primary:
+            _dict["params"] = dict(self._type_params)
+        if self._is_primary:
             _dict["is_primary"] = True
-            _dict["auto_id"] = self.auto_id
+            _dict["auto_id"] = self._auto_id
         return _dict
 
     def __getattr__(self, item):
-        if self._type_params and item in self._type_params:
-            return self._type_params[item]
-        return None
+        # only reached for names that are not slots or properties, e.g. ``field.dim``
+        if item.startswith("__"):
+            raise AttributeError(item)
+        try:
+            type_params = object.__getattribute__(self, "_type_params")
+        except AttributeError:
+            return None
+        return type_params.get(item, None)
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, FieldSchema):
             return False
-        return self.to_dict() == other.to_dict()
+        return self._hash == other._hash and self._fingerprint == other._fingerprint
+
+    def __hash__(self):
+        return self._hash
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def is_primary(self):
+        return self._is_primary
+
+    @property
+    def auto_id(self):
+        return self._auto_id
 
     @property
     def description(self):
@@ -269,7 +357,7 @@ class FieldSchema:
         >>> fvec_field.params
         {'dim': 128}
         """
-        return self._type_params
+        return dict(self._type_params)
 
     @property
     def dtype(self):
@@ -279,6 +367,8 @@ class FieldSchema:
 def parse_fields_from_data(datas):
     if isinstance(datas, pandas.DataFrame):
         return parse_fields_from_dataframe(datas)
+    if is_arrow_data(datas):
+        return parse_fields_from_arrow(datas)
     fields = []
     if not isinstance(datas, list):
         raise DataTypeNotSupportException(0, ExceptionsMessage.DataTypeNotSupport)
@@ -292,37 +382,57 @@ def parse_fields_from_data(datas):
 
 
 def parse_fields_from_dataframe(dataframe) -> List[FieldSchema]:
+    """
+    Infers the fields of a DataFrame from the column dtypes. Vector columns stored natively
+    take their dimension from the vector matrix, other object columns are inferred from
+    their first element, read without materializing the row.
+    """
     if not isinstance(dataframe, pandas.DataFrame):
         return None
-    d_types = list(dataframe.dtypes)
-    data_types = list(map(map_numpy_dtype_to_datatype, d_types))
-    col_names = list(dataframe.columns)
+    fields = []
+    for i, (name, d_type) in enumerate(dataframe.dtypes.items()):
+        dtype = map_numpy_dtype_to_datatype(d_type)
+        type_params = {}
+        matrix = as_vector_matrix(dataframe.iloc[:, i]) if dtype == DataType.UNKNOWN else None
+        if matrix is not None:
+            dtype = DataType.FLOAT_VECTOR
+            type_params['dim'] = matrix.shape[1]
+        elif dtype == DataType.UNKNOWN:
+            if len(dataframe) == 0:
+                raise CannotInferSchemaException(0, ExceptionsMessage.DataFrameInvalid)
+            value = dataframe.iat[0, i]
+            dtype = infer_dtype_bydata(value)
+            if dtype == DataType.BINARY_VECTOR:
+                type_params['dim'] = len(value) * 8
+            elif dtype == DataType.FLOAT_VECTOR:
+                type_params['dim'] = len(value)
+        if dtype == DataType.UNKNOWN:
+            raise CannotInferSchemaException(0, ExceptionsMessage.DataFrameInvalid)
+        fields.append(FieldSchema(name, dtype, **type_params))
 
-    column_params_map = {}
+    return fields
 
-    if DataType.UNKNOWN in data_types:
-        if len(dataframe) == 0:
-            raise CannotInferSchemaException(0, ExceptionsMessage.DataFrameInvalid)
-        values = dataframe.head(1).values[0]
-        for i, dtype in enumerate(data_types):
-            if dtype == DataType.UNKNOWN:
-                new_dtype = infer_dtype_bydata(values[i])
-                if new_dtype in (DataType.BINARY_VECTOR, DataType.FLOAT_VECTOR):
-                    vector_type_params = {}
-                    if new_dtype == DataType.BINARY_VECTOR:
-                        vector_type_params['dim'] = len(values[i]) * 8
-                    else:
-                        vector_type_params['dim'] = len(values[i])
-                    column_params_map[col_names[i]] = vector_type_params
-                data_types[i] = new_dtype
-
-    if DataType.UNKNOWN in data_types:
-        raise CannotInferSchemaException(0, ExceptionsMessage.DataFrameInvalid)
 
+def parse_fields_from_arrow(data) -> List[FieldSchema]:
+    """
+    Infers the fields of a pyarrow Table or RecordBatch from its Arrow schema. Fixed-size
+    lists take their dimension from the type, variable-size lists from the vector matrix.
+    """
     fields = []
-    for name, dtype in zip(col_names, data_types):
-        type_params = column_params_map.get(name, {})
-        field_schema = FieldSchema(name, dtype, **type_params)
-        fields.append(field_schema)
-
+    for i, field in enumerate(data.schema):
+        dtype = map_arrow_type_to_datatype(field.type)
+        type_params = {}
+        if dtype == DataType.FLOAT_VECTOR:
+            dim = getattr(field.type, "list_size", None)
+            if dim is None:
+                matrix = as_vector_matrix(data.column(i))
+                if matrix is None:
+                    raise CannotInferSchemaException(0, ExceptionsMessage.VectorDimInconsistent)
+                dim = matrix.shape[1]
+            type_params['dim'] = dim
+        elif dtype == DataType.BINARY_VECTOR:
+            type_params['dim'] = field.type.byte_width * 8
+        elif dtype == DataType.UNKNOWN:
+            raise CannotInferSchemaException(0, ExceptionsMessage.DataTypeNotSupport)
+        fields.append(FieldSchema(field.name, dtype, **type_params))
     return fields
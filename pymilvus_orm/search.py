@@ -264,3 +264,66 @@ class SearchResult:
 
     def on_result(self, res):
         return Hits(res)
+
+
+class _EmptyHits:
+    """
+    The hits of a query that cannot match any entity, answered without a request.
+    """
+    ids = ()
+    distances = ()
+
+    def __len__(self):
+        return 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        raise StopIteration()
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return []
+        raise IndexError("Index out of range")
+
+
+def _empty_query_result(nq):
+    """
+    Returns a query result of ``nq`` queries without hits.
+    """
+    return _QueryResultSlice([_EmptyHits()] * nq, 0, nq)
+
+
+class _QueryResultSlice:
+    """
+    The queries ``[start, stop)`` of a query result, seen as a query result of their own.
+    """
+
+    def __init__(self, query_result, start, stop):
+        self._qs = query_result
+        self._start = start
+        self._stop = stop
+        self._index = 0
+
+    def __len__(self):
+        return self._stop - self._start
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._index < len(self):
+            self._index += 1
+            return self[self._index - 1]
+        self._index = 0
+        raise StopIteration()
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self[i] for i in range(*item.indices(len(self)))]
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError("Index out of range")
+        return self._qs[self._start + item]
@@ -0,0 +1,267 @@
+# Copyright (C) 2019-2021 Zilliz. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+
+"""
+An approximate search result cache: a query vector close enough to a recently searched one
+is answered with the hits of that search.
+"""
+
+import copy
+import heapq
+import itertools
+import json
+import threading
+import time
+
+import numpy
+
+from .exceptions import InvalidMetricTypeException, InvalidArgumentException, ExceptionsMessage
+
+LRU = "lru"
+LFU = "lfu"
+
+DEFAULT_MAX_ENTRIES = 10000
+
+
+class _Bucket:
+    """
+    The cached query vectors of one search key, rows of a float32 matrix grown by doubling
+    from a single row, as most keys only ever hold a few vectors. Every vector has an entry
+    id that stays the same when rows are moved by `remove`.
+    """
+
+    def __init__(self, dim):
+        self.vectors = numpy.empty((1, dim), dtype=numpy.float32)
+        self.norms = numpy.empty(1, dtype=numpy.float32)
+        self.stored = numpy.empty(1, dtype=numpy.float64)
+        self.counts = numpy.empty(1, dtype=numpy.int64)
+        self.hits = []
+        self.ids = []
+        self.rows = {}
+        self.size = 0
+
+    def append(self, entry_id, vector, hits, now):
+        if self.size == len(self.vectors):
+            for name in ("vectors", "norms", "stored", "counts"):
+                array = getattr(self, name)
+                grown = numpy.empty((2 * len(array),) + array.shape[1:], dtype=array.dtype)
+                grown[:self.size] = array[:self.size]
+                setattr(self, name, grown)
+        row = self.size
+        self.vectors[row] = vector
+        self.norms[row] = vector @ vector
+        self.stored[row] = now
+        self.counts[row] = 0
+        self.hits.append(hits)
+        self.ids.append(entry_id)
+        self.rows[entry_id] = row
+        self.size += 1
+
+    def remove(self, entry_id):
+        row = self.rows.pop(entry_id)
+        last = self.size - 1
+        for array in (self.vectors, self.norms, self.stored, self.counts):
+            array[row] = array[last]
+        self.hits[row] = self.hits[last]
+        self.ids[row] = self.ids[last]
+        if row != last:
+            self.rows[self.ids[row]] = row
+        self.hits.pop()
+        self.ids.pop()
+        self.size = last
+
+
+class SemanticSearchCache:
+    """
+    Caches the hits of single query vectors per search key, the ``anns_field``, ``param``,
+    ``limit``, ``expr``, ``partition_names`` and ``output_fields`` of the search, and answers a
+    query vector from the cache when a cached vector of the same key is within ``threshold``.
+
+    All cached vectors of a key are kept in one float32 matrix, so the nearest cached vector
+    of every query of a search is found with one matrix product. The eviction order of all
+    vectors is kept in one heap, updated lazily when a vector is used, so a store into a full
+    cache pops the victim instead of scanning every key.
+
+    Created by `collection.Collection.enable_search_cache`.
+
+    :param threshold: The largest squared L2 distance, for ``L2``, or the smallest inner
+                      product, for ``IP``, at which a cached vector answers a query.
+    :type  threshold: float
+    :param metric_type: ``L2`` or ``IP``.
+    :type  metric_type: str
+    :param max_entries: The number of query vectors cached over all keys.
+    :type  max_entries: int
+    :param policy: The eviction policy once ``max_entries`` is reached, ``lru`` evicts the
+                   vector unused the longest, ``lfu`` the one with the fewest hits, and of
+                   those the one unused the longest.
+    :type  policy: str
+    :param ttl: The seconds a cached result is used for, None to keep it until evicted.
+    :type  ttl: float
+    """
+
+    def __init__(self, threshold, metric_type="L2", max_entries=DEFAULT_MAX_ENTRIES, policy=LRU, ttl=None):
+        if metric_type not in ("L2", "IP"):
+            raise InvalidMetricTypeException(0, ExceptionsMessage.MetricTypeNotSupport % metric_type)
+        if policy not in (LRU, LFU):
+            raise InvalidArgumentException(0, ExceptionsMessage.CachePolicyNotSupport % policy)
+        self.threshold = threshold
+        self.metric_type = metric_type
+        self.max_entries = max_entries
+        self.policy = policy
+        self.ttl = ttl
+        self._buckets = {}
+        self._entries = 0
+        # the rank and key of every cached vector by entry id, and a heap of
+        # ``(rank, entry_id, key)`` holding stale ranks until they are popped
+        self._ranks = {}
+        self._heap = []
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.hits = 0
+        self.saved_rpcs = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(anns_field, param, limit, expr, partition_names, output_fields):
+        """
+        Returns the key of the searches whose results are interchangeable.
+        """
+        return (anns_field, json.dumps(param, sort_keys=True, default=str), limit, expr,
+                tuple(partition_names or ()), tuple(output_fields or ()))
+
+    @staticmethod
+    def as_matrix(data):
+        """
+        Returns the query vectors as a float32 matrix, or None if they are not float vectors.
+        """
+        try:
+            matrix = numpy.asarray(data, dtype=numpy.float32)
+        except (TypeError, ValueError):
+            return None
+        return matrix if matrix.ndim == 2 and len(matrix) else None
+
+    def _nearest(self, bucket, queries, now):
+        size = bucket.size
+        scores = queries @ bucket.vectors[:size].T
+        if self.metric_type == "L2":
+            scores = bucket.norms[:size] - 2 * scores + numpy.einsum("ij,ij->i", queries, queries)[:, None]
+            if self.ttl is not None:
+                scores[:, bucket.stored[:size] < now - self.ttl] = numpy.inf
+            rows = scores.argmin(axis=1)
+            matched = scores[numpy.arange(len(queries)), rows] <= self.threshold
+        else:
+            if self.ttl is not None:
+                scores[:, bucket.stored[:size] < now - self.ttl] = -numpy.inf
+            rows = scores.argmax(axis=1)
+            matched = scores[numpy.arange(len(queries)), rows] >= self.threshold
+        return rows, matched
+
+    def lookup(self, key, queries):
+        """
+        Looks the queries up in the cache.
+
+        :param queries: The query vectors, see `as_matrix`.
+        :type  queries: numpy.ndarray
+
+        :return tuple:
+            The cached hits of every query, None where missing, and the indices of the
+            missing queries.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self.lookups += len(queries)
+            bucket = self._buckets.get(key)
+            if bucket is None or bucket.size == 0 or bucket.vectors.shape[1] != queries.shape[1]:
+                return [None] * len(queries), list(range(len(queries)))
+            rows, matched = self._nearest(bucket, queries, now)
+            found, missing = [], []
+            for i, (row, match) in enumerate(zip(rows, matched)):
+                if match:
+                    bucket.counts[row] += 1
+                    self._rank(bucket.ids[row], key, bucket.counts[row], now)
+                    found.append(copy.copy(bucket.hits[row]))
+                else:
+                    found.append(None)
+                    missing.append(i)
+            self.hits += len(queries) - len(missing)
+            if not missing:
+                self.saved_rpcs += 1
+            return found, missing
+
+    def store(self, key, vector, hits):
+        """
+        Caches the hits of a query vector, evicting another vector if the cache is full.
+        """
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is not None and bucket.vectors.shape[1] != len(vector):
+                self._entries -= bucket.size
+                for entry_id in bucket.ids:
+                    del self._ranks[entry_id]
+                del self._buckets[key]
+            while self._entries >= self.max_entries and self._entries:
+                self._evict()
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = _Bucket(len(vector))
+            entry_id = next(self._ids)
+            bucket.append(entry_id, vector, copy.copy(hits), now)
+            self._rank(entry_id, key, 0, now)
+            self._entries += 1
+
+    def _rank(self, entry_id, key, count, used):
+        rank = (used,) if self.policy == LRU else (int(count), used)
+        self._ranks[entry_id] = (rank, key)
+        heapq.heappush(self._heap, (rank, entry_id, key))
+        if len(self._heap) > 2 * len(self._ranks) + 64:
+            self._heap = [(rank, entry_id, key) for entry_id, (rank, key) in self._ranks.items()]
+            heapq.heapify(self._heap)
+
+    def _evict(self):
+        while True:
+            rank, entry_id, key = heapq.heappop(self._heap)
+            current = self._ranks.get(entry_id)
+            if current is not None and current[0] == rank:
+                break
+        del self._ranks[entry_id]
+        victim = self._buckets[key]
+        victim.remove(entry_id)
+        if not victim.size:
+            del self._buckets[key]
+        self._entries -= 1
+        self.evictions += 1
+
+    def clear(self):
+        """
+        Drops all cached results, to be called once the collection changed.
+        """
+        with self._lock:
+            self._buckets.clear()
+            self._ranks.clear()
+            self._heap = []
+            self._entries = 0
+
+    def stats(self):
+        """
+        Returns the query vectors looked up, the ones answered from the cache and its hit rate,
+        the search requests saved, the vectors cached and the ones evicted.
+        """
+        return {
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.lookups if self.lookups else 0.0,
+            "saved_rpcs": self.saved_rpcs,
+            "entries": self._entries,
+            "evictions": self.evictions,
+        }
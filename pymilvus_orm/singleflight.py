@@ -0,0 +1,173 @@
+# Copyright (C) 2019-2021 Zilliz. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+
+"""
+Single-flight deduplication: concurrent identical requests share one in-flight RPC.
+
+The first caller of a request sends it, callers arriving with the same request while it is
+in flight wait for it and receive its result, or its error. Nothing is cached: once the RPC
+returns, the next identical call sends a new one.
+
+A call that fails on the deadline of its sender is not shared: the waiting callers whose own
+deadline has not passed send the request again.
+"""
+
+import hashlib
+import threading
+import time
+
+import grpc
+import numpy
+
+from .deadline import current_deadline, remaining_timeout
+from .exceptions import DeadlineExceededException, ExceptionsMessage
+
+
+def _feed(digest, part):
+    if isinstance(part, numpy.ndarray):
+        digest.update(f"a{part.dtype.str}{part.shape}".encode())
+        digest.update(numpy.ascontiguousarray(part).tobytes())
+    elif isinstance(part, (list, tuple)):
+        array = numpy.asarray(part) if part and isinstance(part[0], (list, tuple, float)) else None
+        if array is not None and array.dtype.kind in "fiu":
+            _feed(digest, array)
+            return
+        digest.update(f"l{len(part)}".encode())
+        for item in part:
+            _feed(digest, item)
+    elif isinstance(part, dict):
+        digest.update(f"d{len(part)}".encode())
+        for key in sorted(part, key=str):
+            _feed(digest, key)
+            _feed(digest, part[key])
+    else:
+        digest.update(f"{type(part).__name__}:{part!r};".encode())
+
+
+def fingerprint(*parts):
+    """
+    Returns a digest of request arguments, vectors included, to key identical requests.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        _feed(digest, part)
+    return digest.hexdigest()
+
+
+def _is_deadline_error(err):
+    if isinstance(err, (DeadlineExceededException, grpc.FutureTimeoutError)):
+        return True
+    return isinstance(err, grpc.RpcError) and callable(getattr(err, "code", None)) \
+        and err.code() == grpc.StatusCode.DEADLINE_EXCEEDED
+
+
+class _Call:
+    __slots__ = ("event", "result", "exception", "expired")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.exception = None
+        self.expired = False
+
+
+class SingleFlight:
+    """
+    A group of in-flight requests, keyed by request.
+
+    :example:
+        >>> group = SingleFlight()
+        >>> group.do(("has_collection", "films"), lambda: conn.has_collection("films"))
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.calls = 0
+        self.shared = 0
+
+    def do(self, key, fn):
+        """
+        Calls ``fn``, unless a call with the same key is in flight, in which case its result is
+        waited for within the deadline of the calling thread.
+
+        :return:
+            The result of ``fn``, possibly shared with other callers.
+
+        :raises DeadlineExceededException: If the shared call does not end within the deadline.
+        """
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self._calls[key] = _Call()
+                    self.calls += 1
+                else:
+                    self.shared += 1
+            if leader:
+                break
+            if not call.event.wait(remaining_timeout()):
+                raise DeadlineExceededException(0, ExceptionsMessage.DeadlineExceeded)
+            if call.expired:
+                # The sender ran out of its own time, which says nothing of ours.
+                remaining_timeout()
+                continue
+            if call.exception is not None:
+                raise call.exception
+            return call.result
+        expire = current_deadline()
+        try:
+            call.result = fn()
+        except BaseException as err:
+            call.exception = err
+            call.expired = _is_deadline_error(err) or (expire is not None and time.monotonic() >= expire)
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result
+
+    def in_flight(self):
+        """
+        Returns the number of requests in flight.
+        """
+        return len(self._calls)
+
+    def stats(self):
+        """
+        Returns the requests sent, and the calls that shared one of them instead.
+        """
+        return {"calls": self.calls, "shared": self.shared}
+
+
+_groups = {}
+_groups_lock = threading.Lock()
+
+
+def group(using="default"):
+    """
+    Returns the single-flight group of a connection.
+    """
+    with _groups_lock:
+        flight = _groups.get(using)
+        if flight is None:
+            flight = _groups[using] = SingleFlight()
+        return flight
+
+
+def single_flight(using, key, fn):
+    """
+    Calls ``fn`` through the single-flight group of the connection ``using``.
+    """
+    return group(using).do(key, fn)
@@ -0,0 +1,250 @@
+# Copyright (C) 2019-2021 Zilliz. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+
+"""
+Metadata snapshots: the partitions, index and statistics of a collection requested in one
+round of concurrent RPCs, read by `Collection.__repr__`, `partitions` and `indexes` instead of
+an RPC per property, and the inventory of all collections of a server built from them.
+"""
+
+import copy
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .deadline import current_deadline, deadline_at, remaining_timeout
+from .schema import CollectionSchema
+from .singleflight import single_flight
+
+DEFAULT_METADATA_TTL = 1.0
+DEFAULT_DESCRIBE_CONCURRENCY = 8
+DEFAULT_INVENTORY_CONCURRENCY = 8
+DEFAULT_INVENTORY_MAX_AGE = 300.0
+
+_DROPPED = object()
+
+
+class CollectionSnapshot:
+    """
+    The metadata of a collection at one point in time, returned by `Collection.describe`.
+
+    Entity counts are the ones of the statistics of the server, taken without a flush, so
+    rows inserted since the last flush may not be counted. They are None unless the snapshot
+    was taken with ``full=True``.
+    """
+    __slots__ = ("name", "schema", "partition_names", "index", "num_entities", "partition_entities", "taken_at")
+
+    def __init__(self, name, schema, partition_names, index, num_entities=None, partition_entities=None):
+        self.name = name
+        self.schema = schema
+        self.partition_names = list(partition_names)
+        self.index = index
+        self.num_entities = num_entities
+        self.partition_entities = partition_entities
+        self.taken_at = time.monotonic()
+
+    @property
+    def description(self):
+        return self.schema.description
+
+    def age(self):
+        """
+        Returns the seconds since the snapshot was taken.
+        """
+        return time.monotonic() - self.taken_at
+
+    def to_dict(self):
+        partitions = []
+        for name in self.partition_names:
+            partition = {"name": name}
+            if self.partition_entities is not None:
+                partition["num_entities"] = self.partition_entities.get(name)
+            partitions.append(partition)
+        result = {
+            "name": self.name,
+            "schema": self.schema.to_dict(),
+            "description": self.description,
+            "partitions": partitions,
+            "index": copy.deepcopy(self.index),
+        }
+        if self.num_entities is not None:
+            result["num_entities"] = self.num_entities
+        return result
+
+    def __repr__(self):
+        return f"<CollectionSnapshot: {self.name}, {len(self.partition_names)} partitions>"
+
+
+def take_snapshot(collection, conn, full=False, max_concurrency=DEFAULT_DESCRIBE_CONCURRENCY):
+    """
+    Takes the snapshot of ``collection`` under the deadline of the calling thread: the
+    partitions, the index and, when ``full``, the collection statistics are requested at once,
+    then the statistics of every partition.
+    """
+    name = collection.name
+    expire = current_deadline()
+
+    def call(fn, *args):
+        with deadline_at(expire):
+            return fn(*args)
+
+    def list_partitions():
+        return single_flight(collection._using, ("list_partitions", name),
+                             lambda: conn.list_partitions(name, timeout=remaining_timeout()))
+
+    def collection_stats():
+        return conn.get_collection_stats(db_name="", collection_name=name, timeout=remaining_timeout())
+
+    def partition_stats(partition_name):
+        return conn.get_partition_stats(db_name="", collection_name=name, partition_name=partition_name,
+                                        timeout=remaining_timeout())
+
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+        partitions = executor.submit(call, list_partitions)
+        index = executor.submit(call, collection._describe_index, conn)
+        stats = executor.submit(call, collection_stats) if full else None
+        partition_names = list(partitions.result())
+        num_entities = partition_entities = None
+        if full:
+            counts = [executor.submit(call, partition_stats, partition) for partition in partition_names]
+            partition_entities = {partition: count.result()["row_count"]
+                                  for partition, count in zip(partition_names, counts)}
+            num_entities = stats.result()["row_count"]
+        return CollectionSnapshot(name, collection.schema, partition_names, index.result(), num_entities,
+                                  partition_entities)
+
+
+class Inventory:
+    """
+    The collections of a server at one point in time, returned by `utility.inventory`.
+
+    :ivar collections: The snapshot of every collection, by name, with its entity count and
+                       no partition counts.
+    :ivar refreshed: The names of the collections whose statistics were requested when the
+                     inventory was taken, the others being reused from the previous one.
+    """
+
+    def __init__(self, collections, refreshed=()):
+        self.collections = dict(collections)
+        self.refreshed = list(refreshed)
+        self.taken_at = time.monotonic()
+
+    @property
+    def names(self):
+        return list(self.collections)
+
+    def __getitem__(self, name):
+        return self.collections[name]
+
+    def __contains__(self, name):
+        return name in self.collections
+
+    def __iter__(self):
+        return iter(self.collections.values())
+
+    def __len__(self):
+        return len(self.collections)
+
+    def to_dict(self):
+        return {name: snapshot.to_dict() for name, snapshot in self.collections.items()}
+
+    def to_dataframe(self):
+        """
+        Returns a pandas DataFrame with a row per collection.
+        """
+        import pandas
+        rows = []
+        for snapshot in self.collections.values():
+            index = snapshot.index or {}
+            rows.append({
+                "name": snapshot.name,
+                "description": snapshot.description,
+                "num_fields": len(snapshot.schema.fields),
+                "num_partitions": len(snapshot.partition_names),
+                "index_type": index.get("index_type"),
+                "metric_type": index.get("metric_type"),
+                "num_entities": snapshot.num_entities,
+            })
+        columns = ["name", "description", "num_fields", "num_partitions", "index_type", "metric_type",
+                   "num_entities"]
+        return pandas.DataFrame(rows, columns=columns)
+
+    def __repr__(self):
+        return f"<Inventory: {len(self.collections)} collections>"
+
+
+def _same_metadata(old, new):
+    return old.schema == new.schema and sorted(old.partition_names) == sorted(new.partition_names) \
+        and old.index == new.index
+
+
+def take_inventory(conn, using, previous=None, max_age=DEFAULT_INVENTORY_MAX_AGE,
+                   max_concurrency=DEFAULT_INVENTORY_CONCURRENCY):
+    """
+    Takes the inventory of the server of ``conn`` under the deadline of the calling thread.
+
+    The collections are listed, then the schema, partitions and index of every collection are
+    requested at once, ``max_concurrency`` requests at a time. The statistics are requested only for
+    the collections new since ``previous``, whose metadata changed, or whose counts are older
+    than ``max_age`` seconds. Collections dropped meanwhile are left out.
+    """
+    names = conn.list_collections(timeout=remaining_timeout())
+    expire = current_deadline()
+
+    def call(fn, name):
+        with deadline_at(expire):
+            try:
+                return fn(name)
+            except Exception:
+                if conn.has_collection(name, timeout=remaining_timeout()):
+                    raise
+                return _DROPPED
+
+    def describe_collection(name):
+        return single_flight(using, ("describe_collection", name),
+                             lambda: conn.describe_collection(name, timeout=remaining_timeout()))
+
+    def list_partitions(name):
+        return single_flight(using, ("list_partitions", name),
+                             lambda: conn.list_partitions(name, timeout=remaining_timeout()))
+
+    def describe_index(name):
+        return single_flight(using, ("describe_index", name),
+                             lambda: conn.describe_index(name, "", timeout=remaining_timeout()))
+
+    def count(name):
+        return conn.get_collection_stats(db_name="", collection_name=name, timeout=remaining_timeout())["row_count"]
+
+    previous = {} if previous is None else previous.collections
+    collections, refresh = {}, []
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+        requests = [[executor.submit(call, fn, name) for fn in (describe_collection, list_partitions, describe_index)]
+                    for name in names]
+        for name, futures in zip(names, requests):
+            schema, partitions, index = [future.result() for future in futures]
+            if any(result is _DROPPED for result in (schema, partitions, index)):
+                continue
+            snapshot = CollectionSnapshot(name, CollectionSchema.construct_from_dict(schema), partitions,
+                                          None if index is None else dict(index))
+            old = previous.get(name)
+            if old is not None and old.num_entities is not None and _same_metadata(old, snapshot) \
+                    and (max_age is None or old.age() <= max_age):
+                collections[name] = old
+                continue
+            collections[name] = snapshot
+            refresh.append(name)
+        counts = list(executor.map(lambda name: call(count, name), refresh))
+    for name, num_entities in zip(refresh, counts):
+        if num_entities is _DROPPED:
+            del collections[name]
+        else:
+            collections[name].num_entities = num_entities
+    return Inventory(collections, [name for name in refresh if name in collections])
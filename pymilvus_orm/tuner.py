@@ -0,0 +1,177 @@
+# Copyright (C) 2019-2021 Zilliz. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+
+"""
+Index parameter tuning: builds candidate indexes, sweeps their search params with a sample
+query set and reports the trade-off between recall and throughput.
+"""
+
+import math
+
+from . import utility
+from .evaluation import brute_force_groundtruth, evaluate, param_grid
+from .exceptions import InvalidArgumentException, ExceptionsMessage
+from .index import Index
+
+_NPROBES = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+_EFS = (16, 32, 64, 128, 256, 512)
+
+
+def default_candidates(num_rows, metric_type="L2", topk=10):
+    """
+    Returns the candidate indexes of `tune` for a collection of ``num_rows`` entities: IVF_FLAT
+    and IVF_SQ8 around the usual ``4 * sqrt(rows)`` lists, and HNSW with M of 8, 16 and 32.
+
+    :return list[tuple]:
+        Pairs of index params and the search params swept on the index, cheapest first.
+    """
+    nlist = min(65536, max(1, int(4 * math.sqrt(num_rows))))
+    candidates = []
+    for index_type in ("IVF_FLAT", "IVF_SQ8"):
+        for lists in sorted({max(1, nlist // 4), nlist}):
+            index = {"index_type": index_type, "metric_type": metric_type, "params": {"nlist": lists}}
+            candidates.append((index, param_grid(metric_type, nprobe=[p for p in _NPROBES if p <= lists])))
+    for m in (8, 16, 32):
+        index = {"index_type": "HNSW", "metric_type": metric_type, "params": {"M": m, "efConstruction": 200}}
+        candidates.append((index, param_grid(metric_type, ef=[ef for ef in _EFS if ef >= topk] or [topk])))
+    return candidates
+
+
+class TuningResult:
+    """
+    The evaluations of all candidate indexes and search params of a tuning run.
+
+    :param evaluations: The evaluations, each with the index params it was measured with.
+    :type  evaluations: list[evaluation.Evaluation]
+    """
+
+    def __init__(self, evaluations):
+        self.evaluations = list(evaluations)
+
+    def pareto_frontier(self):
+        """
+        Returns the evaluations no other evaluation beats on both recall and throughput.
+
+        :return list[evaluation.Evaluation]:
+            The frontier, highest recall first.
+        """
+        frontier = []
+        best_qps = -1.0
+        for evaluation in sorted(self.evaluations, key=lambda e: (-(e.recall or 0.0), -e.qps)):
+            if evaluation.qps > best_qps:
+                frontier.append(evaluation)
+                best_qps = evaluation.qps
+        return frontier
+
+    def best(self, target_recall=None, target_latency=None, percentile=95):
+        """
+        Returns the fastest evaluation reaching ``target_recall``, or the most accurate one
+        whose latency percentile stays within ``target_latency`` seconds, or None.
+        """
+        evaluations = self.pareto_frontier()
+        if target_recall is not None:
+            reaching = [e for e in evaluations if e.recall is not None and e.recall >= target_recall]
+            return max(reaching, key=lambda e: e.qps, default=None)
+        if target_latency is not None:
+            within = [e for e in evaluations if e.latency(percentile) <= target_latency]
+            return max(within, key=lambda e: e.recall or 0.0, default=None)
+        return evaluations[0] if evaluations else None
+
+    def __iter__(self):
+        return iter(self.evaluations)
+
+    def __len__(self):
+        return len(self.evaluations)
+
+    def __repr__(self):
+        return "TuningResult(\n" + "".join(f"    {e},\n" for e in self.pareto_frontier()) + ")"
+
+
+def _build_index(collection, anns_field, index_params):
+    collection.release()
+    if collection.has_index():
+        collection.drop_index()
+    Index(collection, anns_field, index_params)
+    utility.wait_for_index_building_complete(collection.name, using=collection._using)
+    collection.load()
+
+
+def tune(collection, anns_field, queries, k=10, groundtruth=None, base=None, metric_type="L2", candidates=None,
+         target_recall=None, target_latency=None, percentile=95, nq=1, build_best=True):
+    """
+    Builds every candidate index on ``anns_field``, sweeps its search params with the query
+    set and reports recall@k against throughput.
+
+    Search params of a candidate are swept cheapest first, and the sweep of a candidate stops
+    once it reaches ``target_recall`` or exceeds ``target_latency``, as costlier params would
+    only be slower. The index of the collection is replaced by each candidate in turn; with
+    ``build_best`` the best candidate is built again at the end.
+
+    :param collection: The collection, holding the base set.
+    :type  collection: class `collection.Collection`
+    :param anns_field: The vector field to index.
+    :type  anns_field: str
+    :param queries: A sample of the query vectors, of shape (nq, dim).
+    :type  queries: numpy.ndarray
+    :param k: The topk of the searches, and the k of recall@k.
+    :type  k: int
+    :param groundtruth: The primary keys of the true neighbors of every query. If None, they
+                        are computed by brute force from ``base``, whose row numbers must be
+                        the primary keys, see `evaluation.insert_base`.
+    :type  groundtruth: numpy.ndarray
+    :param base: The base vectors, only used without ``groundtruth``.
+    :type  base: numpy.ndarray
+    :param candidates: Pairs of index params and search params, see `default_candidates`.
+    :type  candidates: list[tuple]
+    :param target_recall: The recall the best index must reach at the highest throughput.
+    :type  target_recall: float
+    :param target_latency: The latency in seconds the best index must stay within at the
+                           highest recall, measured at ``percentile``.
+    :type  target_latency: float
+    :param nq: The number of queries per search request.
+    :type  nq: int
+
+    :return TuningResult:
+        The evaluations, with the Pareto frontier of recall against throughput.
+
+    :raises InvalidArgumentException: If neither ``groundtruth`` nor ``base`` is given.
+
+    :example:
+        >>> from pymilvus_orm.tuner import tune
+        >>> result = tune(collection, "vec", sift.queries[:200], k=10, groundtruth=sift.groundtruth,
+        ...               target_recall=0.95)
+        >>> result.best(target_recall=0.95)
+    """
+    if groundtruth is None:
+        if base is None:
+            raise InvalidArgumentException(0, ExceptionsMessage.GroundTruthRequired)
+        groundtruth = brute_force_groundtruth(base, queries, k, metric_type)
+    if candidates is None:
+        candidates = default_candidates(collection.num_entities, metric_type, k)
+
+    evaluations = []
+    for index_params, search_params in candidates:
+        _build_index(collection, anns_field, index_params)
+        for param in search_params:
+            evaluation = evaluate(collection, anns_field, queries, groundtruth, [param], nq=[nq], topk=[k])[0]
+            evaluation.index = index_params
+            evaluations.append(evaluation)
+            if target_recall is not None and evaluation.recall >= target_recall:
+                break
+            if target_latency is not None and evaluation.latency(percentile) > target_latency:
+                break
+
+    result = TuningResult(evaluations)
+    best = result.best(target_recall, target_latency, percentile)
+    if build_best and best is not None and best.index is not candidates[-1][0]:
+        _build_index(collection, anns_field, best.index)
+    return result
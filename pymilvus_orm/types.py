@@ -15,6 +15,8 @@ import logging
 from pandas.api.types import infer_dtype, is_list_like, is_scalar, is_float, is_array_like
 import numpy as np
 
+from .vectors import as_vector_matrix
+
 LOGGER = logging.getLogger(__name__)
 
 
@@ -71,6 +73,69 @@ numpy_dtype_str_map = {
 }
 
 
+arrow_type_str_map = {
+    "bool": DataType.BOOL,
+    "int8": DataType.INT8,
+    "int16": DataType.INT16,
+    "int32": DataType.INT32,
+    "int64": DataType.INT64,
+    "uint8": DataType.INT8,
+    "uint16": DataType.INT16,
+    "uint32": DataType.INT32,
+    "uint64": DataType.INT64,
+    "halffloat": DataType.FLOAT,
+    "float": DataType.FLOAT,
+    "double": DataType.DOUBLE,
+    "string": DataType.STRING,
+    "large_string": DataType.STRING,
+}
+
+
+def _build_numpy_dtype_map():
+    # keyed by dtype objects, only names that ``str(dtype)`` can produce are kept
+    dtype_map = {}
+    for name, data_type in numpy_dtype_str_map.items():
+        try:
+            np_dtype = np.dtype(name)
+        except TypeError:
+            continue
+        if str(np_dtype) == name:
+            dtype_map[np_dtype] = data_type
+    return dtype_map
+
+
+_numpy_dtype_map = _build_numpy_dtype_map()
+
+_scalar_type_map = {
+    float: DataType.DOUBLE,
+    bool: DataType.BOOL,
+    int: DataType.INT64,
+    str: DataType.STRING,
+    bytes: DataType.BINARY_VECTOR,
+    np.float64: DataType.DOUBLE,
+    np.float32: DataType.FLOAT,
+    np.int64: DataType.INT64,
+    np.int32: DataType.INT32,
+    np.int16: DataType.INT16,
+    np.int8: DataType.INT8,
+    np.bool_: DataType.BOOL,
+}
+
+_number_types = frozenset(elem_type for elem_type, data_type in _scalar_type_map.items()
+                          if data_type not in (DataType.BOOL, DataType.STRING, DataType.BINARY_VECTOR))
+
+
+def _is_vector_of(value, data_type):
+    # lists of numbers and bytes are recognized by type, without the pandas inference of
+    # infer_dtype_bydata
+    if data_type == DataType.FLOAT_VECTOR and type(value) in (list, tuple) and value \
+            and type(value[0]) in _number_types:
+        return True
+    if data_type == DataType.BINARY_VECTOR and isinstance(value, bytes):
+        return True
+    return infer_dtype_bydata(value) == data_type
+
+
 def is_integer_datatype(data_type):
     return data_type in (DataType.INT8, DataType.INT16, DataType.INT32, DataType.INT64)
 
@@ -157,5 +222,116 @@ def infer_dtype_bydata(data):
 
 
 def map_numpy_dtype_to_datatype(d_type):
+    if isinstance(d_type, np.dtype):
+        return _numpy_dtype_map.get(d_type, DataType.UNKNOWN)
     d_type_str = str(d_type)
     return numpy_dtype_str_map.get(d_type_str, DataType.UNKNOWN)
+
+
+def is_arrow_data(data):
+    """
+    Checks whether data is a pyarrow Table, RecordBatch or RecordBatchReader, without
+    importing pyarrow.
+    """
+    cls = type(data)
+    return cls.__module__ == "pyarrow.lib" and cls.__name__ in ("Table", "RecordBatch", "RecordBatchReader")
+
+
+def is_arrow_reader(data):
+    cls = type(data)
+    return cls.__module__ == "pyarrow.lib" and cls.__name__ == "RecordBatchReader"
+
+
+def map_arrow_type_to_datatype(arrow_type):
+    """
+    Maps a pyarrow type to a DataType. Lists and fixed-size lists of floats map to
+    FLOAT_VECTOR and fixed-size binaries to BINARY_VECTOR.
+
+    :param arrow_type: The Arrow type.
+    :type  arrow_type: pyarrow.DataType
+
+    :return DataType:
+        The data type, UNKNOWN if the Arrow type has no counterpart.
+    """
+    import pyarrow
+
+    if pyarrow.types.is_fixed_size_list(arrow_type) or pyarrow.types.is_list(arrow_type) \
+            or pyarrow.types.is_large_list(arrow_type):
+        if pyarrow.types.is_floating(arrow_type.value_type):
+            return DataType.FLOAT_VECTOR
+        return DataType.UNKNOWN
+    if pyarrow.types.is_fixed_size_binary(arrow_type):
+        return DataType.BINARY_VECTOR
+    return arrow_type_str_map.get(str(arrow_type), DataType.UNKNOWN)
+
+
+def infer_dtypes_of_column(column):
+    """
+    Infers the data types of the scalar elements of a column.
+
+    Typed numpy and pandas columns are resolved from their dtype alone. Other columns
+    are resolved per distinct element type, so the cost is one C-level pass over the
+    elements and no per-element inference.
+
+    :param column: The column.
+    :type  column: list, numpy.ndarray or pandas.Series
+
+    :return set:
+        The data types found, empty for an empty column.
+    """
+    if len(column) == 0:
+        return set()
+    dtype = getattr(column, "dtype", None)
+    if dtype is not None and dtype != np.object_:
+        return {map_numpy_dtype_to_datatype(dtype)}
+    values = getattr(column, "values", column)
+    data_types = set()
+    for elem_type in set(map(type, values)):
+        data_type = _scalar_type_map.get(elem_type, None)
+        if data_type is None:
+            sample = next(v for v in values if isinstance(v, elem_type))
+            data_type = infer_dtype_bydata(sample)
+        data_types.add(data_type)
+    return data_types
+
+
+def infer_vector_dim_of_column(column):
+    """
+    Returns the common length of the elements of a vector column.
+
+    :param column: The column of vectors.
+    :type  column: list, numpy.ndarray or pandas.Series
+
+    :return int:
+        The common length, or None if the lengths are ragged or an element has no length.
+    """
+    matrix = as_vector_matrix(column)
+    if matrix is not None:
+        return matrix.shape[1]
+    values = getattr(column, "values", column)
+    if len(values) == 0:
+        return 0
+    try:
+        lengths = np.fromiter(map(len, values), dtype=np.int64, count=len(values))
+    except TypeError:
+        return None
+    if (lengths != lengths[0]).any():
+        return None
+    return int(lengths[0])
+
+
+def is_vector_column_of(column, data_type):
+    """
+    Checks that a column holds vectors of ``data_type``, sampling the first, middle and
+    last element.
+    """
+    if as_vector_matrix(column) is not None:
+        return data_type == DataType.FLOAT_VECTOR
+    values = getattr(column, "values", column)
+    n = len(values)
+    if n == 0:
+        return True
+    for i in (0, n // 2, n - 1):
+        if not _is_vector_of(values[i], data_type):
+            return False
+    return True
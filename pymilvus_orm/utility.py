@@ -10,9 +10,16 @@
 # or implied. See the License for the specific language governing permissions and limitations under
 # the License.
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 from pymilvus_orm import constants
-from .connections import get_connection
+from .connections import get_connection, get_default_timeout
+from .deadline import current_deadline, deadline, deadline_at, remaining_timeout
 from .exceptions import ConnectionNotExistException, ExceptionsMessage
+from .index_build import IndexBuildManager, DEFAULT_POLL_INTERVAL
+from .waiter import Waiter
+from .singleflight import single_flight
+from .snapshot import take_inventory, DEFAULT_INVENTORY_CONCURRENCY, DEFAULT_INVENTORY_MAX_AGE
 
 from .exceptions import (
     ResultError,
@@ -26,6 +33,12 @@ def _get_connection(alias):
     return conn
 
 
+def _deadline(timeout, using):
+    if timeout is None:
+        timeout = get_default_timeout(using)
+    return deadline(timeout)
+
+
 def loading_progress(collection_name, partition_names=None, using="default"):
     """
     Show #loaded entities vs #total entities.
@@ -56,15 +69,21 @@ def loading_progress(collection_name, partition_names=None, using="default"):
         >>> collection.load() # load collection to memory
         >>> utility.loading_progress("test_collection")
     """
-    if not partition_names or len(partition_names) == 0:
-        return _get_connection(using).load_collection_progress(collection_name)
-    return _get_connection(using).load_partitions_progress(collection_name, partition_names)
+    with _deadline(None, using):
+        if not partition_names or len(partition_names) == 0:
+            return _get_connection(using).load_collection_progress(collection_name, timeout=remaining_timeout())
+        return _get_connection(using).load_partitions_progress(collection_name, partition_names,
+                                                               timeout=remaining_timeout())
 
 
-def wait_for_loading_complete(collection_name, partition_names=None, timeout=None, using="default"):
+def wait_for_loading_complete(collection_name, partition_names=None, timeout=None, using="default",
+                              on_progress=None):
     """
     Block until loading is done or Raise Exception after timeout.
 
+    The progress is polled with a backoff that grows while the load makes no progress and
+    follows its estimated time to completion while it does.
+
     :param collection_name: The name of collection to wait for loading complete
     :type  collection_name: str
 
@@ -74,6 +93,11 @@ def wait_for_loading_complete(collection_name, partition_names=None, timeout=Non
     :param timeout: The timeout for this method, unit: second
     :type  timeout: int
 
+    :param on_progress: Called as ``on_progress(collection_name, progress)`` when the
+                        loading progress changes.
+    :type  on_progress: callable
+
+    :raises DeadlineExceededException: If loading is not done within ``timeout``.
     :raises CollectionNotExistException: If collection doesn't exist.
     :raises PartitionNotExistException: If partition doesn't exist.
 
@@ -93,11 +117,50 @@ def wait_for_loading_complete(collection_name, partition_names=None, timeout=Non
         >>> collection.load() # load collection to memory
         >>> utility.wait_for_loading_complete("test_collection")
     """
-    if not partition_names or len(partition_names) == 0:
-        return _get_connection(using).wait_for_loading_collection_complete(collection_name, timeout)
-    return _get_connection(using).wait_for_loading_partitions_complete(collection_name,
-                                                                       partition_names,
-                                                                       timeout)
+    waiter = Waiter(on_progress=on_progress)
+    waiter.add_loading(_get_connection(using), collection_name, partition_names)
+    waiter.wait(timeout)
+
+
+def wait_for_all_loading_complete(collections, timeout=None, using="default", on_progress=None, on_done=None):
+    """
+    Block until the loads of many collections are done, checking all of them in one loop.
+
+    The checks of all collections share a rate limit, so waiting on hundreds of loads
+    costs a bounded number of RPCs per second. Collections whose check is due the longest
+    are checked first.
+
+    :param collections: The names of the collections, or a dict of collection names to the
+                        names of their partitions being loaded.
+    :type  collections: list[str] or dict
+
+    :param timeout: The timeout for this method, unit: second
+    :type  timeout: float
+
+    :param on_progress: Called as ``on_progress(collection_name, progress)`` when the
+                        loading progress of a collection changes.
+    :type  on_progress: callable
+
+    :param on_done: Called as ``on_done(collection_name, progress)`` when a collection is loaded.
+    :type  on_done: callable
+
+    :return dict:
+        The last loading progress of every collection.
+
+    :raises DeadlineExceededException: If the loads are not done within ``timeout``.
+
+    :example:
+        >>> from pymilvus_orm import utility
+        >>> utility.wait_for_all_loading_complete({"films": None, "books": ["novels", "poems"]}, timeout=600,
+        ...                                       on_done=lambda name, progress: print(name, "loaded"))
+    """
+    conn = _get_connection(using)
+    if not isinstance(collections, dict):
+        collections = dict.fromkeys(collections)
+    waiter = Waiter(on_progress=on_progress, on_done=on_done)
+    for name, partition_names in collections.items():
+        waiter.add_loading(conn, name, partition_names)
+    return waiter.wait(timeout)
 
 
 def index_building_progress(collection_name, index_name="", using="default"):
@@ -145,13 +208,19 @@ def index_building_progress(collection_name, index_name="", using="default"):
         >>> utility.index_building_progress("test_collection", "")
         >>> utility.loading_progress("test_collection")
     """
-    return _get_connection(using).get_index_build_progress(collection_name, index_name)
+    with _deadline(None, using):
+        return _get_connection(using).get_index_build_progress(collection_name, index_name,
+                                                               timeout=remaining_timeout())
 
 
-def wait_for_index_building_complete(collection_name, index_name="", timeout=None, using="default"):
+def wait_for_index_building_complete(collection_name, index_name="", timeout=None, using="default",
+                                     on_progress=None):
     """
     Block until building is done or Raise Exception after timeout.
 
+    The progress is polled with a backoff that grows while the build makes no progress and
+    follows its estimated time to completion while it does.
+
     :param collection_name: The name of collection to wait
     :type  collection_name: str
 
@@ -161,6 +230,14 @@ def wait_for_index_building_complete(collection_name, index_name="", timeout=Non
     :param timeout: The timeout for this method, unit: second
     :type  timeout: int
 
+    :param on_progress: Called as ``on_progress(collection_name, progress)`` when the
+                        building progress changes.
+    :type  on_progress: callable
+
+    :return bool:
+        True once the index is built, False if building failed on the server.
+
+    :raises DeadlineExceededException: If building is not done within ``timeout``.
     :raises CollectionNotExistException: If collection doesn't exist.
     :raises IndexNotExistException: If index doesn't exist.
 
@@ -191,7 +268,211 @@ def wait_for_index_building_complete(collection_name, index_name="", timeout=Non
         >>> utility.loading_progress("test_collection")
 
     """
-    return _get_connection(using).wait_for_creating_index(collection_name, index_name, timeout)[0]
+    waiter = Waiter(on_progress=on_progress)
+    waiter.add_index_building(_get_connection(using), collection_name, index_name)
+    waiter.wait(timeout)
+    return not waiter.failures()
+
+
+def wait_for_all_index_building_complete(collection_names, index_name="", timeout=None, using="default",
+                                         on_progress=None, on_done=None):
+    """
+    Block until the index builds of many collections are done, checking all of them in one
+    loop under a shared rate limit.
+
+    :param collection_names: The names of the collections.
+    :type  collection_names: list[str]
+
+    :param index_name: The name of the index to wait for in every collection.
+    :type  index_name: str
+
+    :param timeout: The timeout for this method, unit: second
+    :type  timeout: float
+
+    :param on_progress: Called as ``on_progress(collection_name, progress)`` when the
+                        building progress of a collection changes.
+    :type  on_progress: callable
+
+    :param on_done: Called as ``on_done(collection_name, progress)`` when an index is built.
+    :type  on_done: callable
+
+    :return dict:
+        The last building progress of every collection, with the ``state`` of the build and
+        its ``fail_reason``. Builds that fail on the server are not waited for any longer and
+        ``on_done`` is not called for them.
+
+    :raises DeadlineExceededException: If the builds are not done within ``timeout``.
+    """
+    conn = _get_connection(using)
+    waiter = Waiter(on_progress=on_progress, on_done=on_done)
+    for name in collection_names:
+        waiter.add_index_building(conn, name, index_name)
+    return waiter.wait(timeout)
+
+
+def build_indexes(collection_names, field_name, index_params, max_concurrent=8, timeout=None,
+                  poll_interval=DEFAULT_POLL_INTERVAL, using="default"):
+    """
+    Builds the same index on many collections, at most ``max_concurrent`` at a time, and
+    waits for all builds to be done.
+
+    :param collection_names: The names of the collections.
+    :type  collection_names: list[str]
+    :param field_name: The vector field to index in every collection.
+    :type  field_name: str
+    :param index_params: The indexing parameters.
+    :type  index_params: dict
+    :param max_concurrent: The number of builds in progress at a time.
+    :type  max_concurrent: int
+    :param timeout: The time in seconds to wait for all builds.
+    :type  timeout: float
+
+    :return list[IndexBuildFuture]:
+        The handles of the builds, in the order of ``collection_names``. Failed builds raise
+        their error from ``result()``.
+
+    :raises DeadlineExceededException: If the builds are not done within ``timeout``.
+
+    :example:
+        >>> from pymilvus_orm import utility
+        >>> index_params = {"index_type": "IVF_FLAT", "metric_type": "L2", "params": {"nlist": 1024}}
+        >>> futures = utility.build_indexes(utility.list_collections(), "films", index_params, max_concurrent=16)
+        >>> [future.state for future in futures]
+    """
+    manager = IndexBuildManager(max_concurrent=max_concurrent, poll_interval=poll_interval, using=using)
+    try:
+        for name in collection_names:
+            manager.submit(name, field_name, index_params)
+        return manager.wait(timeout)
+    finally:
+        manager.shutdown(wait=False, cancel_pending=True)
+
+
+def _many_targets(collections, partitions, using):
+    """
+    Returns the connection, name and partition names of every collection given to
+    `load_many` or `release_many`.
+    """
+    targets = []
+    for collection in collections:
+        if isinstance(collection, str):
+            name, conn = collection, _get_connection(using)
+        else:
+            name, conn = collection.name, collection._get_connection()
+        partition_names = partitions.get(name) if isinstance(partitions, dict) else partitions
+        targets.append((conn, name, partition_names))
+    return targets
+
+
+def _run_many(calls, max_concurrency, timeout, on_done):
+    """
+    Runs ``calls``, pairs of a collection name and a function, from at most ``max_concurrency``
+    threads under one deadline. Once a call fails, the calls not started are skipped and the
+    first error is raised after the running ones end.
+    """
+    if not calls:
+        return []
+    with deadline(timeout):
+        expire = current_deadline()
+
+        def run(name, call):
+            with deadline_at(expire):
+                call()
+            return name
+
+        done, error = [], None
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(calls)))) as executor:
+            futures = [executor.submit(run, name, call) for name, call in calls]
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                try:
+                    name = future.result()
+                except Exception as err:
+                    if error is None:
+                        error = err
+                        for pending in futures:
+                            pending.cancel()
+                    continue
+                done.append(name)
+                if on_done is not None:
+                    on_done(name)
+    if error is not None:
+        raise error
+    return done
+
+
+def load_many(collections, partitions=None, max_concurrency=8, timeout=None, on_done=None, using="default"):
+    """
+    Loads many collections, or partitions of them, in parallel and waits until all of them
+    are loaded.
+
+    Up to ``max_concurrency`` loads are in flight at a time, so warming up a service takes
+    about as long as its slowest load rather than the sum of all of them.
+
+    :param collections: The collections, or their names.
+    :type  collections: list[str] or list[Collection]
+
+    :param partitions: The partitions to load: a list of partition names for every
+                       collection, or a dict of collection names to partition names. A
+                       collection without partitions is loaded entirely.
+    :type  partitions: list[str] or dict
+
+    :param max_concurrency: The number of loads in flight at a time.
+    :type  max_concurrency: int
+
+    :param timeout: The time in seconds to wait for all loads, unit: second
+    :type  timeout: float
+
+    :param on_done: Called as ``on_done(collection_name)`` when a collection is loaded.
+    :type  on_done: callable
+
+    :return list[str]:
+        The names of the collections, in the order they were loaded.
+
+    :raises DeadlineExceededException: If the loads are not done within ``timeout``.
+    :raises BaseException: The first error of a failed load, raised once the loads in
+                           flight end. Loads not started yet are skipped.
+
+    :example:
+        >>> from pymilvus_orm import utility
+        >>> utility.load_many(["films", "books"], partitions={"books": ["novels"]}, max_concurrency=4)
+        ['films', 'books']
+    """
+    calls = []
+    for conn, name, partition_names in _many_targets(collections, partitions, using):
+        if partition_names:
+            def call(conn=conn, name=name, partition_names=partition_names):
+                conn.load_partitions(name, partition_names, timeout=remaining_timeout())
+        else:
+            def call(conn=conn, name=name):
+                conn.load_collection(name, timeout=remaining_timeout())
+        calls.append((name, call))
+    return _run_many(calls, max_concurrency, timeout, on_done)
+
+
+def release_many(collections, partitions=None, max_concurrency=8, timeout=None, on_done=None, using="default"):
+    """
+    Releases many collections, or partitions of them, in parallel. The parameters are the
+    ones of `load_many`.
+
+    :return list[str]:
+        The names of the collections, in the order they were released.
+
+    :example:
+        >>> from pymilvus_orm import utility
+        >>> utility.release_many(utility.list_collections())
+    """
+    calls = []
+    for conn, name, partition_names in _many_targets(collections, partitions, using):
+        if partition_names:
+            def call(conn=conn, name=name, partition_names=partition_names):
+                conn.release_partitions(name, partition_names, timeout=remaining_timeout())
+        else:
+            def call(conn=conn, name=name):
+                conn.release_collection(name, timeout=remaining_timeout())
+        calls.append((name, call))
+    return _run_many(calls, max_concurrency, timeout, on_done)
 
 
 def has_collection(collection_name, using="default"):
@@ -214,7 +495,10 @@ def has_collection(collection_name, using="default"):
         >>> collection = Collection(name="test_collection", schema=schema)
         >>> utility.has_collection("test_collection")
     """
-    return _get_connection(using).has_collection(collection_name)
+    conn = _get_connection(using)
+    with _deadline(None, using):
+        return single_flight(using, ("has_collection", collection_name),
+                             lambda: conn.has_collection(collection_name, timeout=remaining_timeout()))
 
 
 def has_partition(collection_name, partition_name, using="default"):
@@ -240,7 +524,10 @@ def has_partition(collection_name, partition_name, using="default"):
         >>> collection = Collection(name="test_collection", schema=schema)
         >>> utility.has_partition("_default")
     """
-    return _get_connection(using).has_partition(collection_name, partition_name)
+    conn = _get_connection(using)
+    with _deadline(None, using):
+        return single_flight(using, ("has_partition", collection_name, partition_name),
+                             lambda: conn.has_partition(collection_name, partition_name, timeout=remaining_timeout()))
 
 
 def list_collections(timeout=None, using="default") -> list:
@@ -264,7 +551,49 @@ def list_collections(timeout=None, using="default") -> list:
         >>> collection = Collection(name="test_collection", schema=schema)
         >>> utility.list_collections()
     """
-    return _get_connection(using).list_collections()
+    with _deadline(timeout, using):
+        return _get_connection(using).list_collections(timeout=remaining_timeout())
+
+
+def inventory(previous=None, max_age=DEFAULT_INVENTORY_MAX_AGE, max_concurrency=DEFAULT_INVENTORY_CONCURRENCY,
+              timeout=None, using="default"):
+    """
+    Returns the schema, partitions, index and entity count of every collection of the server.
+
+    The schema, partitions and index of all collections are requested concurrently,
+    ``max_concurrency`` requests at a time. Given the ``previous`` inventory, the statistics of a
+    collection are requested again only if its schema, partitions or index changed, or if its
+    count is older than ``max_age`` seconds, so refreshing the inventory of an idle server costs
+    no statistics RPC.
+
+    :param previous: The inventory to refresh.
+    :type  previous: Inventory
+    :param max_age: The age in seconds after which the count of an unchanged collection is
+                    requested again, None to keep it until the metadata of the collection
+                    changes.
+    :type  max_age: float
+    :param max_concurrency: The number of requests in flight.
+    :type  max_concurrency: int
+    :param timeout: The time in seconds to allow for all the RPCs.
+    :type  timeout: float
+
+    :return Inventory:
+        The snapshot of every collection. Entity counts are taken without a flush.
+
+    :example:
+        >>> from pymilvus_orm import connections, utility
+        >>> connections.connect(alias="default")
+        >>> snapshot = utility.inventory()
+        >>> snapshot.to_dataframe()
+                      name description  num_fields  num_partitions index_type metric_type  num_entities
+        0  test_collection        test           2               1   IVF_FLAT          L2          3000
+        >>> snapshot = utility.inventory(previous=snapshot)
+        >>> snapshot.refreshed
+        []
+    """
+    conn = _get_connection(using)
+    with _deadline(timeout, using):
+        return take_inventory(conn, using, previous, max_age, max_concurrency)
 
 
 def calc_distance(vectors_left, vectors_right, params=None, timeout=None, using="default"):
@@ -318,7 +647,8 @@ def calc_distance(vectors_left, vectors_right, params=None, timeout=None, using=
         >>> params = {"metric": "L2", "sqrt": True}
         >>> results = utility.calc_distance(vectors_left=op_l, vectors_right=op_r, params=params)
     """
-    res = _get_connection(using).calc_distance(vectors_left, vectors_right, params, timeout)
+    with _deadline(timeout, using):
+        res = _get_connection(using).calc_distance(vectors_left, vectors_right, params, remaining_timeout())
 
     def vector_count(op):
         x = 0
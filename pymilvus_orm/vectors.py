@@ -0,0 +1,181 @@
+# Copyright (C) 2019-2021 Zilliz. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+
+import numpy
+import pandas
+from pandas.api.extensions import ExtensionArray, ExtensionDtype, register_extension_dtype, take
+from pandas.api.indexers import check_array_indexer
+
+
+@register_extension_dtype
+class VectorDtype(ExtensionDtype):
+    """
+    The dtype of a pandas column of float vectors backed by one 2-D float32 ndarray.
+    """
+    name = "float_vector"
+    type = numpy.ndarray
+    kind = "O"
+    na_value = None
+
+    @classmethod
+    def construct_array_type(cls):
+        return VectorArray
+
+
+class VectorArray(ExtensionArray):
+    """
+    A column of float vectors stored as one 2-D float32 ndarray, one row per vector.
+
+    Use it to put a vector matrix into a DataFrame without creating one object per row.
+    Float32 input is wrapped, not copied.
+
+    :param vectors: The vectors, of shape (rows, dim).
+    :type  vectors: numpy.ndarray
+
+    :example:
+        >>> import numpy, pandas
+        >>> from pymilvus_orm import VectorArray
+        >>> vectors = numpy.random.random((10, 128)).astype(numpy.float32)
+        >>> df = pandas.DataFrame({"film_id": range(10), "films": VectorArray(vectors)})
+        >>> df["films"].dtype
+        VectorDtype
+    """
+
+    def __init__(self, vectors):
+        vectors = numpy.asarray(vectors, dtype=numpy.float32)
+        if vectors.ndim != 2:
+            raise ValueError("VectorArray requires a 2-D array of shape (rows, dim).")
+        self._vectors = vectors
+
+    @property
+    def vectors(self):
+        """
+        Returns the underlying 2-D float32 ndarray.
+        """
+        return self._vectors
+
+    @property
+    def dim(self):
+        return self._vectors.shape[1]
+
+    @classmethod
+    def _from_sequence(cls, scalars, *, dtype=None, copy=False):
+        if isinstance(scalars, VectorArray):
+            return scalars.copy() if copy else scalars
+        if isinstance(scalars, numpy.ndarray) and scalars.ndim == 2:
+            return cls(scalars.copy() if copy else scalars)
+        return cls(numpy.array([numpy.asarray(s, dtype=numpy.float32) for s in scalars], dtype=numpy.float32))
+
+    @classmethod
+    def _from_factorized(cls, values, original):
+        return cls._from_sequence(values)
+
+    @classmethod
+    def _concat_same_type(cls, to_concat):
+        return cls(numpy.concatenate([array.vectors for array in to_concat]))
+
+    @property
+    def dtype(self):
+        return VectorDtype()
+
+    @property
+    def nbytes(self):
+        return self._vectors.nbytes
+
+    def __len__(self):
+        return self._vectors.shape[0]
+
+    def __getitem__(self, item):
+        if isinstance(item, (int, numpy.integer)):
+            return self._vectors[item]
+        item = check_array_indexer(self, item)
+        return VectorArray(self._vectors[item])
+
+    def __setitem__(self, key, value):
+        if not isinstance(key, (int, numpy.integer)):
+            key = check_array_indexer(self, key)
+        if isinstance(value, VectorArray):
+            value = value.vectors
+        self._vectors[key] = numpy.asarray(value, dtype=numpy.float32)
+
+    def __iter__(self):
+        return iter(self._vectors)
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is not None and numpy.dtype(dtype) != object:
+            # numeric dtypes get the vector matrix itself, cast if needed
+            return self._vectors.astype(dtype, copy=bool(copy))
+        out = numpy.empty(len(self), dtype=object)
+        for i, row in enumerate(self._vectors):
+            out[i] = row
+        return out
+
+    def isna(self):
+        return numpy.isnan(self._vectors).all(axis=1) if self.dim else numpy.zeros(len(self), dtype=bool)
+
+    def take(self, indices, *, allow_fill=False, fill_value=None):
+        rows = take(numpy.arange(len(self)), indices, allow_fill=allow_fill, fill_value=-1)
+        vectors = self._vectors[rows]
+        if allow_fill:
+            vectors[rows == -1] = numpy.nan
+        return VectorArray(vectors)
+
+    def copy(self):
+        return VectorArray(self._vectors.copy())
+
+
+def _arrow_vector_matrix(values):
+    import pyarrow
+
+    array = pyarrow.array(values)
+    if isinstance(array, pyarrow.ChunkedArray):
+        array = array.chunk(0) if array.num_chunks == 1 else array.combine_chunks()
+    if array.null_count or len(array) == 0:
+        return None
+    if pyarrow.types.is_fixed_size_list(array.type):
+        dim = array.type.list_size
+    elif pyarrow.types.is_list(array.type) or pyarrow.types.is_large_list(array.type):
+        lengths = numpy.diff(array.offsets.to_numpy())
+        dim = int(lengths[0])
+        if (lengths != dim).any():
+            return None
+    else:
+        return None
+    flat = array.flatten()
+    if flat.null_count or not pyarrow.types.is_floating(flat.type):
+        return None
+    return numpy.asarray(flat.to_numpy(zero_copy_only=False), dtype=numpy.float32).reshape(len(array), dim)
+
+
+def as_vector_matrix(column):
+    """
+    Returns a column of float vectors as a 2-D float32 ndarray when it is stored natively,
+    that is as a `VectorArray`, a 2-D ndarray or an Arrow list or fixed-size list of floats.
+    Float32 data is returned without copying.
+
+    :param column: The column.
+    :type  column: pandas.Series, numpy.ndarray, pyarrow.Array, pyarrow.ChunkedArray or list
+
+    :return numpy.ndarray:
+        The vectors, or None for columns of per-row objects.
+    """
+    values = column.array if isinstance(column, pandas.Series) else column
+    if isinstance(values, VectorArray):
+        return values.vectors
+    if isinstance(values, numpy.ndarray):
+        if values.ndim == 2 and values.dtype.kind == "f":
+            return numpy.asarray(values, dtype=numpy.float32)
+        return None
+    if type(values).__module__ == "pyarrow.lib" \
+            or type(getattr(values, "dtype", None)).__name__ == "ArrowDtype":
+        return _arrow_vector_matrix(values)
+    return None
@@ -0,0 +1,330 @@
+# Copyright (C) 2019-2021 Zilliz. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License
+# is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+# or implied. See the License for the specific language governing permissions and limitations under
+# the License.
+
+"""
+Progress polling for long running server operations, such as loads and index builds.
+
+A `Waiter` checks the progress of many operations in one loop. Every operation is checked
+again after a delay that grows while it makes no progress and follows its estimated time
+to completion while it does, and the checks of all operations share one rate limit, so
+waiting on hundreds of operations costs a bounded number of RPCs per second.
+"""
+
+import random
+import time
+
+from .deadline import deadline, remaining_timeout
+
+DEFAULT_INITIAL_INTERVAL = 0.05
+DEFAULT_MAX_INTERVAL = 2.0
+DEFAULT_MULTIPLIER = 2.0
+DEFAULT_JITTER = 0.2
+DEFAULT_MAX_CHECKS_PER_SECOND = 20
+
+# The values of ``IndexState`` of the client.
+INDEX_STATE_FINISHED = 3
+INDEX_STATE_FAILED = 4
+
+
+class Backoff:
+    """
+    The delays between two checks of an operation: ``initial`` first, then multiplied by
+    ``multiplier`` up to ``maximum``, each randomized by up to ``jitter`` of its value so
+    that operations started together are not checked in lockstep.
+    """
+
+    def __init__(self, initial=DEFAULT_INITIAL_INTERVAL, maximum=DEFAULT_MAX_INTERVAL,
+                 multiplier=DEFAULT_MULTIPLIER, jitter=DEFAULT_JITTER):
+        self.initial = initial
+        self.maximum = maximum
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self._interval = None
+
+    def reset(self):
+        self._interval = None
+
+    def next(self, eta=None):
+        """
+        Returns the next delay in seconds.
+
+        :param eta: The estimated seconds until the operation completes. The delay follows
+                    it, within ``initial`` and ``maximum``, instead of growing.
+        :type  eta: float
+        """
+        if self._interval is None:
+            interval = self.initial
+        elif eta is not None:
+            interval = eta
+        else:
+            interval = self._interval * self.multiplier
+        self._interval = min(self.maximum, max(self.initial, interval))
+        if not self.jitter:
+            return self._interval
+        return self._interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+class ProgressTracker:
+    """
+    Follows the progress of one operation and picks the delay before its next check from
+    the rate the operation progresses at.
+    """
+
+    def __init__(self, backoff=None):
+        self.backoff = backoff or Backoff()
+        self._done = None
+        self._checked_at = None
+
+    def update(self, done, total):
+        """
+        Records a check that found ``done`` out of ``total`` units completed.
+
+        :return float:
+            The delay in seconds before the next check.
+        """
+        now = time.monotonic()
+        eta = None
+        if self._done is not None and done > self._done and total is not None:
+            rate = (done - self._done) / max(now - self._checked_at, 1e-6)
+            eta = (total - done) / rate
+        self._done, self._checked_at = done, now
+        return self.backoff.next(eta)
+
+
+def loading_measure(progress):
+    return progress["num_loaded_entities"], progress["num_total_entities"]
+
+
+def index_building_measure(progress):
+    # A build the server reports finished is complete even if it did not index every row,
+    # as the rows of segments it does not index are never counted as indexed.
+    if progress.get("state") == INDEX_STATE_FINISHED:
+        return progress["total_rows"], progress["total_rows"]
+    return progress["indexed_rows"], progress["total_rows"]
+
+
+def index_building_failure(progress):
+    if progress.get("state") == INDEX_STATE_FAILED:
+        return progress.get("fail_reason") or "index building failed"
+    return None
+
+
+def check_index_building(conn, collection_name, index_name, field_name, previous=None):
+    """
+    Returns the progress of the index build of a collection.
+
+    The state of the build is requested too, and added to the progress as ``state`` and
+    ``fail_reason``, only once all rows are indexed or when no row was indexed since the
+    ``previous`` progress, so a check of a build making progress costs one RPC.
+    """
+    progress = conn.get_index_build_progress(collection_name, index_name, timeout=remaining_timeout())
+    indexed = progress["indexed_rows"]
+    if indexed < progress["total_rows"] and (previous is None or indexed != previous["indexed_rows"]):
+        return progress
+    state, fail_reason = conn.get_index_state(collection_name, field_name, timeout=remaining_timeout())
+    return dict(progress, state=state, fail_reason=fail_reason)
+
+
+class _Target:
+    __slots__ = ("key", "check", "measure", "failure", "tracker", "progress", "due", "done", "fail_reason")
+
+    def __init__(self, key, check, measure, failure, tracker):
+        self.key = key
+        self.check = check
+        self.measure = measure
+        self.failure = failure
+        self.tracker = tracker
+        self.progress = None
+        self.due = 0.0
+        self.done = False
+        self.fail_reason = None
+
+
+class Waiter:
+    """
+    Waits for many operations at once in a single loop.
+
+    :param initial_interval: The delay before the second check of an operation.
+    :type  initial_interval: float
+    :param max_interval: The longest delay between two checks of an operation.
+    :type  max_interval: float
+    :param multiplier: The growth of the delay while an operation makes no progress.
+    :type  multiplier: float
+    :param jitter: The fraction of each delay randomized.
+    :type  jitter: float
+    :param max_checks_per_second: The checks of all operations per second, None for no limit.
+                                  Operations whose check is due the longest go first. One
+                                  check can always be made at once, whatever the rate.
+    :type  max_checks_per_second: float
+    :param on_progress: Called as ``on_progress(key, progress)`` when the progress of an
+                        operation changes.
+    :type  on_progress: callable
+    :param on_done: Called as ``on_done(key, progress)`` when an operation completes.
+    :type  on_done: callable
+
+    Operations that fail on the server are not waited for any longer; `failures` returns
+    the reasons.
+
+    :example:
+        >>> from pymilvus_orm.waiter import Waiter
+        >>> waiter = Waiter(on_done=lambda name, progress: print(name, "loaded"))
+        >>> for name in utility.list_collections():
+        ...     waiter.add_loading(conn, name)
+        >>> waiter.wait(timeout=600)
+    """
+
+    def __init__(self, initial_interval=DEFAULT_INITIAL_INTERVAL, max_interval=DEFAULT_MAX_INTERVAL,
+                 multiplier=DEFAULT_MULTIPLIER, jitter=DEFAULT_JITTER,
+                 max_checks_per_second=DEFAULT_MAX_CHECKS_PER_SECOND, on_progress=None, on_done=None):
+        self._initial_interval = initial_interval
+        self._max_interval = max_interval
+        self._multiplier = multiplier
+        self._jitter = jitter
+        self._rate = max_checks_per_second
+        self._tokens = None if max_checks_per_second is None else max(1, max_checks_per_second)
+        self._refilled_at = time.monotonic()
+        self._on_progress = on_progress
+        self._on_done = on_done
+        self._targets = {}
+
+    def add(self, key, check, measure, failure=None):
+        """
+        Adds an operation to wait for.
+
+        :param key: The key the operation is reported under.
+        :param check: Returns the progress of the operation, usually with one RPC.
+        :type  check: callable
+        :param measure: Returns the completed and total units of a progress. The operation
+                        is complete once they are equal.
+        :type  measure: callable
+        :param failure: Returns the reason the operation failed from a progress, None while
+                        it has not.
+        :type  failure: callable
+        """
+        backoff = Backoff(self._initial_interval, self._max_interval, self._multiplier, self._jitter)
+        self._targets[key] = _Target(key, check, measure, failure, ProgressTracker(backoff))
+        return key
+
+    def add_loading(self, conn, collection_name, partition_names=None, key=None):
+        """
+        Adds the load of a collection, or of some of its partitions, checked with one RPC.
+        The key defaults to the collection name.
+        """
+        if partition_names:
+            def check():
+                return conn.load_partitions_progress(collection_name, partition_names, timeout=remaining_timeout())
+        else:
+            def check():
+                return conn.load_collection_progress(collection_name, timeout=remaining_timeout())
+        return self.add(collection_name if key is None else key, check, loading_measure)
+
+    def add_index_building(self, conn, collection_name, index_name="", key=None):
+        """
+        Adds the index build of a collection. The key defaults to the collection name.
+
+        The build is complete once all rows are indexed or the server reports it finished.
+        Its state is checked once the rows stop progressing, see `check_index_building`, so
+        that a build failed on the server stops being waited for.
+        """
+        key = collection_name if key is None else key
+
+        def check():
+            return check_index_building(conn, collection_name, index_name, index_name, self._targets[key].progress)
+        return self.add(key, check, index_building_measure, index_building_failure)
+
+    def pending(self):
+        """
+        Returns the keys of the operations not complete yet.
+        """
+        return [target.key for target in self._targets.values() if not target.done]
+
+    def failures(self):
+        """
+        Returns the reason of every operation that failed, by key.
+        """
+        return {target.key: target.fail_reason for target in self._targets.values()
+                if target.fail_reason is not None}
+
+    def progress(self):
+        """
+        Returns the last progress seen of every operation, None if not checked yet.
+        """
+        return {key: target.progress for key, target in self._targets.items()}
+
+    def _refill(self, now):
+        if self._rate is None:
+            return
+        self._tokens = min(max(1, self._rate), self._tokens + (now - self._refilled_at) * self._rate)
+        self._refilled_at = now
+
+    def poll(self):
+        """
+        Checks the operations whose check is due, within the rate limit.
+
+        :return bool:
+            Whether all operations are complete.
+        """
+        now = time.monotonic()
+        self._refill(now)
+        due = sorted((t for t in self._targets.values() if not t.done and t.due <= now), key=lambda t: t.due)
+        for target in due:
+            if self._rate is not None:
+                if self._tokens < 1:
+                    break
+                self._tokens -= 1
+            self._check(target)
+        return not self.pending()
+
+    def _check(self, target):
+        progress = target.check()
+        completed, total = target.measure(progress)
+        if progress != target.progress:
+            target.progress = progress
+            if self._on_progress is not None:
+                self._on_progress(target.key, progress)
+        fail_reason = None if target.failure is None else target.failure(progress)
+        if fail_reason is not None:
+            target.done = True
+            target.fail_reason = fail_reason
+            return
+        if completed >= total:
+            target.done = True
+            if self._on_done is not None:
+                self._on_done(target.key, progress)
+            return
+        target.due = time.monotonic() + target.tracker.update(completed, total)
+
+    def _next_check_delay(self):
+        now = time.monotonic()
+        delay = max(0.0, min(t.due for t in self._targets.values() if not t.done) - now)
+        if self._rate is not None and self._tokens < 1:
+            delay = max(delay, (1 - self._tokens) / self._rate - (now - self._refilled_at))
+        return delay
+
+    def wait(self, timeout=None):
+        """
+        Waits for all operations to complete.
+
+        :param timeout: The time in seconds to wait, None to wait until they complete.
+        :type  timeout: float
+
+        :return dict:
+            The last progress of every operation.
+
+        :raises DeadlineExceededException: If the operations do not complete within ``timeout``.
+        """
+        with deadline(timeout):
+            while not self.poll():
+                delay = self._next_check_delay()
+                left = remaining_timeout()
+                time.sleep(delay if left is None else min(delay, left))
+        return self.progress()
@@ -13,6 +13,15 @@ requirements = [
     ]
 
 extras_require={
+        'prometheus': [
+            'prometheus_client',
+        ],
+        'opentelemetry': [
+            'opentelemetry-api',
+        ],
+        'arrow': [
+            'pyarrow',
+        ],
         'test': [
             'sklearn==0.0',
             'pytest==5.3.4',
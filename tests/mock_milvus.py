@@ -137,6 +137,13 @@ class MockMilvus:
     def search(self, collection_name, dsl, partition_tags=None, fields=None, timeout=None, **kwargs):
         pass
 
+    def search_with_expression(self, collection_name, data, anns_field, param, limit, expression=None,
+                               partition_names=None, output_fields=None, timeout=None, **kwargs):
+        pass
+
+    def query(self, collection_name, expr, output_fields=None, partition_names=None, timeout=None, **kwargs):
+        return []
+
     def load_collection_progress(self, collection_name, timeout=None, **kwargs):
         return {'num_loaded_entities': 3000, 'num_total_entities': 5000}
 
@@ -152,6 +159,9 @@ class MockMilvus:
     def get_index_build_progress(self, collection_name, index_name, timeout=None, **kwargs):
         return {'total_rows': 5000, 'indexed_rows': 3000}
 
+    def get_index_state(self, collection_name, field_name, timeout=None, **kwargs):
+        return 3, ""
+
     def wait_for_creating_index(self, collection_name, index_name, timeout=None, **kwargs):
         return True, ""
 
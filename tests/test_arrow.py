@@ -0,0 +1,97 @@
+from unittest import mock
+
+import numpy
+import pytest
+from utils import *
+from mock_result import MockMutationResult
+from pymilvus_orm import Collection
+from pymilvus_orm.schema import CollectionSchema, FieldSchema, parse_fields_from_arrow
+from pymilvus_orm.prepare import InsertPlan
+from pymilvus_orm.mutation import MutationResult
+from pymilvus_orm.types import map_arrow_type_to_datatype
+from pymilvus_orm.exceptions import DataNotMatchException
+
+pyarrow = pytest.importorskip("pyarrow")
+
+
+def gen_arrow_schema(auto_id=False):
+    return CollectionSchema([
+        FieldSchema("id", DataType.INT64, is_primary=True, auto_id=auto_id),
+        FieldSchema("age", DataType.INT32),
+        FieldSchema("vec", DataType.FLOAT_VECTOR, dim=4),
+    ])
+
+
+def gen_arrow_table(nb=10, dim=4):
+    vectors = numpy.random.random((nb, dim)).astype(numpy.float32)
+    return pyarrow.table({
+        "id": pyarrow.array(range(nb), pyarrow.int64()),
+        "age": pyarrow.array(range(nb), pyarrow.int32()),
+        "vec": pyarrow.FixedSizeListArray.from_arrays(pyarrow.array(vectors.ravel()), dim),
+    }), vectors
+
+
+class TestArrow:
+    def test_map_arrow_type(self):
+        assert map_arrow_type_to_datatype(pyarrow.int32()) == DataType.INT32
+        assert map_arrow_type_to_datatype(pyarrow.float64()) == DataType.DOUBLE
+        assert map_arrow_type_to_datatype(pyarrow.string()) == DataType.STRING
+        assert map_arrow_type_to_datatype(pyarrow.list_(pyarrow.float32(), 8)) == DataType.FLOAT_VECTOR
+        assert map_arrow_type_to_datatype(pyarrow.list_(pyarrow.float32())) == DataType.FLOAT_VECTOR
+        assert map_arrow_type_to_datatype(pyarrow.binary(2)) == DataType.BINARY_VECTOR
+        assert map_arrow_type_to_datatype(pyarrow.list_(pyarrow.int8())) == DataType.UNKNOWN
+
+    def test_parse_fields(self):
+        table, _ = gen_arrow_table()
+        fields = parse_fields_from_arrow(table)
+        assert [f.name for f in fields] == ["id", "age", "vec"]
+        assert [f.dtype for f in fields] == [DataType.INT64, DataType.INT32, DataType.FLOAT_VECTOR]
+        assert fields[2].dim == 4
+        table = table.set_column(2, "vec", pyarrow.array(table.column("vec").to_pylist(),
+                                                         pyarrow.list_(pyarrow.float32())))
+        assert parse_fields_from_arrow(table)[2].dim == 4
+
+    def test_plan_reads_arrow_buffers(self):
+        table, vectors = gen_arrow_table()
+        plan = InsertPlan(gen_arrow_schema())
+        for data in (table, table.to_batches()[0]):
+            entities = plan.apply(data)
+            assert entities[1]["values"] == list(range(10))
+            assert numpy.array_equal(entities[2]["values"].vectors, vectors)
+
+    def test_plan_auto_id(self):
+        table, _ = gen_arrow_table()
+        plan = InsertPlan(gen_arrow_schema(auto_id=True))
+        assert len(plan.apply(table.drop(["id"]))) == 2
+        with pytest.raises(DataNotMatchException):
+            plan.apply(table)
+        assert len(plan.apply(table.set_column(0, "id", pyarrow.nulls(10, pyarrow.int64())))) == 2
+
+    def test_plan_rejects_nulls(self):
+        table, _ = gen_arrow_table()
+        plan = InsertPlan(gen_arrow_schema())
+        with pytest.raises(DataNotMatchException):
+            plan.apply(table.set_column(1, "age", pyarrow.array([None] * 10, pyarrow.int32())))
+
+    def test_insert_reader(self):
+        table, _ = gen_arrow_table()
+        collection = Collection(gen_collection_name(), schema=gen_arrow_schema())
+        collection.insert(table)
+        reader = pyarrow.RecordBatchReader.from_batches(table.schema, table.to_batches(max_chunksize=4))
+        with mock.patch.object(collection._get_connection(), "insert",
+                               return_value=MockMutationResult()) as insert:
+            collection.insert(reader)
+            assert insert.call_count == 3
+        collection.drop()
+
+    def test_merge_results(self):
+        first, second = MockMutationResult(), MockMutationResult()
+        first._primary_keys, first._insert_cnt, first._timestamp = [1, 2], 2, 5
+        second._primary_keys, second._insert_cnt, second._timestamp = [3], 1, 4
+        result = MutationResult(first)._merge(MutationResult(second))
+        assert result.primary_keys == [1, 2, 3]
+        assert result.insert_count == 3
+        assert result.timestamp == 5
+        result._merge(MutationResult(second))
+        assert result.primary_keys == [1, 2, 3, 3]
+        assert first.primary_keys == [1, 2]
@@ -0,0 +1,70 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+from utils import *
+from pymilvus_orm import Collection
+from pymilvus_orm.search import SearchResult, _QueryResultSlice
+
+PARAM = {"metric_type": "L2", "params": {"nprobe": 10}}
+
+
+def echo_search(calls):
+    lock = threading.Lock()
+
+    def search(collection_name, data, anns_field, param, limit, expr, *args, **kwargs):
+        with lock:
+            calls.append(len(data))
+        return [(expr, vector[0]) for vector in data]
+    return search
+
+
+class TestSearchCoalescer:
+    @pytest.fixture(scope="function")
+    def collection(self):
+        collection = Collection(gen_collection_name(), schema=gen_schema())
+        yield collection
+        collection.disable_search_coalescing()
+        collection.drop()
+
+    def test_query_result_slice(self):
+        view = _QueryResultSlice(list(range(10)), 3, 6)
+        assert len(view) == 3
+        assert view[0] == 3 and view[-1] == 5
+        assert view[1:] == [4, 5]
+        assert list(view) == [3, 4, 5]
+        with pytest.raises(IndexError):
+            view[3]
+
+    def test_concurrent_searches_share_one_request(self, collection):
+        calls = []
+        coalescer = collection.enable_search_coalescing(max_batch_size=1000, max_delay=0.1)
+        with mock.patch.object(collection._get_connection(), "search_with_expression", side_effect=echo_search(calls)):
+            with ThreadPoolExecutor(16) as pool:
+                results = list(pool.map(
+                    lambda i: collection.search([[float(i), 0.0]], default_float_vec_field_name, PARAM, 10), range(16)))
+        assert calls == [16]
+        assert [result[0][1] for result in results] == [float(i) for i in range(16)]
+        assert all(isinstance(result, SearchResult) and len(result) == 1 for result in results)
+        assert coalescer.stats() == {"requests": 16, "batches": 1}
+
+    def test_batches_by_params_and_size(self, collection):
+        calls = []
+        collection.enable_search_coalescing(max_batch_size=4, max_delay=0.05)
+        with mock.patch.object(collection._get_connection(), "search_with_expression", side_effect=echo_search(calls)):
+            futures = [collection.search([[float(i), 0.0]], default_float_vec_field_name, PARAM, 10,
+                                         expr="id > 0" if i % 2 else None, _async=True) for i in range(7)]
+            results = [future.result() for future in futures]
+        assert sorted(calls) == [3, 4]
+        assert [result[0] for result in results] == [(None if i % 2 == 0 else "id > 0", float(i)) for i in range(7)]
+
+    def test_errors_reach_every_caller(self, collection):
+        collection.enable_search_coalescing(max_delay=0.01)
+        with mock.patch.object(collection._get_connection(), "search_with_expression",
+                               side_effect=RuntimeError("search failed")):
+            futures = [collection.search([[1.0, 0.0]], default_float_vec_field_name, PARAM, 10, _async=True)
+                       for _ in range(3)]
+            for future in futures:
+                with pytest.raises(RuntimeError):
+                    future.result()
@@ -144,3 +144,11 @@ class TestCollections:
 
     def test_dummy(self):
         pass
+
+
+class TestCollectionDataSchema:
+    def test_ragged_vectors_rejected(self):
+        from pymilvus_orm.exceptions import DataNotMatchException
+        df = pandas.DataFrame({"int64": [1, 2], "float_vector": [[1.0, 2.0], [3.0]]})
+        with pytest.raises(DataNotMatchException):
+            Collection.construct_from_dataframe(gen_collection_name(), df, primary_field="int64")
@@ -0,0 +1,69 @@
+import time
+import pytest
+from unittest import mock
+from utils import *
+from pymilvus_orm import Collection, connections, deadline
+from pymilvus_orm.deadline import remaining_timeout, current_deadline
+from pymilvus_orm.exceptions import DeadlineExceededException
+
+
+class TestDeadline:
+    @pytest.fixture(scope="function")
+    def collection(self):
+        name = gen_collection_name()
+        yield Collection(name, schema=gen_schema())
+        if connections.get_connection().has_collection(name):
+            connections.get_connection().drop_collection(name)
+
+    def test_no_deadline(self):
+        assert current_deadline() is None
+        assert remaining_timeout() is None
+        with deadline(None):
+            assert remaining_timeout() is None
+
+    def test_nested_deadline_only_shortens(self):
+        with deadline(10):
+            with deadline(100):
+                assert remaining_timeout() <= 10
+            with deadline(1):
+                assert remaining_timeout() <= 1
+            assert 1 < remaining_timeout() <= 10
+        assert current_deadline() is None
+
+    def test_expired(self):
+        with deadline(0.001):
+            time.sleep(0.01)
+            with pytest.raises(DeadlineExceededException):
+                remaining_timeout()
+
+    def test_budget_shared_by_rpcs(self, collection):
+        conn = connections.get_connection()
+        with mock.patch.object(conn, "flush", wraps=conn.flush) as flush, \
+                mock.patch.object(conn, "get_collection_stats", wraps=conn.get_collection_stats) as stats:
+            with deadline(5):
+                assert collection.num_entities == 0
+        assert 0 < flush.call_args[1]["timeout"] <= 5
+        assert 0 < stats.call_args[1]["timeout"] <= flush.call_args[1]["timeout"]
+
+    def test_expired_before_rpc(self, collection):
+        with deadline(0.001):
+            time.sleep(0.01)
+            with pytest.raises(DeadlineExceededException):
+                collection.has_partition("_default")
+
+    def test_collection_default_timeout(self):
+        name = gen_collection_name()
+        collection = Collection(name, schema=gen_schema(), default_timeout=3)
+        conn = connections.get_connection()
+        with mock.patch.object(conn, "has_partition", wraps=conn.has_partition) as has:
+            collection.has_partition("_default")
+            assert 0 < has.call_args[1]["timeout"] <= 3
+            collection.has_partition("_default", timeout=30)
+            assert 3 < has.call_args[1]["timeout"] <= 30
+        collection.drop()
+
+    def test_alias_default_timeout(self):
+        connections.add_connection(deadline_test={"host": "localhost", "port": "19530", "default_timeout": 2})
+        assert connections.get_default_timeout("deadline_test") == 2
+        assert connections.get_default_timeout() is None
+        connections.remove_connection("deadline_test")
@@ -0,0 +1,62 @@
+from unittest import mock
+
+import numpy
+import pytest
+from utils import *
+from mock_result import MockMutationResult
+from pymilvus_orm import Collection
+from pymilvus_orm.schema import CollectionSchema, FieldSchema
+from pymilvus_orm.evaluation import Dataset, brute_force_groundtruth, insert_base, param_grid, recall_at_k, result_ids
+from pymilvus_orm.exceptions import InvalidMetricTypeException
+
+
+class FakeHits:
+    def __init__(self, ids):
+        self.ids = ids
+
+
+class TestEvaluation:
+    def test_param_grid(self):
+        grid = param_grid("L2", nprobe=[1, 8], ef=[64])
+        assert grid == [{"metric_type": "L2", "params": {"nprobe": 1, "ef": 64}},
+                        {"metric_type": "L2", "params": {"nprobe": 8, "ef": 64}}]
+
+    def test_recall_at_k(self):
+        truth = numpy.array([[1, 2, 3, 4], [5, 6, 7, 8]])
+        ids = result_ids([FakeHits([2, 1, 9]), FakeHits([5])], 3)
+        assert ids.tolist() == [[2, 1, 9], [5, -1, -1]]
+        assert recall_at_k(ids, truth, 3) == 0.5
+        assert recall_at_k(ids, truth, 1) == 0.5
+        assert recall_at_k(numpy.array([[1, 2, 3, 4, 5]]), truth[:1, :2], 5) == 1.0
+
+    def test_brute_force_groundtruth(self):
+        base = numpy.random.random((300, 8)).astype(numpy.float32)
+        queries = numpy.random.random((5, 8)).astype(numpy.float32)
+        distances = ((queries[:, None, :] - base[None, :, :]) ** 2).sum(axis=2)
+        assert numpy.array_equal(brute_force_groundtruth(base, queries, 5, block_size=64),
+                                 numpy.argsort(distances, axis=1)[:, :5])
+        products = queries @ base.T
+        assert numpy.array_equal(brute_force_groundtruth(base, queries, 5, "IP", block_size=64),
+                                 numpy.argsort(-products, axis=1)[:, :5])
+        with pytest.raises(InvalidMetricTypeException):
+            brute_force_groundtruth(base, queries, 5, "HAMMING")
+
+    def test_dataset_from_directory(self, tmp_path):
+        base = numpy.random.random((20, 4)).astype(numpy.float32)
+        write_vecs(tmp_path / "s_base.fvecs", base)
+        write_vecs(tmp_path / "s_query.fvecs", base[:3])
+        write_vecs(tmp_path / "s_groundtruth.ivecs", numpy.array([[0, 1], [1, 0], [2, 3]]), "<i4")
+        dataset = Dataset.from_directory(str(tmp_path), "s")
+        assert dataset.dim == 4
+        assert numpy.array_equal(dataset.queries, base[:3])
+        assert dataset.groundtruth.tolist() == [[0, 1], [1, 0], [2, 3]]
+
+    def test_insert_base(self):
+        schema = CollectionSchema([FieldSchema("id", DataType.INT64, is_primary=True),
+                                   FieldSchema("vec", DataType.FLOAT_VECTOR, dim=4)])
+        collection = Collection(gen_collection_name(), schema=schema)
+        with mock.patch.object(collection._get_connection(), "insert", return_value=MockMutationResult()) as insert:
+            insert_base(collection, numpy.random.random((25, 4)), batch_size=10)
+        ids = [call[1]["entities"][0]["values"] for call in insert.call_args_list]
+        assert sorted(sum(ids, [])) == list(range(25))
+        collection.drop()
@@ -0,0 +1,76 @@
+from unittest import mock
+
+import numpy
+import pytest
+from utils import *
+from pymilvus_orm import Collection, DataType, FieldSchema, CollectionSchema
+from pymilvus_orm.expression import Fields, format_values
+from pymilvus_orm.exceptions import InvalidExpressionException, DataTypeNotMatchException
+
+
+@pytest.fixture(scope="module")
+def schema():
+    return CollectionSchema([
+        FieldSchema("film_id", DataType.INT64, is_primary=True),
+        FieldSchema("rank", DataType.INT8),
+        FieldSchema("score", DataType.DOUBLE),
+        FieldSchema("seen", DataType.BOOL),
+        FieldSchema("film-tag", DataType.STRING),
+        FieldSchema("vec", DataType.FLOAT_VECTOR, dim=4),
+    ])
+
+
+class TestExpression:
+    def test_render(self, schema):
+        F = Fields(schema)
+        assert str(F.film_id > 10) == "film_id > 10"
+        expr = (F.film_id > 10) & F.rank.isin([1, 2]) & ~(F.seen == True)
+        assert expr.render() == "film_id > 10 && rank in [1, 2] && not (seen == true)"
+        assert expr.render() is expr.render()
+        expr = ((F.score <= 0.5) | (F["film-tag"] == "a\"b")) & F.film_id.notin(numpy.array([3]))
+        assert str(expr) == '(score <= 0.5 || film-tag == "a\\"b") && film_id not in [3]'
+        assert str(F.rank.between(1, 3)) == "rank >= 1 && rank <= 3"
+        assert str(F.score > F.film_id) == "score > film_id"
+
+    def test_validation(self, schema):
+        F = Fields(schema)
+        with pytest.raises(InvalidExpressionException):
+            F.missing
+        with pytest.raises(InvalidExpressionException):
+            F.vec
+        with pytest.raises(InvalidExpressionException):
+            F.film_id > 1.5
+        with pytest.raises(InvalidExpressionException):
+            F.rank.isin([1, 300])
+        with pytest.raises(InvalidExpressionException):
+            F.seen < True
+        with pytest.raises(InvalidExpressionException):
+            F.seen == F.film_id
+        with pytest.raises(InvalidExpressionException):
+            F.film_id > 10 & F.rank.isin([1])
+        with pytest.raises(InvalidExpressionException):
+            (F.film_id > 1) and (F.rank > 1)
+        assert str(F.score.isin(numpy.arange(3))) == "score in [0.0, 1.0, 2.0]"
+
+    def test_format_values(self):
+        field = FieldSchema("id", DataType.INT64)
+        ids = numpy.arange(100000, dtype=numpy.int64)
+        assert format_values(field, ids) == "[" + ", ".join(str(i) for i in range(100000)) + "]"
+        assert format_values(field, []) == "[]"
+
+    def test_collection_accepts_expr(self):
+        collection = Collection(gen_collection_name(), schema=gen_schema())
+        conn = collection._get_connection()
+        F = Fields(collection.schema)
+        pk_name = collection.schema.primary_field.name
+        with mock.patch.object(conn, "query", return_value=[]) as query:
+            collection.query(F[pk_name].isin([1, 2]))
+            collection.partition("_default").query(F[pk_name] == 1)
+        assert query.call_args_list[0][0][1] == f"{pk_name} in [1, 2]"
+        assert query.call_args_list[1][0][1] == f"{pk_name} == 1"
+        other = Fields(gen_schema())
+        with pytest.raises(InvalidExpressionException):
+            collection.query(other[other.schema.primary_field.name] == 1)
+        with pytest.raises(DataTypeNotMatchException):
+            collection.query(1)
+        collection.drop()
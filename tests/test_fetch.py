@@ -0,0 +1,79 @@
+import re
+import threading
+import time
+from unittest import mock
+
+import numpy
+from utils import *
+from pymilvus_orm import Collection
+from pymilvus_orm.fetch import EntityCache, plan_id_queries, fetch_entities
+
+
+def selected_ids(expr):
+    ids = set()
+    for listed in re.findall(r"in \[([^\]]*)\]", expr):
+        ids.update(int(pk) for pk in listed.split(","))
+    for low, high in re.findall(r">= (-?\d+) && \w+ <= (-?\d+)", expr):
+        ids.update(range(int(low), int(high) + 1))
+    return ids
+
+
+def fake_query(pk_name, value_name, stored, calls):
+    def query(collection_name, expr, output_fields=None, partition_names=None, *args, **kwargs):
+        calls.append(expr)
+        return [{pk_name: pk, value_name: pk / 2} for pk in sorted(selected_ids(expr)) if pk in stored]
+    return query
+
+
+class TestFetch:
+    def test_plan_id_queries(self):
+        assert plan_id_queries("pk", []) == []
+        assert plan_id_queries("pk", [7, 1, 2, 3, 4, 4], min_run=3) == ["pk in [7] || (pk >= 1 && pk <= 4)"]
+        assert plan_id_queries("pk", [5, 9, 1], min_run=3) == ["pk in [1, 5, 9]"]
+        ids = list(range(100)) + [1000, 2000, 3000]
+        expressions = plan_id_queries("pk", ids, batch_size=40, min_run=16)
+        assert all(len(selected_ids(expr)) <= 40 for expr in expressions)
+        assert set().union(*map(selected_ids, expressions)) == set(ids)
+        assert sum(len(selected_ids(expr)) for expr in expressions) == len(ids)
+
+    def test_fetch_entities_parallel(self):
+        threads = set()
+
+        def query(expr):
+            threads.add(threading.get_ident())
+            time.sleep(0.01)
+            return [{"pk": pk} for pk in selected_ids(expr)]
+
+        entities = fetch_entities(query, "pk", list(range(0, 200, 2)), batch_size=10, max_concurrency=4)
+        assert sorted(entities) == list(range(0, 200, 2))
+        assert len(threads) > 1
+
+    def test_entity_cache(self):
+        cache = EntityCache(max_entries=2)
+        cache.put_many(None, {1: {"pk": 1}, 2: {"pk": 2}})
+        assert cache.get_many(None, [1, 3]) == ({1: {"pk": 1}}, [3])
+        assert cache.get_many(("pk",), [1]) == ({}, [1])
+        cache.put_many(None, {3: {"pk": 3}})
+        assert cache.get_many(None, [1, 2, 3])[1] == [2]
+        assert cache.stats() == {"hits": 3, "misses": 3, "entries": 2}
+
+    def test_collection_get(self):
+        collection = Collection(gen_collection_name(), schema=gen_schema())
+        conn = collection._get_connection()
+        pk_name, value_name = [field.name for field in collection.schema.fields[:2]]
+        calls = []
+        with mock.patch.object(conn, "query", side_effect=fake_query(pk_name, value_name, {1, 2, 3, 5}, calls)):
+            entities = collection.get([3, 4, 1], output_fields=[value_name])
+            assert [e and e[pk_name] for e in entities] == [3, None, 1]
+            assert entities[0] == {pk_name: 3, value_name: 1.5}
+            cache = collection.enable_entity_cache()
+            collection.get([1, 2], output_fields=[value_name])
+            collection.get([2, 5, 1], output_fields=[value_name])
+            assert selected_ids(calls[-1]) == {5}
+            assert cache.stats()["hits"] == 2
+            collection.get([1], partition_names=["p"])
+            assert selected_ids(calls[-1]) == {1}
+            collection.insert([[6], [numpy.float32(3.0)], gen_vectors(1, default_dim)])
+            assert len(cache) == 0
+            collection.disable_entity_cache()
+        collection.drop()
@@ -0,0 +1,139 @@
+import asyncio
+import threading
+from unittest import mock
+
+import pytest
+from utils import *
+from pymilvus_orm import Collection, utility
+from pymilvus_orm.index_build import IndexBuildFuture, IndexBuildManager, CANCELLED, FAILED, FINISHED
+from pymilvus_orm.exceptions import DeadlineExceededException, IndexBuildFailedException
+
+DEFAULT_INDEX = {"index_type": "IVF_FLAT", "metric_type": "L2", "params": {"nlist": 128}}
+
+
+def progress_of(*indexed, total=10):
+    return [{"total_rows": total, "indexed_rows": rows} for rows in indexed]
+
+
+class TestIndexBuild:
+    @pytest.fixture(scope="function")
+    def collection(self):
+        collection = Collection(gen_collection_name(), schema=gen_schema())
+        yield collection
+        collection.drop()
+
+    def test_future_polls_until_indexed(self, collection):
+        conn = collection._get_connection()
+        events = []
+        with mock.patch.object(conn, "get_index_build_progress", side_effect=progress_of(0, 4, 4, 10)), \
+                mock.patch.object(conn, "get_index_state", return_value=(2, "")) as get_index_state, \
+                mock.patch.object(conn, "create_index") as create_index:
+            future = collection.create_index(default_float_vec_field_name, DEFAULT_INDEX, _async=True)
+            future.add_progress_callback(lambda f, progress: events.append(progress["indexed_rows"]))
+            index = future.result(timeout=5)
+        assert create_index.call_args[1]["sync"] is False
+        assert future.state == FINISHED
+        assert index.field_name == default_float_vec_field_name
+        assert events == [0, 4, 4, 10]
+        assert get_index_state.call_count == 2
+
+    def test_future_timeout_and_failure(self, collection):
+        conn = collection._get_connection()
+        future = IndexBuildFuture(collection, default_float_vec_field_name, DEFAULT_INDEX, poll_interval=0.001)
+        with mock.patch.object(conn, "get_index_build_progress", return_value=progress_of(3)[0]), \
+                mock.patch.object(conn, "get_index_state", return_value=(2, "")):
+            with pytest.raises(DeadlineExceededException):
+                future.result(timeout=0.01)
+        with mock.patch.object(conn, "get_index_build_progress", side_effect=RuntimeError("build failed")):
+            with pytest.raises(RuntimeError):
+                future.result()
+        assert future.state == FAILED
+
+    def test_future_failed_on_server(self, collection):
+        conn = collection._get_connection()
+        with mock.patch.object(conn, "get_index_state", return_value=(4, "out of memory")), \
+                mock.patch.object(conn, "get_index_build_progress", return_value=progress_of(3)[0]):
+            with IndexBuildManager(max_concurrent=1, poll_interval=0.001) as manager:
+                future = manager.submit(collection, default_float_vec_field_name, DEFAULT_INDEX)
+                with pytest.raises(IndexBuildFailedException, match="out of memory"):
+                    future.result(timeout=5)
+        assert future.state == FAILED
+
+    def test_future_awaitable(self, collection):
+        conn = collection._get_connection()
+        future = IndexBuildFuture(collection, default_float_vec_field_name, DEFAULT_INDEX, poll_interval=0.001)
+        with mock.patch.object(conn, "get_index_build_progress", side_effect=progress_of(3, 10)):
+            index = asyncio.get_event_loop().run_until_complete(future)
+        assert index.params == DEFAULT_INDEX
+
+    def test_manager_limits_concurrency(self, collection):
+        conn = collection._get_connection()
+        building = set()
+        peak = []
+
+        def create_index(name, *args, **kwargs):
+            building.add(name)
+            peak.append(len(building))
+
+        def progress(name, *args, **kwargs):
+            building.discard(name)
+            return {"total_rows": 10, "indexed_rows": 10}
+
+        names = [gen_collection_name() for _ in range(6)]
+        collections = [Collection(name, schema=gen_schema()) for name in names]
+        with mock.patch.object(conn, "create_index", side_effect=create_index), \
+                mock.patch.object(conn, "get_index_build_progress", side_effect=progress):
+            with IndexBuildManager(max_concurrent=2, poll_interval=0.001) as manager:
+                futures = [manager.submit(c, default_float_vec_field_name, DEFAULT_INDEX) for c in collections]
+            assert all(future.state == FINISHED for future in futures)
+            assert max(peak) <= 2
+            futures = utility.build_indexes(names, default_float_vec_field_name, DEFAULT_INDEX, poll_interval=0.001)
+            assert [future.collection_name for future in futures] == names
+        for c in collections:
+            c.drop()
+
+    def test_future_skips_existing_index(self, collection):
+        conn = collection._get_connection()
+        existing = dict(DEFAULT_INDEX, field_name=default_float_vec_field_name)
+        with mock.patch.object(conn, "describe_index", return_value=existing), \
+                mock.patch.object(conn, "get_index_build_progress", return_value=progress_of(10)[0]), \
+                mock.patch.object(conn, "create_index") as create_index:
+            index = collection.create_index(default_float_vec_field_name, DEFAULT_INDEX, _async=True).result(timeout=5)
+            assert index.params == DEFAULT_INDEX
+            create_index.assert_not_called()
+            other = {"index_type": "IVF_SQ8", "metric_type": "L2", "params": {"nlist": 128}}
+            collection.create_index(default_float_vec_field_name, other, _async=True).result(timeout=5)
+            assert create_index.call_args[0][2] == other
+
+    def test_manager_thread_exits_when_idle(self, collection):
+        conn = collection._get_connection()
+        with mock.patch.object(conn, "get_index_build_progress", return_value=progress_of(10)[0]):
+            manager = IndexBuildManager(poll_interval=0.001)
+            for _ in range(2):
+                manager.submit(collection, default_float_vec_field_name, DEFAULT_INDEX)
+                manager.wait(timeout=5)
+                for thread in threading.enumerate():
+                    if thread.name == "IndexBuildManager":
+                        thread.join(timeout=5)
+                assert manager._thread is None
+            manager.shutdown()
+            with pytest.raises(RuntimeError):
+                manager.submit(collection, default_float_vec_field_name, DEFAULT_INDEX)
+
+    def test_future_cancel(self, collection):
+        future = IndexBuildFuture(collection, default_float_vec_field_name, DEFAULT_INDEX)
+        done = []
+        future.add_done_callback(done.append)
+        assert future.cancel()
+        assert future.state == CANCELLED
+        assert done == [future]
+        assert not future.cancel()
+
+    def test_future_finished_on_server(self, collection):
+        conn = collection._get_connection()
+        future = IndexBuildFuture(collection, default_float_vec_field_name, DEFAULT_INDEX, poll_interval=0.001)
+        with mock.patch.object(conn, "get_index_build_progress", return_value=progress_of(3)[0]):
+            index = future.result(timeout=5)
+        assert future.state == FINISHED
+        assert future.progress()["indexed_rows"] == 3
+        assert index.field_name == default_float_vec_field_name
@@ -0,0 +1,92 @@
+import pytest
+from utils import *
+from pymilvus_orm import Collection, connections
+from pymilvus_orm.instrumentation import (
+    Instrument,
+    OpenTelemetryInstrument,
+    PrometheusInstrument,
+    set_instrument,
+    span,
+    entities_nbytes,
+)
+
+
+def gen_insert_data(nb):
+    import numpy
+    return [list(range(nb)), [numpy.float32(i) for i in range(nb)], gen_vectors(nb, default_dim)]
+
+
+class RecordingInstrument(Instrument):
+    def __init__(self):
+        self.spans = []
+
+    def on_span_end(self, span, error):
+        self.spans.append((span.name, dict(span.attributes), error))
+
+
+class TestInstrumentation:
+    @pytest.fixture(scope="function")
+    def collection(self):
+        name = gen_collection_name()
+        yield Collection(name, schema=gen_schema())
+        if connections.get_connection().has_collection(name):
+            connections.get_connection().drop_collection(name)
+
+    @pytest.fixture(scope="function")
+    def recorder(self):
+        recorder = RecordingInstrument()
+        set_instrument(recorder)
+        yield recorder
+        set_instrument(None)
+
+    def test_disabled_is_noop(self):
+        with span("insert.rpc") as s:
+            assert s.recording is False
+            s.set_attribute("rows", 1)
+
+    def test_insert_phases(self, collection, recorder):
+        collection.insert(gen_insert_data(10))
+        names = [s[0] for s in recorder.spans]
+        assert names == ["insert.prepare", "insert.rpc", "insert.result"]
+        rpc = recorder.spans[1][1]
+        assert rpc["rows"] == 10
+        assert rpc["bytes"] == 10 * 8 + 10 * 4 + 10 * default_dim * 4
+
+    def test_error_reported(self, collection, recorder):
+        with pytest.raises(Exception):
+            collection.insert([[1]])
+        assert recorder.spans[-1][0] == "insert.prepare"
+        assert recorder.spans[-1][2] is not None
+
+    def test_entities_nbytes(self):
+        import numpy
+        entities = [{"name": "v", "type": DataType.FLOAT_VECTOR, "values": numpy.zeros((3, 4), numpy.float32)}]
+        assert entities_nbytes(entities) == 48
+
+    def test_prometheus(self, collection):
+        prometheus_client = pytest.importorskip("prometheus_client")
+        registry = prometheus_client.CollectorRegistry()
+        set_instrument(PrometheusInstrument(registry=registry))
+        try:
+            collection.insert(gen_insert_data(10))
+        finally:
+            set_instrument(None)
+        assert registry.get_sample_value("pymilvus_orm_rows_total", {"phase": "insert.rpc"}) == 10
+        assert registry.get_sample_value("pymilvus_orm_phase_duration_seconds_count",
+                                         {"phase": "insert.prepare"}) == 1
+
+    def test_opentelemetry(self, collection):
+        pytest.importorskip("opentelemetry.sdk")
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+        exporter = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+        set_instrument(OpenTelemetryInstrument(provider.get_tracer("test")))
+        try:
+            collection.insert(gen_insert_data(10))
+        finally:
+            set_instrument(None)
+        spans = {s.name: s for s in exporter.get_finished_spans()}
+        assert spans["pymilvus_orm.insert.rpc"].attributes["milvus.rows"] == 10
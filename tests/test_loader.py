@@ -0,0 +1,82 @@
+from unittest import mock
+
+import numpy
+import pytest
+from utils import *
+from mock_result import MockMutationResult
+from pymilvus_orm import Collection
+from pymilvus_orm.schema import CollectionSchema, FieldSchema
+from pymilvus_orm.loader import open_npz, open_vecs, iter_file_batches
+from pymilvus_orm.exceptions import DataNotMatchException, DataTypeNotSupportException
+
+DIM = 4
+NB = 25
+
+
+def gen_loader_schema(auto_id=False):
+    return CollectionSchema([
+        FieldSchema("id", DataType.INT64, is_primary=True, auto_id=auto_id),
+        FieldSchema("vec", DataType.FLOAT_VECTOR, dim=DIM),
+    ])
+
+
+class TestLoader:
+    @pytest.fixture(scope="function")
+    def vectors(self):
+        return numpy.random.random((NB, DIM)).astype(numpy.float32)
+
+    def test_open_vecs(self, tmp_path, vectors):
+        write_vecs(tmp_path / "a.fvecs", vectors)
+        mapped = open_vecs(str(tmp_path / "a.fvecs"))
+        assert numpy.array_equal(mapped, vectors)
+        with open(tmp_path / "a.fvecs", "ab") as f:
+            f.write(b"\0")
+        with pytest.raises(DataNotMatchException):
+            open_vecs(str(tmp_path / "a.fvecs"))
+
+    def test_open_npz(self, tmp_path, vectors):
+        numpy.savez(tmp_path / "a.npz", id=numpy.arange(NB), vec=vectors)
+        numpy.savez_compressed(tmp_path / "c.npz", id=numpy.arange(NB), vec=vectors)
+        stored = open_npz(str(tmp_path / "a.npz"))
+        assert isinstance(stored["vec"], numpy.memmap)
+        assert numpy.array_equal(stored["vec"], vectors)
+        assert numpy.array_equal(open_npz(str(tmp_path / "c.npz"))["id"], numpy.arange(NB))
+
+    def test_batches(self, tmp_path, vectors):
+        numpy.save(tmp_path / "ids.npy", numpy.arange(NB))
+        numpy.save(tmp_path / "vec.npy", vectors)
+        collection = Collection(gen_collection_name(), schema=gen_loader_schema())
+        paths = {"id": str(tmp_path / "ids.npy"), "vec": str(tmp_path / "vec.npy")}
+        batches = list(iter_file_batches(collection._get_insert_plan(), paths, batch_size=10))
+        assert [len(batch[0]) for batch in batches] == [10, 10, 5]
+        assert numpy.array_equal(batches[2][1], vectors[20:])
+        with pytest.raises(DataNotMatchException):
+            list(iter_file_batches(collection._get_insert_plan(), str(tmp_path / "vec.npy")))
+        with pytest.raises(DataTypeNotSupportException):
+            list(iter_file_batches(collection._get_insert_plan(), str(tmp_path / "a.csv")))
+        collection.drop()
+
+    def test_parquet_batches(self, tmp_path, vectors):
+        pyarrow = pytest.importorskip("pyarrow")
+        import pyarrow.parquet
+        table = pyarrow.table({"vec": pyarrow.FixedSizeListArray.from_arrays(pyarrow.array(vectors.ravel()), DIM)})
+        pyarrow.parquet.write_table(table, str(tmp_path / "a.parquet"), row_group_size=10)
+        collection = Collection(gen_collection_name(), schema=gen_loader_schema(auto_id=True))
+        batches = list(iter_file_batches(collection._get_insert_plan(), str(tmp_path / "a.parquet"), batch_size=10))
+        assert sum(batch.num_rows for batch in batches) == NB
+        collection.drop()
+
+    def test_load_from_files(self, tmp_path, vectors):
+        write_vecs(tmp_path / "a.fvecs", vectors)
+        collection = Collection(gen_collection_name(), schema=gen_loader_schema(auto_id=True))
+        timeouts = []
+
+        def insert(*args, **kwargs):
+            timeouts.append(kwargs["timeout"])
+            return MockMutationResult()
+
+        with mock.patch.object(collection._get_connection(), "insert", side_effect=insert):
+            collection.load_from_files(str(tmp_path / "a.fvecs"), batch_size=10, timeout=10)
+        assert len(timeouts) == 3
+        assert all(0 < timeout <= 10 for timeout in timeouts)
+        collection.drop()
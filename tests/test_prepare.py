@@ -0,0 +1,145 @@
+import threading
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy
+import pandas
+import pytest
+from utils import *
+from pymilvus_orm import Collection, connections
+from pymilvus_orm.schema import CollectionSchema, FieldSchema
+from pymilvus_orm.prepare import InsertPlan, Prepare, group_rows, take_entities
+from pymilvus_orm.exceptions import DataNotMatchException, DataTypeNotSupportException, InvalidArgumentException
+from pymilvus_orm.vectors import VectorArray
+
+
+def gen_auto_id_schema():
+    return CollectionSchema([
+        FieldSchema("pk", DataType.INT64, is_primary=True, auto_id=True),
+        FieldSchema("age", DataType.INT64),
+        FieldSchema("vec", DataType.FLOAT_VECTOR, dim=2),
+    ])
+
+
+class TestInsertPlan:
+    def test_plan_skips_auto_id(self):
+        plan = InsertPlan(gen_auto_id_schema())
+        assert plan.auto_id_field == "pk"
+        assert plan.names == ("age", "vec")
+        assert plan.dims == (None, 2)
+        entities = plan.apply([[1, 2], [[0.1, 0.2], [0.3, 0.4]]])
+        assert [e["name"] for e in entities] == ["age", "vec"]
+        assert entities[0]["type"] == DataType.INT64
+        assert entities[0]["values"] == [1, 2]
+
+    def test_plan_dataframe(self):
+        plan = InsertPlan(gen_auto_id_schema())
+        df = pandas.DataFrame({"pk": [None, None], "age": [1, 2], "vec": [[0.1, 0.2], [0.3, 0.4]]})
+        entities = plan.apply(df)
+        assert entities[0]["values"] == [1, 2]
+        assert entities == plan.apply(df.drop("pk", axis=1))
+        df["pk"] = [1, 2]
+        with pytest.raises(DataNotMatchException):
+            plan.apply(df)
+
+    def test_plan_rejects_bad_columns(self):
+        plan = InsertPlan(gen_auto_id_schema())
+        with pytest.raises(DataNotMatchException):
+            plan.apply([[1, 2]])
+        with pytest.raises(DataNotMatchException):
+            plan.apply([[1, 2], [[0.1, 0.2]]])
+        with pytest.raises(DataTypeNotSupportException):
+            plan.apply([numpy.array([1, 2]), [[0.1, 0.2], [0.3, 0.4]]])
+        with pytest.raises(DataTypeNotSupportException):
+            Prepare.prepare_insert_data({"age": [1]}, gen_auto_id_schema())
+
+    def test_plan_checks_columns(self):
+        plan = InsertPlan(gen_auto_id_schema())
+        vectors = [[0.1, 0.2], [0.3, 0.4]]
+        assert plan.apply([[1, 2], vectors], check=True)[0]["values"] == [1, 2]
+        assert plan.apply([[1.5, 2], vectors])[0]["values"] == [1.5, 2]
+        with pytest.raises(DataNotMatchException):
+            plan.apply([[1.5, 2], vectors], check=True)
+        with pytest.raises(DataNotMatchException):
+            plan.apply([[1, 2], [[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]]], check=True)
+        with pytest.raises(DataNotMatchException):
+            plan.apply(pandas.DataFrame({"age": [1, 2], "vector": vectors}), check=True)
+        with pytest.raises(DataNotMatchException):
+            plan.apply(pandas.DataFrame({"age": [1.0, 2.0], "vec": vectors}), check=True)
+        entities = plan.apply(pandas.DataFrame({"age": [1, 2], "vec": vectors}), check=True)
+        assert entities[1]["values"] == vectors
+
+    def test_insert_checks_with_plan(self):
+        collection = Collection(gen_collection_name(), schema=gen_schema())
+        data = [[1], [numpy.float32(1.0)], gen_vectors(1, default_dim)]
+        with mock.patch("pymilvus_orm.collection.parse_fields_from_data") as parse_fields_from_data:
+            collection.insert(data)
+            with pytest.raises(DataNotMatchException):
+                collection.insert([[1], [numpy.float32(1.0)], gen_vectors(1, default_dim + 1)])
+        parse_fields_from_data.assert_not_called()
+        collection.drop()
+
+    def test_plan_cached_on_collection(self):
+        collection = Collection(gen_collection_name(), schema=gen_schema())
+        plan = collection._get_insert_plan()
+        assert collection._get_insert_plan() is plan
+        assert plan.schema is collection.schema
+        collection.drop()
+
+
+def gen_tenant_schema():
+    return CollectionSchema([
+        FieldSchema("pk", DataType.INT64, is_primary=True, auto_id=True),
+        FieldSchema("tenant", DataType.INT64),
+        FieldSchema("vec", DataType.FLOAT_VECTOR, dim=2),
+    ])
+
+
+class TestPartitionedInsert:
+    def test_group_rows(self):
+        keys, groups, order = group_rows(numpy.array([3, 1, 3, 2, 1]))
+        assert keys == [1, 2, 3]
+        assert [group.tolist() for group in groups] == [[1, 4], [3], [0, 2]]
+        assert order.tolist() == [1, 4, 3, 0, 2]
+        assert group_rows([])[0] == []
+        entities = [{"name": "a", "type": DataType.INT64, "values": [10, 11, 12]},
+                    {"name": "v", "type": DataType.FLOAT_VECTOR, "values": VectorArray(numpy.eye(3))}]
+        taken = take_entities(entities, numpy.array([2, 0]))
+        assert taken[0]["values"] == [12, 10]
+        assert taken[1]["values"].vectors.tolist() == [[0, 0, 1], [1, 0, 0]]
+
+    def test_insert_partition_by(self):
+        collection = Collection(gen_collection_name(), schema=gen_tenant_schema())
+        conn = collection._get_connection()
+        sent, threads = {}, set()
+        next_pk = iter(range(100, 200))
+
+        def insert(collection_name, entities, ids=None, partition_name=None, **kwargs):
+            threads.add(threading.get_ident())
+            time.sleep(0.01)
+            tenants = entities[0]["values"]
+            sent[partition_name] = tenants
+            pks = [next(next_pk) * 10 + tenant for tenant in tenants]
+            return SimpleNamespace(primary_keys=pks, insert_count=len(pks), delete_count=0, upsert_count=0,
+                                   timestamp=len(sent))
+
+        tenants = [1, 2, 1, 3, 2, 1]
+        df = pandas.DataFrame({"tenant": tenants, "vec": VectorArray(numpy.ones((6, 2)))})
+        with mock.patch.object(conn, "insert", side_effect=insert):
+            result = collection.insert(df, partition_by=lambda data: "t" + data["tenant"].astype(str),
+                                       create_partitions=True)
+            assert sorted(sent) == ["t1", "t2", "t3"]
+            assert sent["t1"] == [1, 1, 1]
+            assert set(conn.list_partitions(collection.name)) >= {"t1", "t2", "t3"}
+            assert result.insert_count == 6
+            assert [pk % 10 for pk in result.primary_keys] == tenants
+            assert len(threads) > 1
+            sent.clear()
+            collection.insert([[5, 5], [[0.1, 0.2], [0.3, 0.4]]], partition_by="tenant", max_concurrency=1)
+            assert sent == {"5": [5, 5]}
+        with pytest.raises(InvalidArgumentException):
+            collection.insert(df, partition_name="t1", partition_by="tenant")
+        with pytest.raises(InvalidArgumentException):
+            collection.insert(df, partition_by="missing")
+        collection.drop()
@@ -0,0 +1,61 @@
+import datetime
+from unittest import mock
+
+import pytest
+from utils import *
+from pymilvus_orm import Collection, RetentionManager
+from pymilvus_orm.exceptions import InvalidArgumentException
+
+DAY = datetime.timedelta(days=1)
+NOW = datetime.datetime(2026, 10, 18, 15, 30)
+
+
+class TestRetentionManager:
+    def test_plan(self):
+        manager = RetentionManager(None, DAY, prefix="day_", create_ahead=2, load_window=2, retain=4)
+        existing = ["_default", "day_20261013", "day_20261014", "day_20261016", "day_20261017", "day_20261018",
+                    "day_x", "week_20261018"]
+        plan = manager.plan(NOW, existing)
+        assert plan.create == ["day_20261019", "day_20261020"]
+        assert plan.load == ["day_20261017", "day_20261018", "day_20261019", "day_20261020"]
+        assert plan.release == ["day_20261013", "day_20261014", "day_20261016"]
+        assert plan.drop == ["day_20261013", "day_20261014"]
+        assert manager.plan(NOW, ["day_20261017"]).load[0] == "day_20261017"
+        assert "day_20261016" not in manager.plan(NOW, []).load
+
+    def test_hourly_and_release(self):
+        manager = RetentionManager(None, datetime.timedelta(hours=1), prefix="h", name_format="%Y%m%d%H",
+                                   create_ahead=0, load_window=1, retain=1, expire_action="release")
+        plan = manager.plan(NOW, ["h2026101814", "h2026101815"])
+        assert plan.create == [] and plan.load == ["h2026101815"]
+        assert plan.release == ["h2026101814"] and plan.drop == []
+
+    def test_invalid(self):
+        with pytest.raises(InvalidArgumentException):
+            RetentionManager(None, 3600)
+        with pytest.raises(InvalidArgumentException):
+            RetentionManager(None, DAY, load_window=3, retain=2)
+        with pytest.raises(InvalidArgumentException):
+            RetentionManager(None, DAY, expire_action="archive")
+
+    def test_run(self):
+        collection = Collection(gen_collection_name(), schema=gen_schema())
+        for name in ("day_20261001", "day_20261017"):
+            collection.create_partition(name)
+        conn = collection._get_connection()
+        manager = RetentionManager(collection, DAY, prefix="day_", load_window=2, retain=7, batch_size=2)
+        with mock.patch.object(conn, "drop_partition") as drop_partition:
+            plan = manager.run(NOW, dry_run=True)
+            assert not drop_partition.called
+        assert plan.to_dict() == {"create": ["day_20261018", "day_20261019"],
+                                  "load": ["day_20261017", "day_20261018", "day_20261019"],
+                                  "release": ["day_20261001"], "drop": ["day_20261001"]}
+        with mock.patch.object(conn, "load_partitions") as load_partitions, \
+                mock.patch.object(conn, "release_partitions", wraps=conn.release_partitions) as release_partitions:
+            manager.run(NOW)
+        assert sorted(len(call[0][1]) for call in load_partitions.call_args_list) == [1, 2]
+        assert release_partitions.call_args[0][1] == ["day_20261001"]
+        assert set(conn.list_partitions(collection.name)) >= {"day_20261017", "day_20261018", "day_20261019"}
+        assert "day_20261001" not in conn.list_partitions(collection.name)
+        assert manager.plan(NOW).create == []
+        collection.drop()
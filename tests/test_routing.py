@@ -0,0 +1,86 @@
+from unittest import mock
+
+import pytest
+from utils import *
+from pymilvus_orm import Collection, DataType, FieldSchema, CollectionSchema
+from pymilvus_orm.expression import Fields, Constraint, parse_expr
+from pymilvus_orm.routing import ValueRule, RangeRule, route
+from pymilvus_orm.exceptions import InvalidExpressionException
+
+
+def gen_day_schema():
+    return CollectionSchema([
+        FieldSchema("film_id", DataType.INT64, is_primary=True),
+        FieldSchema("day", DataType.INT64),
+        FieldSchema("vec", DataType.FLOAT_VECTOR, dim=2),
+    ])
+
+
+class TestRouting:
+    def test_constraint(self):
+        F = Fields(gen_day_schema())
+        assert (F.day == 3).constraint("day").values == {3}
+        assert (F.day == 3).constraint("film_id") is None
+        assert ((F.day == 3) | (F.film_id == 1)).constraint("day") is None
+        assert ((F.day.isin([1, 2, 3])) & (F.day > 1)).constraint("day").values == {2, 3}
+        assert ((F.day == 1) | F.day.isin([5])).constraint("day").values == {1, 5}
+        assert (~(F.day == 1)).constraint("day") is None
+        interval = ((F.day >= 10) & (F.day < 20)).constraint("day")
+        assert (interval.low, interval.high, interval.high_inclusive) == (10, 20, False)
+        assert interval.overlaps(19, 30) and not interval.overlaps(20, 30) and not interval.overlaps(0, 10)
+        assert Constraint(low=5, low_inclusive=False).overlaps(None, 6)
+        assert not Constraint([4, 5]).overlaps(6, None)
+
+    def test_parse_expr(self):
+        F = Fields(gen_day_schema())
+        assert str(parse_expr("day in [1, 2] && 10 < film_id", F)) == "day in [1, 2] && film_id > 10"
+        assert str(parse_expr("!(day == -1) || day <= film_id", F)) == "not (day == -1) || day <= film_id"
+        tagged = Fields(CollectionSchema([FieldSchema("film_id", DataType.INT64, is_primary=True),
+                                          FieldSchema("tag", DataType.STRING),
+                                          FieldSchema("vec", DataType.FLOAT_VECTOR, dim=2)]))
+        assert parse_expr('tag == "a!b||c" && film_id != 1', tagged).constraint("tag").values == {"a!b||c"}
+        for text in ("day ==", "day + 1 > 2", "unknown == 1", "day == 1.5"):
+            with pytest.raises(InvalidExpressionException):
+                parse_expr(text, F)
+
+    def test_route(self):
+        F = Fields(gen_day_schema())
+        by_value = ValueRule("day", "day_{}")
+        by_range = RangeRule("day", {"old": (None, 100), "new": (100, None)})
+        assert route([by_value], F.day.isin([1, 2])) == {"day_1", "day_2"}
+        assert route([by_value], F.day > 1) is None
+        assert route([by_range], F.day > 150) == {"new"}
+        assert route([by_range, by_value], F.day == 5) == set()
+        assert route([by_value], F.film_id == 1) is None
+
+    def test_collection_prunes_partitions(self):
+        collection = Collection(gen_collection_name(), schema=gen_day_schema())
+        for day in (1, 2):
+            collection.create_partition(f"day_{day}")
+        collection.add_partition_rule(ValueRule("day", "day_{}"))
+        assert len(collection.partition_rules) == 1
+        conn = collection._get_connection()
+        with mock.patch.object(conn, "query", return_value=[]) as query, \
+                mock.patch.object(conn, "list_partitions", wraps=conn.list_partitions) as list_partitions:
+            collection.query("day in [1, 3] && film_id > 0")
+            assert query.call_args[0][3] == ["day_1"]
+            collection.query(Fields(collection.schema).day == 2)
+            assert query.call_args[0][3] == ["day_2"]
+            assert list_partitions.call_count == 1
+            assert collection.query("day == 7") == []
+            assert query.call_count == 2
+            collection.query("day > 1")
+            assert query.call_args[0][3] is None
+            collection.query("day == 1", partition_names=["day_2"])
+            assert query.call_args[0][3] == ["day_2"]
+        with mock.patch.object(conn, "search_with_expression") as search:
+            collection.search([[0.1, 0.2]], "vec", {"metric_type": "L2"}, 5, expr="day == 2")
+            assert search.call_args[0][6] == ["day_2"]
+            res = collection.search([[0.1, 0.2], [0.2, 0.1]], "vec", {"metric_type": "L2"}, 5, expr="day == 9")
+            assert search.call_count == 1
+            assert len(res) == 2 and all(len(hits) == 0 and list(hits) == [] for hits in res)
+            assert list(res[0].ids) == []
+            future = collection.search([[0.1, 0.2]], "vec", {"metric_type": "L2"}, 5, expr="day == 9", _async=True)
+            assert len(future.result()) == 1
+        collection.clear_partition_rules()
+        collection.drop()
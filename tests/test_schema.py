@@ -55,6 +55,28 @@ class TestCollectionSchema:
         assert target == raw_dict
         assert target is not raw_dict
 
+    def test_immutable_and_hashable(self, raw_dict):
+        import copy
+        import pickle
+        schema = CollectionSchema.construct_from_dict(raw_dict)
+        other = CollectionSchema.construct_from_dict(raw_dict)
+        assert schema == other and hash(schema) == hash(other)
+        assert len({schema, other}) == 1
+        assert copy.deepcopy(schema) is schema
+        assert pickle.loads(pickle.dumps(schema)) == schema
+        with pytest.raises(AttributeError):
+            schema._auto_id = True
+        schema.fields.pop()
+        assert len(schema.fields) == len(raw_dict['fields'])
+
+    def test_primary_field_does_not_mutate_fields(self):
+        pk = FieldSchema("pk", DataType.INT64)
+        vec = FieldSchema("vec", DataType.FLOAT_VECTOR, dim=8)
+        schema = CollectionSchema([pk, vec], primary_field="pk", auto_id=True)
+        assert schema.primary_field.is_primary and schema.primary_field.auto_id
+        assert pk.is_primary is False and pk.auto_id is None
+        assert schema.fields[1] is vec
+
 
 class TestFieldSchema:
     @pytest.fixture(scope="function")
@@ -128,6 +150,9 @@ class TestFieldSchema:
         dict1["name"] = dict1["name"] + "_"
         field3 = FieldSchema.construct_from_dict(dict1)
         assert field1 != field3
+        assert hash(field1) == hash(field2)
+        with pytest.raises(AttributeError):
+            field1.name = "renamed"
 
     def test_to_dict(self, raw_dict_norm, raw_dict_float_vector, raw_dict_binary_vector):
         fields = []
@@ -141,6 +166,13 @@ class TestFieldSchema:
             assert target == dicts[i]
             assert target is not dicts[i]
 
+    def test_parse_fields_from_object_columns(self):
+        import pandas
+        df = pandas.DataFrame({"bin": [b"\x00\x01", b"\x02\x03"], "vec": [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]})
+        fields = parse_fields_from_dataframe(df)
+        assert [f.dtype for f in fields] == [DataType.BINARY_VECTOR, DataType.FLOAT_VECTOR]
+        assert [f.dim for f in fields] == [16, 3]
+
     def test_parse_fields_from_dataframe(self, dataframe1):
         fields = parse_fields_from_dataframe(dataframe1)
         assert len(fields) == len(dataframe1.columns)
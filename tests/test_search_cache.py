@@ -0,0 +1,105 @@
+from unittest import mock
+
+import numpy
+import pytest
+from utils import *
+from pymilvus_orm import Collection
+from pymilvus_orm.search_cache import SemanticSearchCache, LFU
+from pymilvus_orm.exceptions import InvalidArgumentException, InvalidMetricTypeException
+
+PARAM = {"metric_type": "L2", "params": {"nprobe": 10}}
+
+
+def echo_search(calls):
+    def search(collection_name, data, anns_field, param, limit, *args, **kwargs):
+        calls.append([list(vector) for vector in data])
+        return [["hits", vector[0]] for vector in data]
+    return search
+
+
+class TestSemanticSearchCache:
+    def test_lookup_threshold(self):
+        cache = SemanticSearchCache(threshold=0.01)
+        key = cache.key("vec", PARAM, 10, None, None, None)
+        cache.store(key, numpy.array([1.0, 0.0], dtype=numpy.float32), "a")
+        cache.store(key, numpy.array([0.0, 1.0], dtype=numpy.float32), "b")
+        found, missing = cache.lookup(key, numpy.array([[1.0, 0.05], [0.5, 0.5], [0.0, 0.99]], dtype=numpy.float32))
+        assert found == ["a", None, "b"]
+        assert missing == [1]
+        found, missing = cache.lookup(cache.key("vec", PARAM, 5, None, None, None),
+                                      numpy.array([[1.0, 0.0]], dtype=numpy.float32))
+        assert found == [None] and missing == [0]
+        ip = SemanticSearchCache(threshold=0.99, metric_type="IP")
+        ip.store(key, numpy.array([1.0, 0.0], dtype=numpy.float32), "a")
+        assert ip.lookup(key, numpy.array([[1.0, 0.0], [0.0, 1.0]], dtype=numpy.float32))[1] == [1]
+        with pytest.raises(InvalidMetricTypeException):
+            SemanticSearchCache(0.1, metric_type="HAMMING")
+        with pytest.raises(InvalidArgumentException):
+            SemanticSearchCache(0.1, policy="fifo")
+
+    def test_eviction(self):
+        vectors = numpy.eye(4, dtype=numpy.float32)
+        lru = SemanticSearchCache(threshold=0.01, max_entries=3)
+        key = lru.key("vec", PARAM, 10, None, None, None)
+        for i in range(3):
+            lru.store(key, vectors[i], i)
+        lru.lookup(key, vectors[:1])
+        lru.store(key, vectors[3], 3)
+        assert lru.lookup(key, vectors)[1] == [1]
+        assert lru.stats()["evictions"] == 1 and lru.stats()["entries"] == 3
+
+        lfu = SemanticSearchCache(threshold=0.01, max_entries=3, policy=LFU)
+        for i in range(3):
+            lfu.store(key, vectors[i], i)
+        lfu.lookup(key, vectors[[1, 1, 2, 2]])
+        lfu.lookup(key, vectors[[0]])
+        lfu.store(key, vectors[3], 3)
+        assert lfu.lookup(key, vectors)[1] == [0]
+
+    def test_evicted_keys_are_dropped(self):
+        cache = SemanticSearchCache(threshold=0.01, max_entries=10)
+        vector = numpy.ones(4, dtype=numpy.float32)
+        for i in range(100):
+            cache.store(cache.key("vec", PARAM, 10, f"id > {i}", None, None), vector, i)
+        assert len(cache._buckets) == 10
+        assert all(bucket.size == 1 and len(bucket.vectors) == 1 for bucket in cache._buckets.values())
+
+    def test_lfu_ties_across_keys(self):
+        cache = SemanticSearchCache(threshold=0.01, max_entries=3, policy=LFU)
+        first, second = (cache.key("vec", PARAM, 10, expr, None, None) for expr in ("id > 0", "id > 1"))
+        vectors = numpy.eye(4, dtype=numpy.float32)
+        with mock.patch("pymilvus_orm.search_cache.time.monotonic", side_effect=[5.0, 1.0, 100.0, 101.0]):
+            cache.store(first, vectors[0], "a")
+            cache.store(second, vectors[1], "b")
+            cache.store(first, vectors[2], "c")
+            cache.store(first, vectors[3], "d")
+        assert cache.lookup(second, vectors[1:2])[1] == [0]
+        assert cache.lookup(first, vectors[[0, 2, 3]])[0] == ["a", "c", "d"]
+        assert cache.stats()["evictions"] == 1 and second not in cache._buckets
+
+    def test_ttl(self):
+        cache = SemanticSearchCache(threshold=0.01, ttl=-1)
+        key = cache.key("vec", PARAM, 10, None, None, None)
+        cache.store(key, numpy.ones(2, dtype=numpy.float32), "a")
+        assert cache.lookup(key, numpy.ones((1, 2), dtype=numpy.float32))[1] == [0]
+
+    def test_collection_search(self):
+        collection = Collection(gen_collection_name(), schema=gen_schema())
+        cache = collection.enable_search_cache(threshold=0.01)
+        calls = []
+        with mock.patch.object(collection._get_connection(), "search_with_expression", side_effect=echo_search(calls)):
+            first = collection.search([[1.0, 0.0], [0.0, 1.0]], default_float_vec_field_name, PARAM, 10)
+            second = collection.search([[0.0, 1.01], [5.0, 5.0]], default_float_vec_field_name, PARAM, 10)
+            third = collection.search([[1.0, 0.01]], default_float_vec_field_name, PARAM, 10)
+            collection.search([b"\x01"], default_float_vec_field_name, PARAM, 10)
+        assert calls[:2] == [[[1.0, 0.0], [0.0, 1.0]], [[5.0, 5.0]]]
+        assert len(calls) == 3
+        assert [first[i] for i in range(2)] == [["hits", 1.0], ["hits", 0.0]]
+        assert [second[i] for i in range(2)] == [["hits", 0.0], ["hits", 5.0]]
+        assert len(third) == 1 and third[0] == ["hits", 1.0]
+        stats = cache.stats()
+        assert stats["hits"] == 2 and stats["saved_rpcs"] == 1 and stats["entries"] == 3
+        collection.insert([[1], [numpy.float32(1.0)], gen_vectors(1, default_dim)])
+        assert cache.stats()["entries"] == 0
+        collection.disable_search_cache()
+        collection.drop()
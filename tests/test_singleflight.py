@@ -0,0 +1,124 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import numpy
+import pytest
+from utils import *
+from pymilvus_orm import Collection, connections, deadline, utility
+from pymilvus_orm.deadline import remaining_timeout
+from pymilvus_orm.singleflight import SingleFlight, fingerprint
+from pymilvus_orm.exceptions import DeadlineExceededException
+
+
+def concurrently(fn, n=8):
+    with ThreadPoolExecutor(n) as pool:
+        return list(pool.map(lambda _: fn(), range(n)))
+
+
+class TestSingleFlight:
+    def test_fingerprint(self):
+        assert fingerprint([[1.0, 2.0]], {"a": 1, "b": 2}) == fingerprint([[1.0, 2.0]], {"b": 2, "a": 1})
+        assert fingerprint([[1.0, 2.0]]) != fingerprint([[1.0, 2.5]])
+        assert fingerprint(numpy.ones((2, 2), dtype=numpy.float32)) != fingerprint(numpy.ones((2, 2)))
+        assert fingerprint("a > 1", None) != fingerprint("a > 1", [])
+
+    def test_concurrent_calls_share_one(self):
+        group = SingleFlight()
+        calls = []
+
+        def fn():
+            calls.append(1)
+            time.sleep(0.1)
+            return object()
+
+        results = concurrently(lambda: group.do("key", fn))
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+        assert group.stats() == {"calls": 1, "shared": 7}
+        assert group.in_flight() == 0
+        group.do("key", fn)
+        assert len(calls) == 2
+
+    def test_errors_and_deadline(self):
+        group = SingleFlight()
+        started = threading.Event()
+        calls = []
+
+        def fail():
+            calls.append(1)
+            started.set()
+            time.sleep(0.2)
+            raise RuntimeError("describe failed")
+
+        with ThreadPoolExecutor(2) as pool:
+            leader = pool.submit(group.do, "key", fail)
+            started.wait()
+            follower = pool.submit(group.do, "key", fail)
+            with deadline(0.01):
+                with pytest.raises(DeadlineExceededException):
+                    group.do("key", fail)
+            for future in (leader, follower):
+                with pytest.raises(RuntimeError):
+                    future.result()
+        assert len(calls) == 1
+
+    def test_leader_deadline_not_shared(self):
+        group = SingleFlight()
+        started = threading.Event()
+        calls = []
+
+        def fn():
+            calls.append(1)
+            started.set()
+            time.sleep(0.1)
+            remaining_timeout()
+            return "described"
+
+        def lead():
+            with deadline(0.05):
+                return group.do("key", fn)
+
+        with ThreadPoolExecutor(2) as pool:
+            leader = pool.submit(lead)
+            started.wait()
+            follower = pool.submit(group.do, "key", fn)
+            with pytest.raises(DeadlineExceededException):
+                leader.result()
+            assert follower.result() == "described"
+        assert len(calls) == 2
+
+    def test_metadata_and_reads(self):
+        conn = connections.get_connection()
+
+        def slow_has_collection(*args, **kwargs):
+            time.sleep(0.1)
+            return False
+
+        with mock.patch.object(conn, "has_collection", side_effect=slow_has_collection) as has_collection:
+            assert concurrently(lambda: utility.has_collection("films")) == [False] * 8
+        assert has_collection.call_count == 1
+
+        collection = Collection(gen_collection_name(), schema=gen_schema(), single_flight_reads=True)
+
+        def slow_search(*args, **kwargs):
+            time.sleep(0.1)
+            return [["hits-0"], ["hits-1"]]
+
+        with mock.patch.object(conn, "search_with_expression", side_effect=slow_search) as search:
+            results = concurrently(lambda: collection.search([[1.0, 0.0], [0.0, 1.0]],
+                                                             default_float_vec_field_name, {}, 1))
+        assert search.call_count == 1
+        assert all([result[i] for i in range(len(result))] == [["hits-0"], ["hits-1"]] for result in results)
+
+        def slow_query(*args, **kwargs):
+            time.sleep(0.1)
+            return [{"pk": 1}]
+
+        with mock.patch.object(conn, "query", side_effect=slow_query) as query:
+            rows = concurrently(lambda: collection.query("pk == 1"), n=2)
+        assert query.call_count == 1
+        rows[0][0]["pk"] = 2
+        assert rows[1] == [{"pk": 1}]
+        collection.drop()
@@ -0,0 +1,88 @@
+from unittest import mock
+
+from utils import *
+from pymilvus_orm import Collection, CollectionSnapshot, Inventory, utility
+
+
+class TestSnapshot:
+    def test_describe_full(self):
+        collection = Collection(gen_collection_name(), schema=gen_schema())
+        collection.create_partition("comedy")
+        conn = collection._get_connection()
+        with mock.patch.object(conn, "get_partition_stats", wraps=conn.get_partition_stats) as get_partition_stats:
+            snapshot = collection.describe(full=True)
+        assert isinstance(snapshot, CollectionSnapshot)
+        assert sorted(snapshot.partition_names) == ["_default", "comedy"]
+        assert snapshot.partition_entities == {"_default": 0, "comedy": 0}
+        assert snapshot.num_entities == 0
+        assert get_partition_stats.call_count == 2
+        assert snapshot.to_dict()["description"] == collection.description
+        assert collection.describe().num_entities is None
+        collection.drop()
+
+    def test_properties_read_snapshot(self):
+        collection = Collection(gen_collection_name(), schema=gen_schema(), metadata_ttl=60)
+        conn = collection._get_connection()
+        with mock.patch.object(conn, "list_partitions", wraps=conn.list_partitions) as list_partitions, \
+                mock.patch.object(conn, "describe_index", wraps=conn.describe_index) as describe_index:
+            repr(collection)
+            assert [p.name for p in collection.partitions] == ["_default"]
+            assert collection.indexes == []
+            assert list_partitions.call_count == 1
+            assert describe_index.call_count == 1
+            collection.create_partition("comedy")
+            assert sorted(p.name for p in collection.partitions) == ["_default", "comedy"]
+            assert list_partitions.call_count == 2
+            collection.drop_partition("comedy")
+            assert [p.name for p in collection.partitions] == ["_default"]
+        collection.drop()
+
+    def test_zero_ttl(self):
+        collection = Collection(gen_collection_name(), schema=gen_schema(), metadata_ttl=0)
+        conn = collection._get_connection()
+        with mock.patch.object(conn, "list_partitions", wraps=conn.list_partitions) as list_partitions:
+            collection.partitions
+            collection.partitions
+        assert list_partitions.call_count == 2
+        collection.drop()
+
+
+class TestInventory:
+    def test_inventory(self):
+        first = Collection(gen_collection_name(), schema=gen_schema())
+        second = Collection(gen_collection_name(), schema=gen_schema())
+        second.create_partition("comedy")
+        snapshot = utility.inventory(max_concurrency=2)
+        assert isinstance(snapshot, Inventory)
+        assert {first.name, second.name} <= set(snapshot.names)
+        assert sorted(snapshot[second.name].partition_names) == ["_default", "comedy"]
+        assert snapshot[first.name].num_entities == 0
+        df = snapshot.to_dataframe().set_index("name")
+        assert df.loc[second.name, "num_partitions"] == 2
+        assert df.loc[first.name, "num_fields"] == len(first.schema.fields)
+        first.drop()
+        second.drop()
+
+    def test_incremental_refresh(self):
+        first = Collection(gen_collection_name(), schema=gen_schema())
+        second = Collection(gen_collection_name(), schema=gen_schema())
+        snapshot = utility.inventory()
+        conn = first._get_connection()
+        second.create_partition("comedy")
+        with mock.patch.object(conn, "get_collection_stats", wraps=conn.get_collection_stats) as stats:
+            refreshed = utility.inventory(previous=snapshot)
+        assert second.name in refreshed.refreshed and first.name not in refreshed.refreshed
+        assert sorted(call[1]["collection_name"] for call in stats.call_args_list) == sorted(refreshed.refreshed)
+        assert refreshed[first.name] is snapshot[first.name]
+        assert utility.inventory(previous=refreshed, max_age=0).refreshed == refreshed.names
+        first.drop()
+        assert first.name not in utility.inventory(previous=refreshed)
+        second.drop()
+
+    def test_dropped_while_listed(self):
+        collection = Collection(gen_collection_name(), schema=gen_schema())
+        conn = collection._get_connection()
+        listed = conn.list_collections()
+        collection.drop()
+        with mock.patch.object(conn, "list_collections", return_value=listed):
+            assert collection.name not in utility.inventory()
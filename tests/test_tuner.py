@@ -0,0 +1,45 @@
+import numpy
+import pytest
+from utils import *
+from pymilvus_orm import Collection
+from pymilvus_orm.schema import CollectionSchema, FieldSchema
+from pymilvus_orm.evaluation import Evaluation
+from pymilvus_orm.tuner import TuningResult, default_candidates, tune
+from pymilvus_orm.exceptions import InvalidArgumentException
+
+
+def gen_evaluation(recall, qps, latency):
+    return Evaluation({"metric_type": "L2", "params": {}}, 1, 10, recall, qps, numpy.array([latency]))
+
+
+class TestTuner:
+    def test_default_candidates(self):
+        candidates = default_candidates(10000, "IP", topk=50)
+        index_types = [index["index_type"] for index, _ in candidates]
+        assert index_types.count("HNSW") == 3
+        for index, params in candidates:
+            assert index["metric_type"] == "IP"
+            if index["index_type"] == "HNSW":
+                assert all(p["params"]["ef"] >= 50 for p in params)
+            else:
+                assert all(p["params"]["nprobe"] <= index["params"]["nlist"] for p in params)
+
+    def test_pareto_frontier(self):
+        slow_exact = gen_evaluation(1.0, 100, 0.010)
+        fast = gen_evaluation(0.8, 1000, 0.001)
+        dominated = gen_evaluation(0.7, 500, 0.002)
+        middle = gen_evaluation(0.95, 400, 0.003)
+        result = TuningResult([dominated, fast, slow_exact, middle])
+        assert result.pareto_frontier() == [slow_exact, middle, fast]
+        assert result.best(target_recall=0.9) is middle
+        assert result.best(target_recall=0.99) is slow_exact
+        assert result.best(target_latency=0.005) is middle
+        assert result.best(target_latency=0.0001) is None
+
+    def test_tune_requires_groundtruth(self):
+        schema = CollectionSchema([FieldSchema("id", DataType.INT64, is_primary=True),
+                                   FieldSchema("vec", DataType.FLOAT_VECTOR, dim=4)])
+        collection = Collection(gen_collection_name(), schema=schema)
+        with pytest.raises(InvalidArgumentException):
+            tune(collection, "vec", numpy.zeros((2, 4)))
+        collection.drop()
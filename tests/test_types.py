@@ -95,3 +95,27 @@ class TestTypes:
             actual.append(infer_dtype_bydata(d))
 
         assert actual == wants
+
+    def test_map_numpy_dtype_objects(self):
+        assert map_numpy_dtype_to_datatype(np.dtype(np.float32)) == DataType.FLOAT
+        assert map_numpy_dtype_to_datatype(np.dtype(np.float64)) == DataType.DOUBLE
+        assert map_numpy_dtype_to_datatype(np.dtype(np.uint16)) == DataType.INT16
+        assert map_numpy_dtype_to_datatype(np.dtype(object)) == DataType.UNKNOWN
+        assert map_numpy_dtype_to_datatype("int32") == DataType.INT32
+
+    def test_infer_dtypes_of_column(self):
+        assert infer_dtypes_of_column([]) == set()
+        assert infer_dtypes_of_column([1, 2, 3]) == {DataType.INT64}
+        assert infer_dtypes_of_column([1, 2.0]) == {DataType.INT64, DataType.DOUBLE}
+        assert infer_dtypes_of_column([np.float32(1.0)]) == {DataType.FLOAT}
+        assert infer_dtypes_of_column(pd.Series([1, 2], dtype=np.int8)) == {DataType.INT8}
+        assert infer_dtypes_of_column(pd.Series(["a", None])) == {DataType.STRING, DataType.UNKNOWN}
+
+    def test_infer_vector_dim_of_column(self):
+        assert infer_vector_dim_of_column([[1.0, 2.0], [3.0, 4.0]]) == 2
+        assert infer_vector_dim_of_column(pd.Series([np.zeros(3), np.zeros(3)])) == 3
+        assert infer_vector_dim_of_column(np.zeros((5, 4))) == 4
+        assert infer_vector_dim_of_column([[1.0, 2.0], [3.0]]) is None
+        assert infer_vector_dim_of_column([[1.0], 2.0]) is None
+        assert is_vector_column_of([[1.0, 2.0]], DataType.FLOAT_VECTOR)
+        assert not is_vector_column_of([b"\x00"], DataType.FLOAT_VECTOR)
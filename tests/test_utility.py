@@ -1,5 +1,9 @@
+import time
+from unittest import mock
+
 import pytest
 from utils import *
+from pymilvus_orm import connections
 from pymilvus_orm.utility import *
 
 
@@ -8,7 +12,10 @@ class TestCollectionSchema:
         loading_progress(gen_collection_name(), [gen_partition_name()])
 
     def test_wait_for_loading_complete(self):
-        wait_for_loading_complete(gen_collection_name(), [gen_partition_name()])
+        conn = connections.get_connection()
+        progress = [{'num_loaded_entities': rows, 'num_total_entities': 5000} for rows in (3000, 5000)]
+        with mock.patch.object(conn, "load_partitions_progress", side_effect=progress):
+            wait_for_loading_complete(gen_collection_name(), [gen_partition_name()])
 
     def test_index_building_progress(self):
         index_building_progress(gen_collection_name(), gen_index_name())
@@ -22,3 +29,34 @@ class TestCollectionSchema:
     def test_has_partition(self):
         with pytest.raises(BaseException):
             has_partition(gen_collection_name(), gen_partition_name())
+
+
+class TestLoadMany:
+    def test_load_many_in_parallel(self):
+        conn = connections.get_connection()
+        names = [gen_collection_name() for _ in range(6)]
+
+        def load(name, *args, **kwargs):
+            time.sleep(0.1)
+
+        done = []
+        start = time.monotonic()
+        with mock.patch.object(conn, "load_collection", side_effect=load), \
+                mock.patch.object(conn, "load_partitions") as load_partitions:
+            loaded = load_many(names, partitions={names[0]: ["p1"]}, max_concurrency=6, on_done=done.append)
+        assert time.monotonic() - start < 0.4
+        assert sorted(loaded) == sorted(names) and sorted(done) == sorted(names)
+        assert load_partitions.call_args[0][:2] == (names[0], ["p1"])
+
+    def test_release_many_error(self):
+        conn = connections.get_connection()
+        names = [gen_collection_name() for _ in range(4)]
+
+        def release(name, *args, **kwargs):
+            if name == names[1]:
+                raise RuntimeError("release failed")
+
+        with mock.patch.object(conn, "release_collection", side_effect=release):
+            with pytest.raises(RuntimeError):
+                release_many(names, max_concurrency=1)
+        assert release_many([]) == []
@@ -0,0 +1,86 @@
+import numpy
+import pandas
+import pytest
+from utils import *
+from pymilvus_orm import Collection, VectorArray
+from pymilvus_orm.schema import CollectionSchema, FieldSchema, parse_fields_from_dataframe
+from pymilvus_orm.prepare import InsertPlan
+from pymilvus_orm.vectors import as_vector_matrix
+from pymilvus_orm.exceptions import DataTypeNotSupportException
+
+
+def gen_vector_schema(dim):
+    return CollectionSchema([
+        FieldSchema("id", DataType.INT64, is_primary=True),
+        FieldSchema("vec", DataType.FLOAT_VECTOR, dim=dim),
+    ])
+
+
+class TestVectorArray:
+    @pytest.fixture(scope="function")
+    def vectors(self):
+        return numpy.random.random((8, 4)).astype(numpy.float32)
+
+    def test_wraps_without_copy(self, vectors):
+        df = pandas.DataFrame({"id": numpy.arange(8), "vec": VectorArray(vectors)}, copy=False)
+        assert as_vector_matrix(df["vec"]) is vectors
+        assert numpy.array_equal(df["vec"].iloc[3], vectors[3])
+        assert len(df.iloc[2:5]) == 3
+        assert len(pandas.concat([df, df])) == 16
+        assert numpy.array_equal(as_vector_matrix(df.take([1, 0])["vec"]), vectors[[1, 0]])
+
+    def test_setitem(self, vectors):
+        array = VectorArray(vectors.copy())
+        array[0] = numpy.zeros(4)
+        array[[1, 2]] = VectorArray(numpy.ones((2, 4), dtype=numpy.float32))
+        assert not array.vectors[0].any() and array.vectors[1:3].all()
+        series = pandas.Series(array)
+        series.iloc[3] = vectors[0]
+        assert numpy.array_equal(as_vector_matrix(series)[3], vectors[0])
+
+    def test_array(self, vectors):
+        array = VectorArray(vectors)
+        assert numpy.asarray(array, dtype=numpy.float32) is array.vectors
+        doubles = numpy.asarray(array, dtype=numpy.float64)
+        assert doubles.dtype == numpy.float64 and doubles.shape == vectors.shape
+        assert array.__array__(numpy.float32, copy=True) is not array.vectors
+        rows = numpy.asarray(array)
+        assert rows.dtype == object and len(rows) == len(vectors)
+        assert numpy.array_equal(rows[1], vectors[1])
+
+    def test_schema_inference(self, vectors):
+        df = pandas.DataFrame({"id": numpy.arange(8), "vec": VectorArray(vectors)})
+        fields = parse_fields_from_dataframe(df)
+        assert fields[1].dtype == DataType.FLOAT_VECTOR
+        assert fields[1].dim == 4
+
+    def test_insert_plan_sends_matrix(self, vectors):
+        plan = InsertPlan(gen_vector_schema(4))
+        df = pandas.DataFrame({"id": numpy.arange(8), "vec": VectorArray(vectors)}, copy=False)
+        entities = plan.apply(df)
+        assert isinstance(entities[1]["values"], VectorArray)
+        assert entities[1]["values"].vectors is vectors
+        entities = plan.apply([list(range(8)), vectors])
+        assert entities[1]["values"].vectors is vectors
+        with pytest.raises(DataTypeNotSupportException):
+            plan.apply([numpy.arange(8), vectors])
+
+    def test_arrow_columns(self, vectors):
+        pyarrow = pytest.importorskip("pyarrow")
+        if not hasattr(pandas, "ArrowDtype"):
+            pytest.skip("pandas.ArrowDtype is not available")
+        list_type = pyarrow.list_(pyarrow.float32())
+        column = pandas.Series(pyarrow.array(vectors.tolist(), type=list_type), dtype=pandas.ArrowDtype(list_type))
+        assert numpy.array_equal(as_vector_matrix(column), vectors)
+        fixed_type = pyarrow.list_(pyarrow.float32(), 4)
+        fixed = pyarrow.FixedSizeListArray.from_arrays(pyarrow.array(vectors.ravel()), 4)
+        column = pandas.Series(fixed, dtype=pandas.ArrowDtype(fixed_type))
+        assert numpy.array_equal(as_vector_matrix(column), vectors)
+        ragged = pandas.Series(pyarrow.array([[1.0], [1.0, 2.0]], type=list_type), dtype=pandas.ArrowDtype(list_type))
+        assert as_vector_matrix(ragged) is None
+
+    def test_collection_insert(self, vectors):
+        collection = Collection(gen_collection_name(), schema=gen_vector_schema(4))
+        df = pandas.DataFrame({"id": numpy.arange(8), "vec": VectorArray(vectors)})
+        collection.insert(df)
+        collection.drop()
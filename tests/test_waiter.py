@@ -0,0 +1,113 @@
+import time
+from unittest import mock
+
+import pytest
+from utils import *
+from pymilvus_orm import connections, utility
+from pymilvus_orm.waiter import Backoff, ProgressTracker, Waiter
+from pymilvus_orm.exceptions import DeadlineExceededException
+
+
+def progress_of(*loaded, total=10):
+    return [{"num_loaded_entities": rows, "num_total_entities": total} for rows in loaded]
+
+
+def measure(progress):
+    return progress["num_loaded_entities"], progress["num_total_entities"]
+
+
+class TestWaiter:
+    def test_backoff(self):
+        backoff = Backoff(initial=0.1, maximum=1.0, multiplier=2.0, jitter=0)
+        assert [backoff.next() for _ in range(6)] == [0.1, 0.2, 0.4, 0.8, 1.0, 1.0]
+        assert backoff.next(eta=0.3) == 0.3
+        assert backoff.next(eta=0.001) == 0.1
+        backoff.reset()
+        assert backoff.next() == 0.1
+        jittered = Backoff(initial=1.0, maximum=1.0, jitter=0.5)
+        assert all(0.5 <= jittered.next() <= 1.5 for _ in range(20))
+
+    def test_tracker_follows_eta(self):
+        tracker = ProgressTracker(Backoff(initial=0.01, maximum=100, jitter=0))
+        tracker.update(0, 100)
+        time.sleep(0.02)
+        delay = tracker.update(50, 100)
+        assert 0.01 <= delay < 1
+
+    def test_wait_many(self):
+        checks = {"a": iter(progress_of(0, 5, 10)), "b": iter(progress_of(10))}
+        seen, done = [], []
+        waiter = Waiter(initial_interval=0.001, max_interval=0.01,
+                        on_progress=lambda key, progress: seen.append((key, progress["num_loaded_entities"])),
+                        on_done=lambda key, progress: done.append(key))
+        for key in checks:
+            waiter.add(key, checks[key].__next__, measure)
+        assert waiter.pending() == ["a", "b"]
+        result = waiter.wait(timeout=5)
+        assert result["a"]["num_loaded_entities"] == 10
+        assert sorted(done) == ["a", "b"]
+        assert [rows for key, rows in seen if key == "a"] == [0, 5, 10]
+        assert not waiter.pending()
+
+    def test_rate_limit_and_deadline(self):
+        calls = []
+
+        def check():
+            calls.append(time.monotonic())
+            return progress_of(1)[0]
+
+        waiter = Waiter(initial_interval=0.001, max_interval=0.001, max_checks_per_second=50)
+        for key in range(100):
+            waiter.add(key, check, measure)
+        with pytest.raises(DeadlineExceededException):
+            waiter.wait(timeout=0.2)
+        assert len(calls) <= 50 + 0.2 * 50 + 1
+
+    def test_utility_waits(self):
+        conn = connections.get_connection()
+        with mock.patch.object(conn, "load_partitions_progress", side_effect=progress_of(2, 10)) as partitions, \
+                mock.patch.object(conn, "load_collection_progress", side_effect=progress_of(10)):
+            result = utility.wait_for_all_loading_complete({"a": ["p1", "p2"], "b": None}, timeout=5)
+        assert partitions.call_count == 2
+        assert partitions.call_args[0][1] == ["p1", "p2"]
+        assert result["b"]["num_loaded_entities"] == 10
+        with mock.patch.object(conn, "get_index_build_progress", return_value={"total_rows": 5, "indexed_rows": 1}), \
+                mock.patch.object(conn, "get_index_state", return_value=(2, "")):
+            with pytest.raises(DeadlineExceededException):
+                utility.wait_for_index_building_complete(gen_collection_name(), timeout=0.05)
+
+    def test_slow_rate_still_checks(self):
+        waiter = Waiter(max_checks_per_second=0.5)
+        waiter.add("a", lambda: progress_of(10)[0], measure)
+        assert waiter.wait(timeout=1)["a"]["num_loaded_entities"] == 10
+
+    def test_index_building_failed(self):
+        conn = connections.get_connection()
+        with mock.patch.object(conn, "get_index_state", return_value=(4, "out of memory")), \
+                mock.patch.object(conn, "get_index_build_progress", return_value={"total_rows": 5, "indexed_rows": 1}):
+            assert utility.wait_for_index_building_complete(gen_collection_name(), timeout=5) is False
+            result = utility.wait_for_all_index_building_complete(["a", "b"], timeout=5)
+        assert result["a"]["fail_reason"] == "out of memory"
+        assert utility.wait_for_index_building_complete(gen_collection_name(), timeout=5) is True
+
+    def test_partial_loading_waited_on(self):
+        conn = connections.get_connection()
+        seen = []
+        assert utility.loading_progress(gen_collection_name()) == {"num_loaded_entities": 3000,
+                                                                   "num_total_entities": 5000}
+        with mock.patch.object(conn, "load_collection_progress",
+                               side_effect=progress_of(3000, 3000, 5000, total=5000)) as progress:
+            utility.wait_for_loading_complete(gen_collection_name(), timeout=5,
+                                              on_progress=lambda name, p: seen.append(p["num_loaded_entities"]))
+        assert progress.call_count == 3
+        assert seen == [3000, 5000]
+
+    def test_index_building_finished_on_server(self):
+        conn = connections.get_connection()
+        indexed = [{"total_rows": 5, "indexed_rows": rows} for rows in (1, 3, 3)]
+        with mock.patch.object(conn, "get_index_build_progress", side_effect=indexed) as progress, \
+                mock.patch.object(conn, "get_index_state", return_value=(3, "")) as state:
+            result = utility.wait_for_all_index_building_complete(["a"], timeout=5)
+        assert progress.call_count == 3
+        assert state.call_count == 1
+        assert result["a"]["indexed_rows"] == 3 and result["a"]["state"] == 3
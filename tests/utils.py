@@ -1,4 +1,5 @@
 import random
+import numpy
 import pandas
 from sklearn import preprocessing
 from pymilvus_orm.types import DataType
@@ -147,3 +148,10 @@ def gen_simple_index():
         dic.update({"params": default_index_params[i]})
         index_params.append(dic)
     return index_params
+
+
+def write_vecs(path, vectors, dtype="<f4"):
+    records = numpy.empty(len(vectors), dtype=[("dim", "<i4"), ("vector", dtype, (vectors.shape[1],))])
+    records["dim"] = vectors.shape[1]
+    records["vector"] = vectors
+    records.tofile(str(path))